@@ -0,0 +1,115 @@
+import asyncio
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Set
+
+
+class BatchLoader:
+    """
+    DataLoader-style request coalescer for per-key lookups.
+
+    `load(key)` calls arriving within `window` seconds are gathered and resolved with one `fetch_batch(keys)`
+    request (at most `max_batch_size` keys each). `fetch_batch` returns {key: result} or None when the server does
+    not accept ID lists; keys it cannot resolve fall back to `fetch_one(key)`. After the first batch comes back
+    unusable before any batch ever succeeded, batching is switched off and every key goes straight to `fetch_one`.
+    Concurrent loads of the same key share one in-flight request either way. `close()` cancels the requests still
+    running when the loader is no longer needed.
+    """
+    __slots__ = ('fetch_one', 'fetch_batch', 'max_batch_size', 'window', 'batch_supported', 'batches',
+                 'single_calls', '_in_flight', '_pending', '_timer', '_tasks')
+
+    def __init__(self, fetch_one: Callable[[str], Awaitable[Any]],
+                 fetch_batch: Optional[Callable[[List[str]], Awaitable[Optional[Dict[str, Any]]]]] = None,
+                 max_batch_size: int = 50, window: float = 0.01):
+        self.fetch_one = fetch_one
+        self.fetch_batch = fetch_batch
+        self.max_batch_size = max(1, max_batch_size)
+        self.window = window
+        self.batch_supported: Optional[bool] = None if fetch_batch is not None else False
+        self.batches = 0
+        self.single_calls = 0
+        self._in_flight: Dict[str, 'asyncio.Future[Any]'] = {}
+        self._pending: List[str] = []
+        self._timer: Optional[asyncio.TimerHandle] = None
+        self._tasks: Set['asyncio.Task[None]'] = set()  # the loop only keeps weak references to running tasks
+
+    async def load(self, key: str) -> Any:
+        future = self._in_flight.get(key)
+        if future is None:
+            future = asyncio.get_running_loop().create_future()
+            self._in_flight[key] = future
+            if self.batch_supported is False:
+                self._spawn(self._resolve_single(key))
+            else:
+                self._pending.append(key)
+                if len(self._pending) >= self.max_batch_size:
+                    self._dispatch()
+                elif self._timer is None:
+                    self._timer = asyncio.get_running_loop().call_later(self.window, self._dispatch)
+        # shield: one cancelled caller must not cancel the request other callers of the same key wait on
+        return await asyncio.shield(future)
+
+    def _spawn(self, coroutine: Awaitable[None]) -> None:
+        task = asyncio.ensure_future(coroutine)
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    def _dispatch(self) -> None:
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        keys, self._pending = self._pending, []
+        if keys:
+            self._spawn(self._resolve_batch(keys))
+
+    async def _resolve_batch(self, keys: List[str]) -> None:
+        try:
+            results = await self.fetch_batch(keys)
+        except Exception:
+            results = None
+        self.batches += 1
+        if results and any(key in results for key in keys):
+            self.batch_supported = True
+        elif self.batch_supported is None:
+            self.batch_supported = False
+        results = results or {}
+        missing = []
+        for key in keys:
+            if key in results:
+                self._settle(key, result=results[key])
+            else:
+                missing.append(key)
+        await asyncio.gather(*(self._resolve_single(key) for key in missing))
+
+    async def _resolve_single(self, key: str) -> None:
+        self.single_calls += 1
+        try:
+            result = await self.fetch_one(key)
+        except Exception as e:
+            self._settle(key, error=e)
+        else:
+            self._settle(key, result=result)
+
+    def _settle(self, key: str, result: Any = None, error: Optional[BaseException] = None) -> None:
+        future = self._in_flight.pop(key, None)
+        if future is None or future.done():
+            return
+        if error is not None:
+            future.set_exception(error)
+        else:
+            future.set_result(result)
+
+    async def close(self) -> None:
+        """Cancel the pending window and the requests in flight, and wait until they have stopped."""
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        self._pending = []
+        tasks = list(self._tasks)
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        for future in self._in_flight.values():
+            future.cancel()
+        self._in_flight = {}
+
+    def stats(self) -> Dict[str, Any]:
+        return {'batches': self.batches, 'single_calls': self.single_calls, 'batch_supported': self.batch_supported}
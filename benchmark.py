@@ -0,0 +1,221 @@
+import argparse
+import contextlib
+import json
+import multiprocessing
+import os
+import resource
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from typing import Any, Callable, Dict, List
+
+import aiohttp
+
+SCENARIOS = ('exhibitors', 'engine-exhibitors', 'vivatech', 'vivatech-serial', 'participants')
+
+
+def percentile(values: List[float], fraction: float) -> float:
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(round(fraction * (len(ordered) - 1))))]
+
+
+class LatencyProbe:
+    """Collects client-side request latencies from requests sessions (response hook) and aiohttp (TraceConfig)."""
+    __slots__ = ('latencies', '_lock')
+
+    def __init__(self):
+        self.latencies: List[float] = []
+        self._lock = threading.Lock()
+
+    def add(self, seconds: float) -> None:
+        with self._lock:
+            self.latencies.append(seconds)
+
+    def requests_hook(self, response: Any, *args: Any, **kwargs: Any) -> None:
+        self.add(response.elapsed.total_seconds())
+
+    def trace_config(self) -> aiohttp.TraceConfig:
+        async def on_request_start(session: Any, context: Any, params: Any) -> None:
+            context.started = time.monotonic()
+
+        async def on_request_end(session: Any, context: Any, params: Any) -> None:
+            self.add(time.monotonic() - context.started)
+
+        trace_config = aiohttp.TraceConfig()
+        trace_config.on_request_start.append(on_request_start)
+        trace_config.on_request_end.append(on_request_end)
+        return trace_config
+
+
+def run_exhibitors(base_url: str, options: argparse.Namespace, probe: LatencyProbe) -> int:
+    from exibitors_scrapy import ExhibitorsScraper
+    scraper = ExhibitorsScraper(f'{base_url}/exhibitors', f'{base_url}/', parse_workers=options.parse_workers,
+                                partial_parse=options.partial_parse, parser=options.parser)
+    scraper.session.hooks['response'].append(probe.requests_hook)
+    scraper.scrape()
+    return len(scraper.data)
+
+
+def run_engine_exhibitors(base_url: str, options: argparse.Namespace, probe: LatencyProbe) -> int:
+    from engine import ScrapeEngine
+    from sites import BUSINESS_TRAVEL_SHOW
+    engine = ScrapeEngine(BUSINESS_TRAVEL_SHOW._replace(listing_url=f'{base_url}/exhibitors'),
+                          parse_workers=options.parse_workers, partial_parse=options.partial_parse)
+    engine.session.hooks['response'].append(probe.requests_hook)
+    return engine.run('exhibitors.csv')
+
+
+def _company_urls(options: argparse.Namespace) -> List[str]:
+    return [f'https://vivatechnology.com/partners/company{index}' for index in range(options.companies)]
+
+
+def run_vivatech(base_url: str, options: argparse.Namespace, probe: LatencyProbe) -> int:
+    import exibitors_scrapy_2
+    exibitors_scrapy_2.session.hooks['response'].append(probe.requests_hook)
+    companies = exibitors_scrapy_2.iter_companies(_company_urls(options), parse_workers=options.parse_workers or 1,
+                                                  partial_parse=options.partial_parse,
+                                                  partners_url=f'{base_url}/partners')
+    return sum(1 for _ in companies)
+
+
+def run_vivatech_serial(base_url: str, options: argparse.Namespace, probe: LatencyProbe) -> int:
+    import exibitors_scrapy_2
+    exibitors_scrapy_2.session.hooks['response'].append(probe.requests_hook)
+    for url in _company_urls(options):
+        exibitors_scrapy_2.extract_company_info(f"{base_url}/partners/{url.split('/')[-1]}")
+    return options.companies
+
+
+def run_participants(base_url: str, options: argparse.Namespace, probe: LatencyProbe) -> int:
+    from participants_scraper import ParticipantManager
+    from sinks import iter_rows
+    api = f'{base_url}/participants'
+    manager = ParticipantManager(f'{api}/list', None, options.page_size, f'{api}/info', f'{api}/interests',
+                                 f'{api}/activities')
+    manager.trace_configs.append(probe.trace_config())
+    manager.run('fetch', 'participants.csv')
+    manager.run('update', 'participants.csv')
+    return sum(1 for _ in iter_rows('final_auth_participants.csv'))
+
+
+SCENARIO_RUNNERS: Dict[str, Callable[[str, argparse.Namespace, LatencyProbe], int]] = {
+    'exhibitors': run_exhibitors,
+    'engine-exhibitors': run_engine_exhibitors,
+    'vivatech': run_vivatech,
+    'vivatech-serial': run_vivatech_serial,
+    'participants': run_participants,
+}
+
+
+def serve(options: argparse.Namespace, ready: Any, stop: Any) -> None:
+    from mock_server import MockSite
+    site = MockSite(exhibitors=options.exhibitors, participant_pages=options.pages, page_size=options.page_size,
+                    latency=options.latency, jitter=options.jitter, error_rate=options.error_rate)
+    ready.put(site.start())
+    stop.wait()
+    site.stop()
+    ready.put({'requests': site.requests, 'errors': site.errors})
+
+
+def run_scenario(name: str, options: argparse.Namespace) -> Dict[str, Any]:
+    """Run one scenario against a mock site in a separate process, so its CPU time is not counted."""
+    context = multiprocessing.get_context('spawn')  # fork would copy this process' memory into the server
+    ready, stop = context.Queue(), context.Event()
+    server = context.Process(target=serve, args=(options, ready, stop), daemon=True)
+    server.start()
+    base_url = ready.get()
+    probe = LatencyProbe()
+    workdir = tempfile.mkdtemp(prefix=f'benchmark-{name}-')
+    previous_dir = os.getcwd()
+
+    self_before = resource.getrusage(resource.RUSAGE_SELF)
+    children_before = resource.getrusage(resource.RUSAGE_CHILDREN)
+    started = time.perf_counter()
+    try:
+        os.chdir(workdir)
+        with open(os.devnull, 'w') as devnull, contextlib.redirect_stdout(devnull):
+            items = SCENARIO_RUNNERS[name](base_url, options, probe)
+    finally:
+        os.chdir(previous_dir)
+    wall = time.perf_counter() - started
+    self_after = resource.getrusage(resource.RUSAGE_SELF)
+    # Parse pools have been shut down by now and the server process is still running, so children = parsers
+    children_after = resource.getrusage(resource.RUSAGE_CHILDREN)
+
+    stop.set()
+    server_stats = ready.get()
+    server.join()
+    return {
+        'scenario': name,
+        'items': items,
+        'requests': server_stats['requests'],
+        'injected_errors': server_stats['errors'],
+        'wall_s': round(wall, 3),
+        'items_per_s': round(items / wall, 2) if wall else 0.0,
+        'requests_per_s': round(server_stats['requests'] / wall, 2) if wall else 0.0,
+        'latency_p50_ms': round(percentile(probe.latencies, 0.50) * 1000, 1),
+        'latency_p99_ms': round(percentile(probe.latencies, 0.99) * 1000, 1),
+        'cpu_main_s': round((self_after.ru_utime + self_after.ru_stime)
+                            - (self_before.ru_utime + self_before.ru_stime), 3),
+        'cpu_parse_pool_s': round((children_after.ru_utime + children_after.ru_stime)
+                                  - (children_before.ru_utime + children_before.ru_stime), 3),
+        'io_wait_s': round(max(0.0, wall - (self_after.ru_utime + self_after.ru_stime)
+                               + (self_before.ru_utime + self_before.ru_stime)), 3),
+        'peak_rss_mb': round(self_after.ru_maxrss / 1024, 1),  # Linux reports KiB
+    }
+
+
+def parse_args(argv: List[str]) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Offline throughput benchmark of the scrapers against a mock site")
+    parser.add_argument('--scenario', choices=SCENARIOS + ('all',), default='all')
+    parser.add_argument('--latency', type=float, default=0.05, help="seconds the mock server waits per response")
+    parser.add_argument('--jitter', type=float, default=0.0, help="extra random latency, up to this many seconds")
+    parser.add_argument('--error-rate', type=float, default=0.0, help="fraction of responses that are 503s")
+    parser.add_argument('--exhibitors', type=int, default=200)
+    parser.add_argument('--companies', type=int, default=200)
+    parser.add_argument('--pages', type=int, default=5, help="participant list pages")
+    parser.add_argument('--page-size', type=int, default=20)
+    parser.add_argument('--parse-workers', type=int, default=os.cpu_count() or 1)
+    parser.add_argument('--parser', default='html.parser', help="ExhibitorsScraper parser backend")
+    parser.add_argument('--no-partial-parse', dest='partial_parse', action='store_false')
+    parser.add_argument('--json', action='store_true', help="print one JSON object per scenario")
+    return parser.parse_args(argv)
+
+
+def main(argv: List[str]) -> None:
+    options = parse_args(argv)
+    if options.scenario != 'all':
+        result = run_scenario(options.scenario, options)
+        print(json.dumps(result))
+        return
+
+    # One interpreter per scenario, so peak RSS and CPU counters are not shared between them
+    # The children get every option but --scenario, which may be one argument ('--scenario=all') or two
+    shared_argv = [arg for arg in argv if not arg.startswith('--scenario=')]
+    while '--scenario' in shared_argv:
+        index = shared_argv.index('--scenario')
+        del shared_argv[index:index + 2]
+    results = []
+    for name in SCENARIOS:
+        child_argv = shared_argv + ['--scenario', name]
+        completed = subprocess.run([sys.executable, os.path.abspath(__file__)] + child_argv, check=True,
+                                   capture_output=True, text=True)
+        results.append(json.loads(completed.stdout.strip().splitlines()[-1]))
+
+    if options.json:
+        for result in results:
+            print(json.dumps(result))
+        return
+    columns = ['scenario', 'items', 'requests', 'wall_s', 'items_per_s', 'latency_p50_ms', 'latency_p99_ms',
+               'cpu_main_s', 'cpu_parse_pool_s', 'io_wait_s', 'peak_rss_mb']
+    print(' '.join(f'{column:>16}' for column in columns))
+    for result in results:
+        print(' '.join(f'{result[column]!s:>16}' for column in columns))
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
@@ -0,0 +1,65 @@
+import json
+import os
+from typing import Any, Dict, Optional, TextIO
+
+
+class CheckpointJournal:
+    """
+    Append-only JSON-lines journal of finished work units, e.g. fetched pages or enriched delegates.
+
+    Every entry stores the unit's kind, key and result, so a resumed run can both skip the unit and reuse its
+    output. Each entry is handed to the OS as soon as it is recorded, so killing the process loses nothing; they
+    are synced to disk (fsync) every `batch_size` records or on `flush()`, e.g. once a batch of units completes.
+    """
+    __slots__ = ('path', 'batch_size', '_unsynced', '_file')
+
+    def __init__(self, path: str, batch_size: int = 50):
+        self.path = path
+        self.batch_size = max(1, batch_size)
+        self._unsynced = 0
+        self._file: Optional[TextIO] = None
+
+    def load(self, kind: str) -> Dict[str, Any]:
+        """Return {key: result} for every completed unit of `kind`, ignoring a torn last line."""
+        completed: Dict[str, Any] = {}
+        if not os.path.isfile(self.path):
+            return completed
+        with open(self.path, encoding='utf-8') as file:
+            for line in file:
+                try:
+                    entry = json.loads(line)
+                except ValueError:
+                    continue  # partial line from a crash mid-write
+                if entry.get('kind') == kind:
+                    completed[str(entry['key'])] = entry['result']
+        return completed
+
+    def record(self, kind: str, key: Any, result: Any) -> None:
+        if self._file is None:
+            self._file = open(self.path, mode='a', encoding='utf-8')
+        self._file.write(json.dumps({'kind': kind, 'key': str(key), 'result': result}) + '\n')
+        self._file.flush()
+        self._unsynced += 1
+        if self._unsynced >= self.batch_size:
+            self.flush()
+
+    def flush(self) -> None:
+        if not self._unsynced:
+            return
+        os.fsync(self._file.fileno())
+        self._unsynced = 0
+
+    def close(self) -> None:
+        self.flush()
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+    def reset(self) -> None:
+        """Forget all previous progress, used when a run starts without resuming."""
+        self._unsynced = 0
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+        if os.path.isfile(self.path):
+            os.remove(self.path)
@@ -1,12 +1,69 @@
+import os
+import threading
+import time
+from types import MappingProxyType
 from dotenv import dotenv_values
-from typing import Dict, Optional
+from typing import Dict, Mapping, NamedTuple, Optional
+
+RELOAD_CHECK_INTERVAL = 1.0  # seconds between mtime checks of the .env file
+AUTH_COOKIE_VARIABLES = {'PHPSESSID': 'PHPSESSID', 'token': 'TOKEN'}  # cookie name -> .env variable
+
+
+class Settings(NamedTuple):
+    """Immutable snapshot of one .env file; the auth cookies are built once per snapshot."""
+    env_file: str
+    mtime: float
+    values: Mapping[str, Optional[str]]
+    auth_cookies: Mapping[str, str]
+
+    def get(self, key: str, default: Optional[str] = None) -> Optional[str]:
+        return self.values.get(key, default)
+
+
+_settings: Dict[str, Settings] = {}
+_checked_at: Dict[str, float] = {}
+_settings_lock = threading.Lock()
+
+
+def _mtime(env_file: str) -> float:
+    try:
+        return os.stat(env_file).st_mtime
+    except OSError:
+        return -1.0
+
+
+def load_settings(env_file: str = ".env") -> Settings:
+    """Read and parse env_file into a fresh Settings snapshot."""
+    mtime = _mtime(env_file)
+    values = dotenv_values(env_file)
+    auth_cookies = {cookie: values[variable] for cookie, variable in AUTH_COOKIE_VARIABLES.items()
+                    if values.get(variable) is not None}
+    return Settings(env_file, mtime, MappingProxyType(values), MappingProxyType(auth_cookies))
+
+
+def get_settings(env_file: str = ".env") -> Settings:
+    """
+    Process-wide settings for env_file, parsed once and shared by every caller.
+    The file's mtime is checked at most every RELOAD_CHECK_INTERVAL seconds and a changed file (e.g. a rotated
+    TOKEN) is reloaded, so callers that compare snapshots by identity can tell when to refresh derived state.
+    """
+    now = time.monotonic()
+    with _settings_lock:
+        current = _settings.get(env_file)
+        if current is not None and now - _checked_at[env_file] < RELOAD_CHECK_INTERVAL:
+            return current
+        _checked_at[env_file] = now
+        if current is None or _mtime(env_file) != current.mtime:
+            current = _settings[env_file] = load_settings(env_file)
+        return current
 
 
 class ParticipantEnvLoader:
     __slots__ = ('env_vars',)
 
     def __init__(self, env_file: str = ".env") -> None:
-        self.env_vars: Dict[str, str] = dotenv_values(env_file)
+        # Backed by the shared settings snapshot, so creating loaders no longer re-reads the file
+        self.env_vars: Mapping[str, Optional[str]] = get_settings(env_file).values
 
     def get(self, key: str, default: Optional[str] = None) -> Optional[str]:
         """
@@ -15,7 +72,7 @@ class ParticipantEnvLoader:
         """
         return self.env_vars.get(key, default)
 
-    def load(self) -> Dict[str, str]:
+    def load(self) -> Mapping[str, Optional[str]]:
         """
         Load all the variables from the .env file.
         """
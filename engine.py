@@ -0,0 +1,434 @@
+import hashlib
+import json
+import os
+from concurrent.futures import Future, ProcessPoolExecutor, ThreadPoolExecutor
+from contextlib import nullcontext
+from functools import partial
+from typing import Any, Callable, Dict, Iterable, Iterator, List, NamedTuple, Optional, Sequence, Tuple, Union
+
+import requests
+from bs4 import BeautifulSoup, SoupStrainer
+from requests.adapters import HTTPAdapter
+
+from fingerprints import FingerprintIndex, content_fingerprint
+from frontier import Frontier, normalize_url
+from http_cache import REQUEST_TIMEOUT, ResponseCache, cached_get
+from instrumentation import REGISTRY, get_logger, run_collecting, stage, timed_get, unwrap_collected
+from retry import CircuitOpenError, RetryPolicy
+from sinks import Column, open_sink
+from streaming import bounded_map
+
+MAX_WORKERS = 16
+DEFAULT_PARSER = 'html.parser'
+MAX_LISTING_PAGES = 1000  # guards against pagination that never ends
+MISSING_VALUES = (None, '', 'N/A')  # listing values that still send the engine to the detail page
+logger = get_logger('engine')
+RETRY_POLICY = RetryPolicy()  # shared by every fetch thread, so the retry budget and circuit breakers are global
+
+
+class Page(NamedTuple):
+    """
+    What field extractors see: the page URL, its (possibly strained) soup and the spec's record for it.
+    For listing cards, `soup` is the card's tag (None for JSON listings) and `record` the card's JSON item.
+    """
+    url: str
+    soup: Optional[BeautifulSoup]
+    record: Dict[str, Any]
+
+
+class Field(NamedTuple):
+    """
+    CSS-selector extractor: the stripped text (or `attribute`) of the `index`-th match, or of every match joined
+    by `separator` with `many`. With `contains`, only values containing that substring count.
+    """
+    selector: str
+    attribute: Optional[str] = None
+    many: bool = False
+    index: int = 0
+    contains: Optional[str] = None
+    separator: str = ', '
+    default: str = 'N/A'
+
+    def __call__(self, page: Page) -> str:
+        values = []
+        for node in page.soup.select(self.selector):
+            value = node.get(self.attribute) if self.attribute else node.text.strip()
+            if value and (self.contains is None or self.contains in value):
+                values.append(value)
+        if self.many:
+            return self.separator.join(values) if values else self.default
+        return values[self.index] if len(values) > self.index else self.default
+
+
+class Key(NamedTuple):
+    """Extractor reading `name` (a dotted path) from the page's record: the spec's `record` dict or a JSON card."""
+    name: str
+    default: Any = ''
+
+    def __call__(self, page: Page) -> Any:
+        value = dig(page.record, self.name)
+        return self.default if value is None else value
+
+
+# A Field, a Key or any picklable callable taking a Page (module-level function or functools.partial of one)
+Extractor = Union[Field, Key, Callable[[Page], Any]]
+
+
+def dig(value: Any, path: str) -> Any:
+    """`value['a']['b']` for the path 'a.b', None as soon as a step is missing."""
+    for step in path.split('.'):
+        if not isinstance(value, dict):
+            return None
+        value = value.get(step)
+    return value
+
+
+def page_url(page: Page) -> str:
+    return page.url
+
+
+def page_slug(page: Page) -> str:
+    return page.url.rstrip('/').split('/')[-1]
+
+
+class SiteSpec(NamedTuple):
+    """
+    Declarative description of one site for ScrapeEngine.
+
+    `fields` maps each output column, in order, to its detail-page extractor. Detail-page URLs come from the
+    `link_selector` matches on `listing_url` and the pages its `next_selector` link leads to, or are passed to the
+    engine directly for sites without a listing page. `record` optionally turns the soup into a dict once per page,
+    for fields that are cheaper to decode together (Key reads them). `strainer` limits the tree built under partial
+    parsing. `raw_record` replaces both for sites with their own parser: it takes the URL, the page bytes and the
+    partial-parse flag and returns the record, so fields can only be Key or URL extractors (the soup is None).
+    Specs are sent to the parse pool, so every callable in them must be picklable.
+
+    `listing_fields` are extractors run on each listing card (the `link_selector` match): columns a card fills in
+    are not extracted from the detail page, and the detail page is not fetched at all when the card fills every
+    column. For a JSON listing endpoint, `listing_items` is the dotted path of the card list, and `link_selector`
+    and `next_selector` are dotted paths within a card and within the response. No shipped site declares listing
+    fields yet: the Business Travel Show card markup has not been verified, so its detail pages are always fetched
+    and its cards only serve the `state_path` card state. The path has only been run against mock_server's listings.
+
+    `region` is the (start, end) pair of byte markers around the part of a detail page the fields read, which is
+    what a FingerprintIndex hashes to notice that a page has not changed (the <body> by default).
+    """
+    name: str
+    fields: Dict[str, Extractor]
+    listing_url: Optional[str] = None
+    link_selector: Optional[str] = None
+    next_selector: Optional[str] = None
+    listing_fields: Optional[Dict[str, Extractor]] = None
+    listing_items: Optional[str] = None
+    record: Optional[Callable[[BeautifulSoup], Dict[str, Any]]] = None
+    raw_record: Optional[Callable[[str, bytes, bool], Dict[str, Any]]] = None
+    strainer: Optional[SoupStrainer] = None
+    parser: str = DEFAULT_PARSER
+    column_types: Optional[Dict[str, str]] = None
+    region: Optional[Tuple[bytes, bytes]] = None
+
+    def column_names(self) -> List[str]:
+        """`fields` in order, then any column only the listing provides."""
+        return list(self.fields) + [name for name in self.listing_fields or () if name not in self.fields]
+
+    def columns(self) -> List[Column]:
+        types = self.column_types or {}
+        return [Column(name, types.get(name, 'string')) for name in self.column_names()]
+
+
+class Card(NamedTuple):
+    """Values harvested from one listing card, and a fingerprint of the card to notice when it changes."""
+    values: Dict[str, Any]
+    fingerprint: str
+
+
+def build_session(pool_size: int = MAX_WORKERS) -> requests.Session:
+    """
+    Create a keep-alive session whose connection pool is large enough for every worker,
+    so concurrent fetches to the same host reuse TCP/TLS connections instead of handshaking each time.
+    """
+    session = requests.Session()
+    adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+    session.mount('http://', adapter)
+    session.mount('https://', adapter)
+    return session
+
+
+def fetch_page(url: str, session: Optional[requests.Session] = None, cache: Optional[ResponseCache] = None,
+               retry_policy: Optional[RetryPolicy] = None) -> Optional[bytes]:
+    """
+    Download a page (through the response cache when given) and return its raw body, or None unless 200.
+    Transient failures are retried under `retry_policy`, the module-wide RETRY_POLICY by default.
+    """
+    retry_policy = retry_policy or RETRY_POLICY
+    if cache is not None:
+        entry = retry_policy.call(url, lambda: cached_get(cache, session or requests, url))
+        return entry.body if entry.status == 200 else None
+    response = retry_policy.call(url, lambda: timed_get(session or requests, url, timeout=REQUEST_TIMEOUT))
+    if response.status_code == 200:
+        return response.content
+    REGISTRY.increment('failures_total', stage='fetch')
+    logger.warning('page not fetched', extra={'url': url, 'status': response.status_code})
+    return None
+
+
+def parse_page(spec: SiteSpec, url: str, content: Optional[bytes], partial_parse: bool = True,
+               columns: Optional[Sequence[str]] = None) -> Optional[Dict[str, Any]]:
+    """
+    Extract `columns` (every detail field by default) from downloaded page bytes. Runs in the parse pool: bytes in,
+    plain values out.
+    """
+    if content is None:
+        return None
+    columns = spec.fields if columns is None else columns
+    if spec.raw_record is not None:
+        page = Page(url, None, spec.raw_record(url, content, partial_parse))  # times its own parse/extract stages
+        return {column: spec.fields[column](page) for column in columns}
+    with stage('parse'):
+        soup = BeautifulSoup(content, spec.parser, parse_only=spec.strainer if partial_parse else None)
+    with stage('extract'):
+        page = Page(url, soup, spec.record(soup) if spec.record else {})
+        return {column: spec.fields[column](page) for column in columns}
+
+
+class ScrapeEngine:
+    """
+    Runs any SiteSpec over one shared pipeline: pooled keep-alive session, response cache, retry policy,
+    `max_workers` concurrent downloads, optional process pool for parsing, and rows streamed to a sink in input order
+    with at most `window` pages read ahead.
+
+    URLs pass through a Frontier, which normalizes and deduplicates them and spaces out requests per host. Each run
+    gets a fresh one unless `frontier` is given, e.g. one with a `done_path` to skip pages earlier runs scraped.
+    With `state_path`, the rows of listing-crawled pages are kept with their card fingerprints, and a later run
+    reuses the row of every card that has not changed instead of fetching its detail page again. With an `index`,
+    a downloaded page whose content fingerprint matches the previous run's is not parsed: its stored values are
+    reused, and `run` can write what changed since that run.
+    """
+    __slots__ = ('spec', 'max_workers', 'parse_workers', 'partial_parse', 'window', 'cache', 'retry_policy',
+                 'frontier', 'state_path', 'index', 'session')
+
+    def __init__(self, spec: SiteSpec, max_workers: int = MAX_WORKERS, parse_workers: int = 0,
+                 partial_parse: bool = True, cache: Optional[ResponseCache] = None,
+                 retry_policy: Optional[RetryPolicy] = None, window: Optional[int] = None,
+                 frontier: Optional[Frontier] = None, state_path: Optional[str] = None,
+                 index: Optional[FingerprintIndex] = None, session: Optional[requests.Session] = None):
+        self.spec = spec
+        self.max_workers = max(1, max_workers)
+        self.parse_workers = max(0, parse_workers)  # 0 parses inside the fetch threads
+        self.partial_parse = partial_parse
+        self.window = window or self.max_workers * 4
+        self.cache = cache
+        self.retry_policy = retry_policy or RETRY_POLICY
+        self.frontier = frontier
+        self.state_path = state_path
+        self.index = index
+        self.session = session or build_session(self.max_workers)
+
+    def fetch(self, url: str) -> Optional[bytes]:
+        """Page body, or None once retries are exhausted or its host's circuit is open."""
+        try:
+            return fetch_page(url, self.session, self.cache, self.retry_policy)
+        except (requests.exceptions.RequestException, CircuitOpenError) as e:
+            REGISTRY.increment('failures_total', stage='fetch')
+            logger.warning('skipping page', extra={'url': url, 'error': repr(e)})
+            return None
+
+    def _harvest(self, url: str, card: Page, fingerprint: str) -> Card:
+        with stage('extract'):
+            values = {column: extractor(card) for column, extractor in (self.spec.listing_fields or {}).items()}
+        return Card(values, fingerprint)
+
+    def _html_cards(self, listing_url: str, content: bytes) -> Tuple[List[Tuple[str, Card]], Optional[str]]:
+        with stage('parse'):
+            soup = BeautifulSoup(content, self.spec.parser)
+        cards = []
+        for tag in soup.select(self.spec.link_selector):
+            if tag.get('href'):
+                url = normalize_url(tag['href'], listing_url)
+                fingerprint = hashlib.sha1(' '.join(str(tag).split()).encode('utf-8')).hexdigest()
+                cards.append((url, self._harvest(url, Page(url, tag, {}), fingerprint)))
+        next_link = soup.select_one(self.spec.next_selector) if self.spec.next_selector else None
+        next_href = next_link.get('href') if next_link is not None else None
+        return cards, normalize_url(next_href, listing_url) if next_href else None
+
+    def _json_cards(self, listing_url: str, content: bytes) -> Tuple[List[Tuple[str, Card]], Optional[str]]:
+        with stage('parse'):
+            data = json.loads(content)
+        cards = []
+        for item in dig(data, self.spec.listing_items) or ():
+            href = dig(item, self.spec.link_selector)
+            if isinstance(href, str) and href:
+                url = normalize_url(href, listing_url)
+                fingerprint = hashlib.sha1(json.dumps(item, sort_keys=True).encode('utf-8')).hexdigest()
+                cards.append((url, self._harvest(url, Page(url, None, item), fingerprint)))
+        next_href = dig(data, self.spec.next_selector) if self.spec.next_selector else None
+        return cards, normalize_url(next_href, listing_url) if isinstance(next_href, str) and next_href else None
+
+    def crawl_listing(self, frontier: Frontier, cards: Optional[Dict[str, Card]] = None) -> int:
+        """
+        Queue the detail links of the spec's listing (HTML page or JSON endpoint) into `frontier`, following its
+        `next_selector` pagination, and collect what each card carries into `cards`. Returns how many listing pages
+        were read.
+        """
+        cards = {} if cards is None else cards
+        read_cards = self._json_cards if self.spec.listing_items is not None else self._html_cards
+        listing_url: Optional[str] = normalize_url(self.spec.listing_url)
+        visited = set()
+        while listing_url is not None and listing_url not in visited and len(visited) < MAX_LISTING_PAGES:
+            visited.add(listing_url)
+            content = self.fetch(listing_url)
+            if content is None:
+                break
+            page_cards, listing_url = read_cards(listing_url, content)
+            for url, card in page_cards:
+                if frontier.add(url):
+                    cards[url] = card
+        logger.info('listing crawled', extra={'site': self.spec.name, 'pages': len(visited), 'links': len(frontier),
+                                              'duplicates': frontier.duplicates})
+        return len(visited)
+
+    def _known_values(self, url: str, card: Optional[Card],
+                      previous: Dict[str, Dict[str, Any]]) -> Tuple[Dict[str, Any], List[str]]:
+        """Values already known for `url` from its card or the previous run, and the detail columns still missing."""
+        if card is None:
+            return {}, list(self.spec.fields)
+        entry = previous.get(url)
+        if entry is not None and entry['card'] == card.fingerprint:
+            REGISTRY.increment('detail_fetches_skipped_total', reason='unchanged')
+            return dict(zip(self.spec.column_names(), entry['row'])), []
+        missing = [column for column in self.spec.fields if card.values.get(column) in MISSING_VALUES]
+        if not missing:
+            REGISTRY.increment('detail_fetches_skipped_total', reason='listing')
+        return card.values, missing
+
+    def _scrape(self, cards: Dict[str, Card], previous: Dict[str, Dict[str, Any]],
+                parse_pool: Optional[ProcessPoolExecutor],
+                url: str) -> Tuple[str, Dict[str, Any], List[str], Any, Optional[str]]:
+        """
+        Runs on a fetch thread: (url, known values, missing columns, their values or a parse-pool future, content
+        fingerprint of the page when it was downloaded and there is an index).
+        """
+        known, missing = self._known_values(url, cards.get(url), previous)
+        if not missing:
+            return url, known, missing, None, None
+        content = self.fetch(url)
+        fingerprint = None
+        if self.index is not None and content is not None:
+            fingerprint = content_fingerprint(content, self.spec.region, missing)
+            stored = self.index.lookup(url, fingerprint)
+            if stored is not None:
+                return url, known, missing, {column: stored[column] for column in missing}, fingerprint
+        if parse_pool is not None:
+            # run_collecting brings the worker's parse/extract timings back with the values
+            future = parse_pool.submit(run_collecting, parse_page, self.spec, url, content, self.partial_parse,
+                                       missing)
+            return url, known, missing, future, fingerprint
+        return url, known, missing, parse_page(self.spec, url, content, self.partial_parse, missing), fingerprint
+
+    def iter_rows(self, urls: Optional[Iterable[str]] = None, skip_failed: bool = False) -> Iterator[List[Any]]:
+        """
+        Rows for `urls` (by default the detail pages the listing links to) in input order, each URL normalized and
+        scraped once. A page whose detail fetch fails still gets its row, with what the fields extract from an empty
+        page (N/A by default) like the legacy scrapers write, but it is not recorded as done, so later runs retry it.
+        With `skip_failed` it gets no row, e.g. when the run appends to an output the retry will also append to.
+        """
+        for row, status in self.iter_statuses(urls, skip_failed):
+            if status != 'removed':
+                yield row
+
+    @staticmethod
+    def _status(url: str, cards: Dict[str, Card], previous: Dict[str, Dict[str, Any]]) -> str:
+        entry = previous.get(url)
+        if entry is None:
+            return 'new'
+        card = cards.get(url)
+        return 'unchanged' if card is not None and entry['card'] == card.fingerprint else 'changed'
+
+    def iter_statuses(self, urls: Optional[Iterable[str]] = None,
+                      skip_failed: bool = False) -> Iterator[Tuple[List[Any], str]]:
+        """
+        (row, status) pairs of `iter_rows`, the status comparing the page's listing card with the `state_path` run:
+        new, changed or unchanged (its row reused without a fetch). After a listing crawl, the pages that run had
+        but the listing no longer links to follow with their last row and the status removed.
+        """
+        frontier = self.frontier if self.frontier is not None else Frontier()
+        cards: Dict[str, Card] = {}
+        listed = urls is None
+        if listed:
+            self.crawl_listing(frontier, cards)
+            urls = iter(frontier)
+        else:
+            urls = frontier.unique(urls)
+        keeps_state = bool(cards or frontier.skipped)  # listing-crawled, even if every card was done already
+        previous = self._load_state() if keeps_state else {}
+        state: Dict[str, Dict[str, Any]] = {}
+        column_names = self.spec.column_names()
+
+        parse_context = ProcessPoolExecutor(max_workers=self.parse_workers) if self.parse_workers else nullcontext()
+        with ThreadPoolExecutor(max_workers=self.max_workers) as fetch_pool, parse_context as parse_pool:
+            scrape = partial(self._scrape, cards, previous, parse_pool)
+            for url, known, missing, detail, fingerprint in bounded_map(fetch_pool, scrape, urls, self.window):
+                if isinstance(detail, Future):
+                    detail = unwrap_collected(detail.result())
+                status = self._status(url, cards, previous)
+                if missing and detail is None:
+                    values = dict(known, **parse_page(self.spec, url, b'', False, missing))
+                    if self.index is not None:
+                        self.index.touch(url)
+                    if url in previous:  # its card changed, so the next run fetches it again
+                        state[url] = previous[url]
+                    if skip_failed:
+                        continue
+                    yield [values.get(column, 'N/A') for column in column_names], status
+                    continue
+                values = dict(known, **detail) if detail else known
+                row = [values.get(column, 'N/A') for column in column_names]
+                if self.index is not None:
+                    self.index.record(url, fingerprint, dict(zip(column_names, row)))
+                if url in cards:
+                    state[url] = {'card': cards[url].fingerprint, 'row': row}
+                frontier.complete(url)
+                yield row, status
+        for url in frontier.skipped:  # done by earlier runs: not gone, so the index must not report them removed
+            if self.index is not None:
+                self.index.touch(url)
+            if url in previous:
+                state[url] = previous[url]
+        if listed:
+            for url, entry in previous.items():
+                if url not in state and url not in cards:
+                    yield entry['row'], 'removed'
+        frontier.save()
+        if keeps_state:
+            self._save_state(state)
+
+    def _load_state(self) -> Dict[str, Dict[str, Any]]:
+        if not self.state_path or not os.path.isfile(self.state_path):
+            return {}
+        with open(self.state_path, encoding='utf-8') as file:
+            return json.load(file)
+
+    def _save_state(self, state: Dict[str, Dict[str, Any]]) -> None:
+        if not self.state_path:
+            return
+        temp_file = f'{self.state_path}.tmp'
+        with open(temp_file, mode='w', encoding='utf-8') as file:
+            json.dump(state, file)
+        os.replace(temp_file, self.state_path)
+
+    def run(self, output_file: str, urls: Optional[Iterable[str]] = None, diff_file: Optional[str] = None) -> int:
+        """
+        Stream the rows into `output_file` (.csv, .jsonl, .parquet, .arrow) and return how many were written.
+        With an index, the pages new, changed or gone since its previous run are written to `diff_file`. When the
+        frontier skips pages done by earlier runs, their rows are already in `output_file`: the new rows are appended.
+        With a done file, pages whose fetch fails get no row, since the run that retries them appends it then.
+        """
+        appends_later = self.frontier is not None and self.frontier.done_path is not None
+        append = appends_later and len(self.frontier.done) > 0
+        with open_sink(output_file, self.spec.columns(), append=append) as sink:
+            for row in self.iter_rows(urls, skip_failed=appends_later):
+                sink.write(row)
+        if self.index is not None:
+            self.index.finish(diff_file)
+        logger.info('data saved', extra={'site': self.spec.name, 'file': output_file, 'rows': sink.rows_written})
+        return sink.rows_written
@@ -1,61 +1,242 @@
+import os
 import re
-import csv
-from typing import List, Tuple, Optional, Set
+import sys
+import json
+import hashlib
+from functools import partial
+from typing import Any, Dict, Iterator, List, NamedTuple, Sequence, Tuple, Optional, Type
 import requests
-from bs4 import BeautifulSoup
+from bs4 import BeautifulSoup, SoupStrainer, Tag
+
+from engine import RETRY_POLICY, Key, ScrapeEngine, SiteSpec, fetch_page, page_url
+from fingerprints import FingerprintIndex
+from frontier import normalize_url
+from http_cache import ResponseCache
+from instrumentation import REGISTRY, export_from_environment, finish_run, get_logger, stage
+from records import intern_columns
+from retry import CircuitOpenError
+from sinks import CsvSink, open_sink
+
+try:
+    from selectolax.lexbor import LexborHTMLParser as HTMLParser
+except ImportError:  # selectolax is an optional, faster parser backend
+    try:
+        from selectolax.parser import HTMLParser
+    except ImportError:
+        HTMLParser = None
 
 BASE_URL = "https://www.businesstravelshoweurope.com/"
 MAIN_URL = "https://www.businesstravelshoweurope.com/exhibitors"
+MAX_WORKERS = 16
+STATE_FILE = 'exhibitors_state.json'
+EXHIBITOR_HEADERS = ['Company Name', 'Company URL', 'Stand', 'Company USP', 'Address', 'PRODUCT CATEGORY', 'INDUSTRIES',
+                     'SUSTAINABILITY INITIATIVE', 'Official Website', 'Facebook handle', 'LinkedIn handle',
+                     'Instagram handle', 'YouTube handle']
+INFO_HEADERS = [header for header in EXHIBITOR_HEADERS if header != 'Company URL']  # the fields of extract_info
+LISTING_LINK_SELECTOR = 'div.js-library-list-outer a.js-librarylink-entry'
+DEFAULT_PARSER = 'html.parser'
+WEBSITE_PATTERN = re.compile(r'website', re.I)
+logger = get_logger('exhibitors')
+
+# Declarative field spec: field -> (tag name, css class, keep every match instead of the first one).
+# CompanyInfoExtractor resolves all of it in a single walk over the document.
+EXTRACTION_PLAN: Dict[str, Tuple[str, str, bool]] = {
+    'company_name': ('h1', 'm-exhibitor-entry__item__header__infos__title', False),
+    'stand': ('div', 'm-exhibitor-entry__item__header__infos__stand', False),
+    'usp': ('div', 'm-exhibitor-entry__item__body__additional__item__value', False),
+    'address': ('div', 'm-exhibitor-entry__item__body__contacts__address', False),
+    'libraries': ('div', 'm-exhibitor-entry__item__body__libraries', False),
+    'website_button': ('div', 'm-exhibitor-entry__item__body__contacts__additional__button', False),
+    'social_items': ('li', 'm-exhibitor-entry__item__body__contacts__additional__social__item', True),
+}
+_PLAN_BY_CLASS: Dict[str, Tuple[str, str, bool]] = {
+    css_class: (field, tag_name, many) for field, (tag_name, css_class, many) in EXTRACTION_PLAN.items()
+}
+WEBSITE_LINK = 'website_link'  # index slot for the first <a href> whose string mentions "website"
+
+
+def plan_selector(field: str) -> str:
+    tag_name, css_class, _ = EXTRACTION_PLAN[field]
+    return f'{tag_name}.{css_class}'
+
+
+def _is_planned_tag(name: str, attrs: Dict[str, Any]) -> bool:
+    # Called by BeautifulSoup with the raw start tag, before 'class' is split into a list
+    if name == 'a' and 'href' in attrs:
+        return True
+    classes = attrs.get('class') or ()
+    if isinstance(classes, str):
+        classes = classes.split()
+    return any(css_class in _PLAN_BY_CLASS for css_class in classes)
+
+
+# Partial-parse filters: only these subtrees are materialized, everything else is dropped while parsing
+EXHIBITOR_STRAINER = SoupStrainer(_is_planned_tag)
+LISTING_STRAINER = SoupStrainer('div', class_='js-library-list-outer')
+
+
+class Exhibitor(NamedTuple):
+    """
+    One exhibitor row, fields in EXHIBITOR_HEADERS order so sinks take it as is. A tuple instead of a list per
+    exhibitor, with the repeated library values (categories, industries, initiatives) interned.
+    """
+    company_name: str
+    company_url: str
+    stand: str
+    company_usp: str
+    address: str
+    product_category: str
+    industries: str
+    sustainability_initiative: str
+    official_website: str
+    facebook_handle: str
+    linkedin_handle: str
+    instagram_handle: str
+    youtube_handle: str
+
+    @classmethod
+    def from_values(cls, values: Sequence[str]) -> 'Exhibitor':
+        return cls._make(intern_columns(EXHIBITOR_HEADERS, values))
+
+    @classmethod
+    def from_info(cls, company_url: str, company_info: Sequence[str]) -> 'Exhibitor':
+        """Row from the 12-field tuple of `extract_info`, which has everything but the URL."""
+        return cls.from_values((company_info[0], company_url, *company_info[1:]))
+
+
+def parse_company_page(company_url: str, content: Optional[bytes], parser: str = DEFAULT_PARSER,
+                       partial_parse: bool = False) -> Tuple[str, ...]:
+    """
+    Parse already downloaded exhibitor page bytes into the plain 12-field tuple.
+    Safe to run in a process pool: only bytes go in and only strings come out.
+    """
+    with stage('parse'):
+        extractor = get_extractor_class(parser).from_content(company_url, content, partial_parse)
+    with stage('extract'):
+        return extractor.extract_info()
+
+
+def exhibitor_record(parser: str, company_url: str, content: bytes, partial_parse: bool) -> Dict[str, str]:
+    """SiteSpec.raw_record of exhibitor_spec: parse_company_page with the `parser` backend, keyed by header."""
+    return dict(zip(INFO_HEADERS, parse_company_page(company_url, content, parser, partial_parse)))
+
+
+def exhibitor_spec(main_url: str = MAIN_URL, parser: str = DEFAULT_PARSER) -> SiteSpec:
+    """ScrapeEngine spec extracting exhibitor pages with the CompanyInfoExtractor of the `parser` backend."""
+    fields: Dict[str, Any] = {header: Key(header, 'N/A') for header in EXHIBITOR_HEADERS}
+    fields['Company URL'] = page_url
+    return SiteSpec(name='exhibitors', fields=fields, listing_url=main_url, link_selector=LISTING_LINK_SELECTOR,
+                    raw_record=partial(exhibitor_record, parser))
+
+
+def address_text(address_div: Tag) -> str:
+    """The address lines after the <h4> label of an address block, comma-joined."""
+    address_parts = []
+    h4 = address_div.find('h4')
+    if h4:
+        initial_text = h4.next_sibling.strip() if h4.next_sibling and isinstance(h4.next_sibling, str) else ''
+        if initial_text:
+            address_parts.append(initial_text)
+        for sibling in h4.next_siblings:
+            if sibling.name == 'br':
+                next_element = sibling.next_sibling
+                if next_element and isinstance(next_element, str):
+                    address_parts.append(next_element.strip())
+    return ', '.join(address_parts)
+
+
+def library_texts(libraries_div: Tag) -> List[str]:
+    """Span texts of each library (product category, industries, sustainability initiative), comma-joined."""
+    sub_divs = libraries_div.find_all('div', class_='m-exhibitor-entry__item__body__libraries__library')
+    return [', '.join(span.get_text() for span in sub_div.find_all('span')) for sub_div in sub_divs]
 
 
 class CompanyInfoExtractor:
-    __slots__ = ('company_url', 'soup')
+    __slots__ = ('company_url', 'soup', 'index')
+    parser = DEFAULT_PARSER
 
-    def __init__(self, company_url: str):
+    def __init__(self, company_url: str, session: Optional[requests.Session] = None, partial_parse: bool = False):
         self.company_url = company_url
-        self.soup = self._get_soup()
-
-    def _get_soup(self) -> Optional[BeautifulSoup]:
-        response = requests.get(self.company_url)
-        if response.status_code == 200:
-            return BeautifulSoup(response.content, 'html.parser')
-        return None
-
-    def _extract_text(self, selector: str, default: str = 'N/A') -> str:
-        element = self.soup.select_one(selector) if self.soup else None
+        self.soup = self._get_soup(session, partial_parse)
+        self.index: Optional[Dict[str, Any]] = None
+
+    @classmethod
+    def from_content(cls, company_url: str, content: Optional[bytes],
+                     partial_parse: bool = False) -> 'CompanyInfoExtractor':
+        """Build an extractor from a page that was fetched elsewhere, without touching the network."""
+        extractor = cls.__new__(cls)
+        extractor.company_url = company_url
+        extractor.soup = extractor._parse(content, partial_parse)
+        extractor.index = None
+        return extractor
+
+    def _get_soup(self, session: Optional[requests.Session] = None,
+                  partial_parse: bool = False) -> Optional[BeautifulSoup]:
+        try:
+            content = fetch_page(self.company_url, session)
+        except (requests.exceptions.RequestException, CircuitOpenError) as e:
+            REGISTRY.increment('failures_total', stage='fetch')
+            logger.warning('skipping page', extra={'url': self.company_url, 'error': repr(e)})
+            content = None  # extract_info then gives the N/A row
+        return self._parse(content, partial_parse)
+
+    @classmethod
+    def _parse(cls, content: Optional[bytes], partial_parse: bool = False) -> Optional[BeautifulSoup]:
+        """With partial_parse, only the EXTRACTION_PLAN containers and links are built into the tree."""
+        if not content:
+            return None
+        return BeautifulSoup(content, cls.parser, parse_only=EXHIBITOR_STRAINER if partial_parse else None)
+
+    def _build_index(self) -> Dict[str, Any]:
+        """
+        Walk the document once and pick up every node EXTRACTION_PLAN asks for, plus the fallback website link.
+        The _extract_* helpers then only look at these (small) subtrees.
+        """
+        index: Dict[str, Any] = {field: [] if many else None for field, (_, _, many) in EXTRACTION_PLAN.items()}
+        index[WEBSITE_LINK] = None
+
+        for node in self.soup.descendants:
+            if not isinstance(node, Tag):
+                continue
+            for css_class in node.get('class', ()):
+                planned = _PLAN_BY_CLASS.get(css_class)
+                if planned and planned[1] == node.name:
+                    field, _, many = planned
+                    if many:
+                        index[field].append(node)
+                    elif index[field] is None:
+                        index[field] = node
+            if node.name == 'a' and index[WEBSITE_LINK] is None and node.has_attr('href'):
+                string = node.string
+                if string is not None and WEBSITE_PATTERN.search(string):
+                    index[WEBSITE_LINK] = node
+        return index
+
+    def _lookup(self, field: str) -> Any:
+        if self.index is None:
+            self.index = self._build_index()
+        return self.index[field]
+
+    def _extract_text(self, field: str, default: str = 'N/A') -> str:
+        element = self._lookup(field) if self.soup else None
         return element.text.strip() if element else default
 
     def _extract_address(self) -> str:
         if not self.soup:
             return 'N/A'
 
-        address_div = self.soup.find('div', class_='m-exhibitor-entry__item__body__contacts__address')
-        if not address_div:
-            return 'N/A'
-
-        address_parts = []
-        h4 = address_div.find('h4')
-        if h4:
-            initial_text = h4.next_sibling.strip() if h4.next_sibling and isinstance(h4.next_sibling, str) else ''
-            if initial_text:
-                address_parts.append(initial_text)
-            for sibling in h4.next_siblings:
-                if sibling.name == 'br':
-                    next_element = sibling.next_sibling
-                    if next_element and isinstance(next_element, str):
-                        address_parts.append(next_element.strip())
-        return ', '.join(address_parts)
+        address_div = self._lookup('address')
+        return address_text(address_div) if address_div else 'N/A'
 
     def _extract_libraries_info(self) -> Tuple[str, str, str]:
         if not self.soup:
             return 'N/A', 'N/A', 'N/A'
 
-        parent_div = self.soup.find('div', class_='m-exhibitor-entry__item__body__libraries')
+        parent_div = self._lookup('libraries')
         if not parent_div:
             return 'N/A', 'N/A', 'N/A'
 
-        sub_divs = parent_div.find_all('div', class_='m-exhibitor-entry__item__body__libraries__library')
-        all_span_texts = [', '.join(span.get_text() for span in sub_div.find_all('span')) for sub_div in sub_divs]
+        all_span_texts = library_texts(parent_div)
 
         product_category = all_span_texts[0] if len(all_span_texts) > 0 else 'N/A'
         industry = all_span_texts[1] if len(all_span_texts) > 1 else 'N/A'
@@ -67,7 +248,7 @@ class CompanyInfoExtractor:
         if not self.soup:
             return 'N/A', 'N/A', 'N/A', 'N/A'
 
-        li_tags = self.soup.find_all('li', class_='m-exhibitor-entry__item__body__contacts__additional__social__item')
+        li_tags = self._lookup('social_items')
         facebook_url, linkedin_url, instagram_url, youtube_url = 'N/A', 'N/A', 'N/A', 'N/A'
 
         for li_tag in li_tags:
@@ -90,23 +271,23 @@ class CompanyInfoExtractor:
             return 'N/A'
 
         # The website might be in a div with class 'm-exhibitor-entry__item__body__contacts__additional__button'
-        compay_website_div = self.soup.find('div', class_='m-exhibitor-entry__item__body__contacts__additional__button')
+        compay_website_div = self._lookup('website_button')
         if compay_website_div:
             a_tag = compay_website_div.find('a')
             if a_tag and 'href' in a_tag.attrs:
                 return a_tag['href']
 
         # Fallback check for possible direct link in case class names change
-        a_tag = self.soup.find('a', href=True, string=re.compile(r'website', re.I))
+        a_tag = self._lookup(WEBSITE_LINK)
         if a_tag:
             return a_tag['href']
 
         return 'N/A'
 
     def extract_info(self) -> Tuple[str, str, str, str, str, str, str, str, str, str, str, str]:
-        company_name = self._extract_text('h1.m-exhibitor-entry__item__header__infos__title')
-        stand_info = self._extract_text('div.m-exhibitor-entry__item__header__infos__stand')
-        usp_info = self._extract_text('div.m-exhibitor-entry__item__body__additional__item__value')
+        company_name = self._extract_text('company_name')
+        stand_info = self._extract_text('stand')
+        usp_info = self._extract_text('usp')
         address = self._extract_address()
         product_category, industry, sustainability_initiative = self._extract_libraries_info()
         website_url = self._extract_website_url()
@@ -116,49 +297,298 @@ class CompanyInfoExtractor:
                 website_url, facebook_url, linkedin_url, instagram_url, youtube_url)
 
 
-class ExhibitorsScraper:
-    __slots__ = ('main_url', 'base_url', 'data')
+class LxmlCompanyInfoExtractor(CompanyInfoExtractor):
+    """Same selectors as CompanyInfoExtractor, with BeautifulSoup backed by the C lxml tree builder."""
+    __slots__ = ()
+    parser = 'lxml'
+
+
+class SelectolaxCompanyInfoExtractor(CompanyInfoExtractor):
+    """
+    Same selectors as CompanyInfoExtractor, run against selectolax's C HTML parser.
+    Every helper mirrors the BeautifulSoup one so both produce identical tuples. The single-pass index is
+    not used here: selectolax's native CSS matching is cheaper than walking its nodes from Python.
+    selectolax has no strainer, so partial_parse is ignored; its full parse is already faster than a filtered one.
+    """
+    __slots__ = ()
+    parser = 'selectolax'
+
+    @classmethod
+    def _parse(cls, content: Optional[bytes], partial_parse: bool = False) -> Any:
+        if HTMLParser is None:
+            raise ImportError("The 'selectolax' parser backend requires the selectolax package")
+        return HTMLParser(content) if content else None
+
+    @staticmethod
+    def _is_text(node: Any) -> bool:
+        return node is not None and node.tag == '-text'
+
+    @staticmethod
+    def _next_siblings(node: Any) -> Iterator[Any]:
+        node = node.next
+        while node is not None:
+            yield node
+            node = node.next
+
+    @classmethod
+    def _string(cls, node: Any) -> Optional[str]:
+        """selectolax counterpart of BeautifulSoup's Tag.string: the text of a single-child chain."""
+        while True:
+            child = node.child
+            if child is None or child.next is not None:
+                return None
+            if cls._is_text(child):
+                return child.text()
+            node = child
+
+    def _extract_text(self, field: str, default: str = 'N/A') -> str:
+        element = self.soup.css_first(plan_selector(field)) if self.soup else None
+        return element.text().strip() if element else default
 
-    def __init__(self, main_url: str, base_url: str):
-        self.main_url = main_url
-        self.base_url = base_url
-        self.data: List[List[str]] = []
+    def _extract_address(self) -> str:
+        if not self.soup:
+            return 'N/A'
 
-    def _get_exhibitor_links(self) -> Set[str]:
-        response = requests.get(self.main_url)
-        if response.status_code != 200:
-            return set()
+        address_div = self.soup.css_first(plan_selector('address'))
+        if not address_div:
+            return 'N/A'
 
-        soup = BeautifulSoup(response.content, 'html.parser')
-        main_div = soup.find('div', class_='js-library-list-outer')
-        if not main_div:
-            return set()
+        address_parts = []
+        h4 = address_div.css_first('h4')
+        if h4:
+            initial_text = h4.next.text().strip() if self._is_text(h4.next) else ''
+            if initial_text:
+                address_parts.append(initial_text)
+            for sibling in self._next_siblings(h4):
+                if sibling.tag == 'br':
+                    next_element = sibling.next
+                    if self._is_text(next_element):
+                        address_parts.append(next_element.text().strip())
+        return ', '.join(address_parts)
 
-        a_tags = main_div.find_all('a', class_='js-librarylink-entry')
-        return {tag.get('href') for tag in a_tags if tag.get('href')}
+    def _extract_libraries_info(self) -> Tuple[str, str, str]:
+        if not self.soup:
+            return 'N/A', 'N/A', 'N/A'
 
-    def scrape(self) -> None:
-        href_list = self._get_exhibitor_links()
+        parent_div = self.soup.css_first(plan_selector('libraries'))
+        if not parent_div:
+            return 'N/A', 'N/A', 'N/A'
+
+        sub_divs = parent_div.css('div.m-exhibitor-entry__item__body__libraries__library')
+        all_span_texts = [', '.join(span.text() for span in sub_div.css('span')) for sub_div in sub_divs]
 
-        for count, href in enumerate(href_list, 1):
-            company_url = self.base_url + href
-            extractor = CompanyInfoExtractor(company_url)
-            company_info = extractor.extract_info()
-            self.data.append([company_info[0], company_url] + list(company_info[1:]))
-            print(f'Count: {count}, Company name: {company_info[0]}')
+        product_category = all_span_texts[0] if len(all_span_texts) > 0 else 'N/A'
+        industry = all_span_texts[1] if len(all_span_texts) > 1 else 'N/A'
+        sustainability_initiative = all_span_texts[2] if len(all_span_texts) > 2 else 'N/A'
+
+        return product_category, industry, sustainability_initiative
+
+    def _extract_social_media(self) -> Tuple[str, str, str, str]:
+        if not self.soup:
+            return 'N/A', 'N/A', 'N/A', 'N/A'
+
+        li_tags = self.soup.css(plan_selector('social_items'))
+        facebook_url, linkedin_url, instagram_url, youtube_url = 'N/A', 'N/A', 'N/A', 'N/A'
+
+        for li_tag in li_tags:
+            a_tag = li_tag.css_first('a')
+            if a_tag:
+                href = a_tag.attributes.get('href')
+                if "facebook.com" in href:
+                    facebook_url = href
+                elif "linkedin.com" in href:
+                    linkedin_url = href
+                elif "instagram.com" in href:
+                    instagram_url = href
+                elif "youtube.com" in href:
+                    youtube_url = href
+
+        return facebook_url, linkedin_url, instagram_url, youtube_url
+
+    def _extract_website_url(self) -> str:
+        if not self.soup:
+            return 'N/A'
+
+        compay_website_div = self.soup.css_first(plan_selector('website_button'))
+        if compay_website_div:
+            a_tag = compay_website_div.css_first('a')
+            if a_tag and 'href' in a_tag.attributes:
+                return a_tag.attributes['href'] or ''
+
+        for a_tag in self.soup.css('a[href]'):
+            string = self._string(a_tag)
+            if string is not None and WEBSITE_PATTERN.search(string):
+                return a_tag.attributes['href'] or ''
+
+        return 'N/A'
+
+
+PARSER_BACKENDS: Dict[str, Type[CompanyInfoExtractor]] = {
+    'html.parser': CompanyInfoExtractor,
+    'lxml': LxmlCompanyInfoExtractor,
+    'selectolax': SelectolaxCompanyInfoExtractor,
+}
+
+
+def get_extractor_class(parser: str) -> Type[CompanyInfoExtractor]:
+    try:
+        return PARSER_BACKENDS[parser]
+    except KeyError:
+        raise ValueError(f"Unknown parser backend '{parser}'. Choose from: {', '.join(PARSER_BACKENDS)}") from None
+
+
+class ExhibitorsScraper:
+    """
+    Exhibitors of the businesstravelshow listing, with an incremental mode driven by listing-card fingerprints
+    (the engine's `state_path` card state).
+    Exhibitor pages are scraped by a ScrapeEngine over exhibitor_spec, so downloads, parse pool, retries, response
+    cache and fingerprint index work as for every other site.
+    """
+    __slots__ = ('main_url', 'base_url', 'data', 'statuses', 'max_workers', 'parse_workers', 'parser',
+                 'partial_parse', 'cache', 'index', 'engine', 'session')
+
+    def __init__(self, main_url: str, base_url: str, max_workers: int = MAX_WORKERS, parse_workers: int = 0,
+                 parser: str = DEFAULT_PARSER, partial_parse: bool = False, cache: Optional[ResponseCache] = None,
+                 index: Optional[FingerprintIndex] = None):
+        self.main_url = main_url
+        self.base_url = base_url
+        self.data: List[Exhibitor] = []
+        self.statuses: List[str] = []  # filled by incremental runs: new / changed / unchanged / removed
+        self.max_workers = max(1, max_workers)
+        self.parse_workers = max(0, parse_workers)  # 0 parses inside the fetch threads
+        self.parser = parser
+        self.partial_parse = partial_parse
+        self.cache = cache
+        self.index = index  # pages whose content fingerprint is unchanged since the last run are not parsed
+        get_extractor_class(parser)  # fail fast on a typo before any page is fetched
+        self.engine = ScrapeEngine(exhibitor_spec(main_url, parser), self.max_workers, self.parse_workers,
+                                   partial_parse, cache, index=index)
+        self.session = self.engine.session
+
+    def _get_exhibitor_links(self) -> List[str]:
+        return list(self._get_exhibitor_entries())
+
+    def _get_exhibitor_entries(self) -> Dict[str, str]:
+        """
+        Map each exhibitor page URL, in listing order, to a fingerprint of its listing card markup.
+        hrefs are resolved against base_url and normalized, so trailing-slash or tracking-query variants of one page
+        collapse into a single entry.
+        """
+        content = self.engine.fetch(self.main_url)  # None once retries are exhausted or the circuit is open
+        if content is None:
+            return {}
+
+        soup = BeautifulSoup(content, 'html.parser', parse_only=LISTING_STRAINER if self.partial_parse else None)
+        main_div = soup.find('div', class_='js-library-list-outer')
+        if not main_div:
+            return {}
+
+        entries: Dict[str, str] = {}
+        for tag in main_div.find_all('a', class_='js-librarylink-entry'):
+            href = tag.get('href')
+            if not href:
+                continue
+            company_url = normalize_url(href, self.base_url)
+            if company_url not in entries:
+                card = ' '.join(str(tag).split())
+                entries[company_url] = hashlib.sha1(card.encode('utf-8')).hexdigest()
+        return entries
+
+    def _scrape_rows(self, company_urls: List[str]) -> Iterator[Exhibitor]:
+        """
+        Scrape exhibitor pages through the engine: up to `max_workers` requests in flight over the shared session,
+        parsing in a process pool with `parse_workers`, and pages unchanged since the index's last run not parsed.
+        Rows come out in the same order as `company_urls`.
+        """
+        for count, row in enumerate(self.engine.iter_rows(company_urls), 1):
+            logger.debug('exhibitor scraped', extra={'count': count, 'company': row[0]})
+            yield Exhibitor.from_values(row)
+
+    def _emit(self, row: Exhibitor, status: Optional[str], sink: Optional[CsvSink]) -> None:
+        if sink is not None:
+            sink.write(row + (status,) if status else row)
+            return
+        self.data.append(row)
+        if status:
+            self.statuses.append(status)
+
+    def scrape(self, incremental: bool = False, state_file: str = STATE_FILE, sink: Optional[CsvSink] = None,
+               diff_file: Optional[str] = None) -> None:
+        """
+        Scrape every exhibitor on the listing page.
+        With `incremental`, only exhibitors that are new or whose listing card changed since the run recorded in
+        `state_file` are fetched; the rest are carried forward and exhibitors gone from the listing are marked removed.
+        With a `sink`, rows are streamed to it as they are produced instead of being collected in `self.data`.
+        With an index, the exhibitors new, changed or gone since its previous run are written to `diff_file`.
+        """
+        if not incremental:
+            for row in self._scrape_rows(self._get_exhibitor_links()):
+                self._emit(row, None, sink)
+        else:
+            self._scrape_incremental(state_file, sink)
+        if self.index is not None:
+            self.index.finish(diff_file)
+
+    def _scrape_incremental(self, state_file: str, sink: Optional[CsvSink]) -> None:
+        """The engine's listing-card state in `state_file` decides what is fetched and gives each row its status."""
+        self._upgrade_state(state_file)
+        self.engine.state_path = state_file
+        counts: Dict[str, int] = {}
+        for row, status in self.engine.iter_statuses():
+            counts[status] = counts.get(status, 0) + 1
+            self._emit(Exhibitor.from_values(row), status, sink)
+        logger.info('incremental run', extra={'fetched': counts.get('new', 0) + counts.get('changed', 0),
+                                              'listed': sum(counts.values()) - counts.get('removed', 0),
+                                              'removed': counts.get('removed', 0)})
+
+    def scrape_to_file(self, filename: str, incremental: bool = False, state_file: str = STATE_FILE,
+                       diff_file: Optional[str] = None) -> None:
+        """Scrape and stream rows straight into `filename`, which only appears once the run has completed.
+
+        The extension of `filename` names the format (.csv, .jsonl, .parquet, .arrow).
+        """
+        headers = EXHIBITOR_HEADERS + ['Status'] if incremental else EXHIBITOR_HEADERS
+        with open_sink(filename, headers) as sink:
+            self.scrape(incremental, state_file, sink, diff_file)
+        logger.info('data saved', extra={'file': filename})
+
+    def _upgrade_state(self, state_file: str) -> None:
+        """Rewrite a state file of the scraper's own earlier format (href -> fingerprint, row) as engine card state."""
+        if not os.path.isfile(state_file):
+            return
+        with open(state_file, encoding='utf-8') as file:
+            state = json.load(file)
+        if not any('fingerprint' in entry for entry in state.values()):
+            return
+        state = {normalize_url(key, self.base_url): {'card': entry['fingerprint'], 'row': list(entry['row'])}
+                 for key, entry in state.items()}
+        temp_file = f'{state_file}.tmp'
+        with open(temp_file, mode='w', encoding='utf-8') as file:
+            json.dump(state, file)
+        os.replace(temp_file, state_file)
 
     def save_to_csv(self, filename: str) -> None:
-        headers = ['Company Name', 'Company URL', 'Stand', 'Company USP', 'Address', 'PRODUCT CATEGORY', 'INDUSTRIES',
-                   'SUSTAINABILITY INITIATIVE', 'Official Website', 'Facebook handle', 'LinkedIn handle',
-                   'Instagram handle', 'YouTube handle']
-        with open(filename, mode='w', newline='', encoding='utf-8') as file:
-            writer = csv.writer(file)
-            writer.writerow(headers)
-            writer.writerows(self.data)
-        print(f"Data successfully saved to {filename}")
+        headers = EXHIBITOR_HEADERS + ['Status'] if self.statuses else EXHIBITOR_HEADERS
+        with CsvSink(filename, headers) as sink:
+            for index, row in enumerate(self.data):
+                sink.write(row + (self.statuses[index],) if self.statuses else row)
+        logger.info('data saved', extra={'file': filename})
 
 
 if __name__ == "__main__":
-    scraper = ExhibitorsScraper(MAIN_URL, BASE_URL)
-    scraper.scrape()
-    scraper.save_to_csv('exhibitors_info.csv')
+    export_from_environment('exhibitors')
+    response_cache = ResponseCache()
+    page_index = FingerprintIndex(site='exhibitors')
+    scraper = ExhibitorsScraper(MAIN_URL, BASE_URL, parse_workers=os.cpu_count() or 1, partial_parse=True,
+                                cache=response_cache, index=page_index)
+    # Optional output file argument; its extension picks the format (.csv, .jsonl, .parquet, .arrow)
+    output_files = [arg for arg in sys.argv[1:] if not arg.startswith('--')]
+    # --diff=<file> lists the exhibitors new, changed or removed since the previous run
+    diff_files = [arg.split('=', 1)[1] for arg in sys.argv[1:] if arg.startswith('--diff=')]
+    scraper.scrape_to_file(output_files[0] if output_files else 'exhibitors_info.csv',
+                           incremental='--incremental' in sys.argv[1:], diff_file=diff_files[0] if diff_files else None)
+    logger.info('response cache', extra=response_cache.stats())
+    logger.info('fingerprint index', extra=page_index.stats())
+    page_index.close()
+    logger.info('retries', extra=RETRY_POLICY.stats())
+    finish_run('exhibitors')
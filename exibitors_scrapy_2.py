@@ -1,188 +1,367 @@
-import csv
+import json
+import os
 import re
-import pandas as pd
+import sys
+from urllib.parse import urlsplit
+
 import requests
-from bs4 import BeautifulSoup
+from bs4 import BeautifulSoup, SoupStrainer
 
+from engine import RETRY_POLICY, ScrapeEngine, SiteSpec, build_session, fetch_page, page_slug, page_url
+from fingerprints import FingerprintIndex
+from frontier import normalize_url
+from http_cache import REQUEST_TIMEOUT, ResponseCache
+from instrumentation import REGISTRY, export_from_environment, finish_run, get_logger, stage
+from retry import CircuitOpenError
+from sinks import Column, iter_rows, open_sink
 
-# Function to extract information from a company page
-def extract_company_info(company_url):
+MAX_WORKERS = 16
+PARTNERS_URL = "https://vivatechnology.com/partners"
+PARSE_WORKERS = os.cpu_count() or 1
+COMPANY_INFO_HEADERS = [
+    "Company Name", "Company Event URL", "Location", "Company Description", "Booth Number", "Booth Schedule",
+    "Creation", "Employees", "Industry Type", "City",
+    "Fundraising Amount",
+    "Official Website", "Development Level", "Looking For", "Type of Company(Startup or Not)", "HashTags",
+    "LinkedIN",
+    "Instagram"
+]
+# Typed columns for the JSONL/Parquet/Arrow outputs; CSV keeps the scraped text as is
+COMPANY_INFO_TYPES = {"Creation": "int", "Employees": "int", "Fundraising Amount": "float", "Looking For": "list",
+                      "HashTags": "list"}
+COMPANY_INFO_SCHEMA = [Column(name, COMPANY_INFO_TYPES.get(name, "string")) for name in COMPANY_INFO_HEADERS]
+
+# Class strings of the containers parse_company_info reads, used by the partial-parse strainer below
+DESCRIPTION_CLASS = "my-4 md:my-8 text-sm md:text-[16px] text-purple"
+HASHTAG_CLASS = "relative max-w-fit inline-flex items-center justify-between box-border whitespace-nowrap text-small rounded-full text-default-foreground bg-gradient-main opacity-80 h-5 xl:h-8 min-w-0 xl:min-w-8 p-[2px] before:content-[''] before:absolute before:bg-white before:w-[calc(100%-4px)] before:h-[calc(100%-4px)] before:rounded-large cursor-pointer"
+BOOTH_CLASS = "text-purple text-xs lg:text-base font-bold"
+LOCATION_CLASS = "mt-2 text-sm xl:text-md uppercase"
+INDUSTRY_TYPE_CLASS = "flex-1 p-0 font-bold bg-gradient-main bg-clip-text text-transparent"
+RELEVANT_CLASSES = {
+    "div": {DESCRIPTION_CLASS, HASHTAG_CLASS, BOOTH_CLASS, LOCATION_CLASS},
+    "span": {INDUSTRY_TYPE_CLASS},
+}
+# Tags kept whole regardless of class: the serialized JSON scripts, the "Visit website" link and the industry <p> pair
+RELEVANT_TAGS = {"script", "a", "p"}
+
+
+# Partial-parse filter: called with the raw start tag, keeps only the subtrees parse_company_info reads
+def is_relevant_tag(name, attrs):
+    if name in RELEVANT_TAGS:
+        return True
+    classes = attrs.get("class")
+    if not classes or name not in RELEVANT_CLASSES:
+        return False
+    class_string = " ".join(classes.split() if isinstance(classes, str) else classes)
+    return class_string in RELEVANT_CLASSES[name]
+
+
+COMPANY_PAGE_STRAINER = SoupStrainer(is_relevant_tag)
+
+# Next.js streams the page data as "flight" rows (`<id>:<json>`) through self.__next_f.push([1, "<escaped>"])
+NEXT_F_PUSH_PATTERN = re.compile(r'self\.__next_f\.push\(\[1,\s*("(?:[^"\\]|\\.)*")\]\)', re.S)
+FLIGHT_ROW_ID_PATTERN = re.compile(r'[0-9a-f]+')
+FLIGHT_REFERENCE_PATTERN = re.compile(r'\$[@L]?([0-9a-f]+)')
+# Keys that only the company record carries, used to find it among the other flight rows
+COMPANY_RECORD_KEYS = {"creation", "employees", "stage", "fundraising_amount", "looking_for"}
+LOOKING_FOR_ROW_ID = "24"
+
+# Fallbacks for pages whose payload cannot be decoded, compiled once instead of on every company
+COMPANY_SCRIPT_PATTERN = re.compile("creation|employees|city|development level|fundraising amount|looking_for|website")
+ESCAPED_FIELD_PATTERNS = {
+    field: re.compile(r'\\"%s\\":\\"(.*?)\\"' % field)
+    for field in ("creation", "employees", "city", "fundraising_amount", "website", "stage", "type", "linkedin",
+                  "instagram")
+}
+ESCAPED_LOOKING_FOR_PATTERN = re.compile(r'\\n24:\[(.*?)\]')
+
+session = build_session(MAX_WORKERS)
+retry_policy = RETRY_POLICY  # the engine's policy, so retry budget and circuit breakers are shared with it
+logger = get_logger('vivatech')
+
+
+# Function to download a company page (through the response cache when given),
+# parsing happens separately in parse_company_info
+def fetch_company_page(company_url, cache=None):
     try:
-        # Fetch the HTML content of the company page
-        company_response = requests.get(company_url)
-        company_html_content = company_response.text
-        company_soup = BeautifulSoup(company_html_content, "html.parser")
-        if not company_soup:
-            pass
-
-        # Extract company description
-        company_description_element = company_soup.find("div", class_="my-4 md:my-8 text-sm md:text-[16px] text-purple")
-        company_description = company_description_element.text.strip() if company_description_element else ""
-
-        # Extract company hashtags
-        _hashtags_list = []
-        company_hastags_element = company_soup.find_all("div",
-                                                        class_="relative max-w-fit inline-flex items-center justify-between box-border whitespace-nowrap text-small rounded-full text-default-foreground bg-gradient-main opacity-80 h-5 xl:h-8 min-w-0 xl:min-w-8 p-[2px] before:content-[''] before:absolute before:bg-white before:w-[calc(100%-4px)] before:h-[calc(100%-4px)] before:rounded-large cursor-pointer")
-        if company_hastags_element:
-            for _single in company_hastags_element:
-                _hashtags_list.append(_single.text.strip())
-        _hashtags = ', '.join(_hashtags_list)  # remove list by string
-        # Extract booth information
-        booth_element = company_soup.find("div", class_="text-purple text-xs lg:text-base font-bold")
-        booth_info = {"booth number": "", "booth schedule": ""}
-        if booth_element:
-            booth_number_element = booth_element.find("span", class_="ml-1 uppercase")
-            booth_info["booth number"] = booth_number_element.text.strip() if booth_number_element else ""
-            booth_schedule_span = booth_element.find("span", class_="ml-2")
-            if booth_schedule_span:
-                booth_info["booth schedule"] = booth_schedule_span.text.strip()
-
-        # Extract location information
-        location_element = company_soup.find("div", class_="mt-2 text-sm xl:text-md uppercase")
-        location = location_element.text.strip() if location_element else ""
-
-        # Extract Industry type
-        industry_element = company_soup.find('span',
-                                             class_='flex-1 p-0 font-bold bg-gradient-main bg-clip-text text-transparent')
-        # Get the text inside the <span> tag
-        industry_type = industry_element.text if industry_element else ""
-        # Find script tags containing relevant data
-        script_tags = company_soup.find_all("script", string=re.compile(
-            "creation|employees|city|development level|fundraising amount|looking_for|website"))
-
-        # Extract creation, employees, city, development level, fundraising amount, and founding year information
-        creation, employees, city, fundraising_amount, official_company_website, development_level, looking_for, type, hashtags, linkedIn, instagram = "", "", "", "", "", "", "", "", "", "", ""
-        for script in script_tags:
-            script_text = script.get_text()
-            # Extracting linkedin, instagram, and creation using regular expressions
-            creation_match = re.search(r'\\"creation\\":\\"(.*?)\\"', script_text)
-            employees_match = re.search(r'\\"employees\\":\\"(.*?)\\"', script_text)
-            city_match = re.search(r'\\"city\\":\\"(.*?)\\"', script_text)
-            fundraising_amount_match = re.search(r'\\"fundraising_amount\\":\\"(.*?)\\"', script_text)
-            official_website_match = re.search(r'\\"website\\":\\"(.*?)\\"', script_text)
-            development_level_match = re.search(r'\\"stage\\":\\"(.*?)\\"', script_text)
-            looking_for_match = re.search(r'\\n24:\[(.*?)\]', script_text)
-            type_of_company_match = re.search(r'\\"type\\":\\"(.*?)\\"', script_text)
-            linkedin_match = re.search(r'\\"linkedin\\":\\"(.*?)\\"', script_text)
-            instagram_match = re.search(r'\\"instagram\\":\\"(.*?)\\"', script_text)
-
-            # Extracting values if found
-            creation = creation_match.group(1) if creation_match else None
-            employees = employees_match.group(1) if employees_match else None
-            city = city_match.group(1) if city_match else None
-            fundraising_amount = fundraising_amount_match.group(1) if fundraising_amount_match else None
-            official_company_website = official_website_match.group(1) if official_website_match else None
-            development_level = development_level_match.group(1) if development_level_match else None
-            #
-            looking = looking_for_match.group(1) if looking_for_match else None
-            if looking:
-                looking_for_value = looking.replace('\\', '')
-                looking_for = looking_for_value.split('","')
-            type = type_of_company_match.group(1) if type_of_company_match else None
-            linkedIn = linkedin_match.group(1) if linkedin_match else None
-            instagram = instagram_match.group(1) if instagram_match else None
-            break
-
-        # # Extract company website
-        website_element = company_soup.find("a", string="Visit website")
-        website = website_element.get("href") if website_element else ""
-
-        # Extract industry information
-        industry_element = company_soup.find("p", class_="text-gray text-[16px]", string="industry")
-        industry = industry_element.find_next_sibling("p").text.strip() if industry_element else ""
-        return {
-            "company description": company_description,
-            "booth number": booth_info["booth number"],
-            "booth schedule": booth_info["booth schedule"],
-            "location": location,
-            "creation": creation,
-            "employees": employees,
-            "industry type": industry_type,
-            "city": city,
-            "fundraising amount": fundraising_amount,
-            "official website": official_company_website,
-            "development level": development_level,
-            "looking for": looking_for,
-            "type": type,
-            "hashtags": _hashtags,
-            "linkedIN": linkedIn,
-            "instagram": instagram
-        }
-    except requests.exceptions.RequestException as e:
+        # Connection errors, timeouts, 429 and 5xx are retried with jittered backoff before giving up
+        content = fetch_page(company_url, session, cache, retry_policy)
+        return content.decode("utf-8", errors="replace") if content is not None else None
+    except (requests.exceptions.RequestException, CircuitOpenError) as e:
         # Skip to the next URL if a connection error occurs
-        print(f"Skipping {company_url} due to connection error: {e}")
+        REGISTRY.increment("failures_total", stage="fetch")
+        logger.warning("skipping company", extra={"url": company_url, "error": repr(e)})
         return None  # Return None to indicate failure
 
 
-# Initialize list to store company information
-company_info = []
-all_products_df = pd.read_csv('company_info_copy.csv')
-unique_urls = all_products_df['Company Event URL'].tolist()
-
-# Extract information for each company
-count = 0
-for url in unique_urls:
-    print('Company Entry no------------->', count)
-    # Company Name
-    company_name = url.split("/")[-1]
-
-    # Company URL
-    company_url = f"https://vivatechnology.com/partners/{company_name}"
-
-    # Extract the rest of the information from the company page
-    company_info.append([company_name, company_url, extract_company_info(company_url)])
-    count += 1
-# Write company information to a CSV file
-with open("company_info.csv", "w", newline="", encoding="utf-8") as csvfile:
-    writer = csv.writer(csvfile)
-    # Write header
-    writer.writerow([
-        "Company Name", "Company Event URL", "Location", "Company Description", "Booth Number", "Booth Schedule",
-        "Creation", "Employees", "Industry Type", "City",
-        "Fundraising Amount",
-        "Official Website", "Development Level", "Looking For", "Type of Company(Startup or Not)", "HashTags",
-        "LinkedIN",
-        "Instagram"
-    ])
-    # Write data rows
-    for company in company_info:
+# Function to unescape every self.__next_f.push chunk once and index the flight rows by id
+def decode_flight_rows(script_texts):
+    stream = []
+    for script_text in script_texts:
+        for chunk in NEXT_F_PUSH_PATTERN.findall(script_text):
+            try:
+                stream.append(json.loads(chunk))
+            except ValueError:
+                continue
+
+    rows = {}
+    for line in "".join(stream).split("\n"):
+        row_id, separator, value = line.partition(":")
+        if not separator or not FLIGHT_ROW_ID_PATTERN.fullmatch(row_id):
+            continue
         try:
-            writer.writerow([
-                company[0], company[1],
-                company[2].get("location", ""),
-                company[2].get("company description", ""),
-                company[2].get("booth number", ""),
-                company[2].get("booth schedule", ""),
-                company[2].get("creation", ""),
-                company[2].get("employees", ""),
-                company[2].get("industry type", ""),
-                company[2].get("city", ""),
-                company[2].get("fundraising amount", ""),
-                company[2].get("official website", ""),
-                company[2].get("development level", ""),
-                company[2].get("looking for", ""),
-                company[2].get("type", ""),
-                company[2].get("hashtags", ""),
-                company[2].get("linkedIN", ""),
-                company[2].get("instagram", "")
-            ])
-        except Exception as e:
-            print(f"Error occurred while writing data for {company[0]}: {e}")
-
-print("CSV file created successfully.")
-
-url = "https://www.businesstravelshoweurope.com/exhibitors"
-response = requests.get(url)
-if response.status_code == 200:
-    soup = BeautifulSoup(response.content, 'html.parser')
-    main_div = soup.find('div', class_='js-library-list-outer')
-    href_list = []
-    if main_div:
-        a_tags = main_div.find_all('a', class_='js-librarylink-entry')
-        for tag in a_tags:
-            href = tag.get('href')
-            if href:
-                href_list.append(href)
-    print(href_list)
-else:
-    print(f"Failed to retrieve the webpage. Status code: {response.status_code}")
+            rows[row_id] = json.loads(value)
+        except ValueError:
+            continue  # module ("I[...]") and text ("T...") rows are not JSON and never hold company data
+    return rows
+
+
+# Function to replace "$<id>" references by the flight row they point to ("$$" escapes a literal dollar)
+def resolve_flight_references(value, rows, depth=0):
+    if isinstance(value, str):
+        if value.startswith("$$"):
+            return value[1:]
+        match = FLIGHT_REFERENCE_PATTERN.fullmatch(value)
+        if match and match.group(1) in rows and depth < 8:
+            return resolve_flight_references(rows[match.group(1)], rows, depth + 1)
+        return value
+    if isinstance(value, list):
+        return [resolve_flight_references(item, rows, depth + 1) for item in value]
+    if isinstance(value, dict):
+        return {key: resolve_flight_references(item, rows, depth + 1) for key, item in value.items()}
+    return value
+
+
+# Function to find the company record in the decoded flight rows and return every field it carries
+def decode_company_payload(script_texts):
+    rows = decode_flight_rows(script_texts)
+    pending = list(reversed(list(rows.values())))
+    while pending:
+        node = pending.pop()
+        if isinstance(node, dict):
+            if len(COMPANY_RECORD_KEYS.intersection(node)) >= 2:
+                record = resolve_flight_references(node, rows)
+                if isinstance(record.get("socials"), dict):
+                    for network, handle in record["socials"].items():
+                        record.setdefault(network, handle)
+                if "looking_for" not in record and isinstance(rows.get(LOOKING_FOR_ROW_ID), list):
+                    record["looking_for"] = rows[LOOKING_FOR_ROW_ID]
+                return record
+            pending.extend(reversed(list(node.values())))
+        elif isinstance(node, list):
+            pending.extend(reversed(node))
+    return None
+
+
+# Function to pull the company fields straight out of the escaped script text when the payload does not decode
+def search_escaped_company_fields(script_text):
+    record = {}
+    for field, pattern in ESCAPED_FIELD_PATTERNS.items():
+        match = pattern.search(script_text)
+        record[field] = match.group(1) if match else None
+    looking_for_match = ESCAPED_LOOKING_FOR_PATTERN.search(script_text)
+    if looking_for_match and looking_for_match.group(1):
+        record["looking_for"] = looking_for_match.group(1).replace('\\', '').split('","')
+    return record
+
+
+# Function to extract information from a company page
+def extract_company_info(company_url):
+    return parse_company_info(fetch_company_page(company_url))
+
+
+# Function to extract information from downloaded company page HTML.
+# Runs inside the process pool, so it only takes and returns plain strings/dicts.
+# With partial_parse only the booth/location/description containers and <script>/<a>/<p> tags are built.
+def parse_company_info(company_html_content, partial_parse=False):
+    if company_html_content is None:
+        return None
+    with stage("parse"):
+        company_soup = BeautifulSoup(company_html_content, "html.parser",
+                                     parse_only=COMPANY_PAGE_STRAINER if partial_parse else None)
+    with stage("extract"):
+        return extract_company_details(company_soup)
+
+
+# Company fields of a parsed partner page, keyed by lowercase name (also the `record` of the engine's VivaTech spec)
+def extract_company_details(company_soup):
+    # Extract company description
+    company_description_element = company_soup.find("div", class_=DESCRIPTION_CLASS)
+    company_description = company_description_element.text.strip() if company_description_element else ""
+
+    # Extract company hashtags
+    _hashtags_list = []
+    company_hastags_element = company_soup.find_all("div", class_=HASHTAG_CLASS)
+    if company_hastags_element:
+        for _single in company_hastags_element:
+            _hashtags_list.append(_single.text.strip())
+    _hashtags = ', '.join(_hashtags_list)  # remove list by string
+    # Extract booth information
+    booth_element = company_soup.find("div", class_=BOOTH_CLASS)
+    booth_info = {"booth number": "", "booth schedule": ""}
+    if booth_element:
+        booth_number_element = booth_element.find("span", class_="ml-1 uppercase")
+        booth_info["booth number"] = booth_number_element.text.strip() if booth_number_element else ""
+        booth_schedule_span = booth_element.find("span", class_="ml-2")
+        if booth_schedule_span:
+            booth_info["booth schedule"] = booth_schedule_span.text.strip()
+
+    # Extract location information
+    location_element = company_soup.find("div", class_=LOCATION_CLASS)
+    location = location_element.text.strip() if location_element else ""
+
+    # Extract Industry type
+    industry_element = company_soup.find('span', class_=INDUSTRY_TYPE_CLASS)
+    # Get the text inside the <span> tag
+    industry_type = industry_element.text if industry_element else ""
+    # Decode the serialized page data once; fall back to field regexes over the first matching script
+    script_texts = [script.get_text() for script in company_soup.find_all("script")]
+    company_record = decode_company_payload(script_texts)
+    if company_record is None:
+        company_script = next((text for text in script_texts if COMPANY_SCRIPT_PATTERN.search(text)), None)
+        company_record = search_escaped_company_fields(company_script) if company_script is not None else {}
+
+    # Extract creation, employees, city, development level, fundraising amount, and founding year information
+    if company_record:
+        creation = company_record.get("creation")
+        employees = company_record.get("employees")
+        city = company_record.get("city")
+        fundraising_amount = company_record.get("fundraising_amount")
+        official_company_website = company_record.get("website")
+        development_level = company_record.get("stage")
+        looking_for = company_record.get("looking_for") or ""
+        type = company_record.get("type")
+        linkedIn = company_record.get("linkedin")
+        instagram = company_record.get("instagram")
+    else:
+        creation, employees, city, fundraising_amount, official_company_website, development_level, looking_for, type, linkedIn, instagram = "", "", "", "", "", "", "", "", "", ""
+
+    # # Extract company website
+    website_element = company_soup.find("a", string="Visit website")
+    website = website_element.get("href") if website_element else ""
+
+    # Extract industry information
+    industry_element = company_soup.find("p", class_="text-gray text-[16px]", string="industry")
+    industry = industry_element.find_next_sibling("p").text.strip() if industry_element else ""
+    company_details = {
+        "company description": company_description,
+        "booth number": booth_info["booth number"],
+        "booth schedule": booth_info["booth schedule"],
+        "location": location,
+        "creation": creation,
+        "employees": employees,
+        "industry type": industry_type,
+        "city": city,
+        "fundraising amount": fundraising_amount,
+        "official website": official_company_website,
+        "development level": development_level,
+        "looking for": looking_for,
+        "type": type,
+        "hashtags": _hashtags,
+        "linkedIN": linkedIn,
+        "instagram": instagram
+    }
+    # Expose every other scalar/list field of the payload (twitter, facebook, name, ...) next to the fixed ones
+    for field, value in company_record.items():
+        if isinstance(value, (str, int, float, list)):
+            company_details.setdefault(field.replace("_", " "), value)
+    return company_details
+
+
+# Engine field holding the whole extract_company_details dict of the page
+def company_details(page):
+    return page.record
+
+
+# What iter_companies scrapes from a partner page: [company name, company URL, company details]
+COMPANY_DETAILS_SPEC = SiteSpec(
+    name="vivatech",
+    fields={"Company Name": page_slug, "Company Event URL": page_url, "Company Details": company_details},
+    record=extract_company_details,
+    strainer=COMPANY_PAGE_STRAINER,
+)
+
+
+# Yields [company name, company URL, company details] in input order as soon as each page is parsed, through a
+# ScrapeEngine over COMPANY_DETAILS_SPEC (downloads on threads, parsing in a process pool with parse_workers).
+# unique_urls may be a lazy iterable: only `window` URLs (default 4 per fetch worker) are read ahead of the output.
+# Input URLs are normalized first, so trailing slashes or tracking queries neither break the company name nor
+# cause a company to be fetched twice. With `index` (a FingerprintIndex), unchanged pages are not parsed again
+def iter_companies(unique_urls, max_workers=MAX_WORKERS, parse_workers=PARSE_WORKERS, partial_parse=False,
+                   cache=None, window=None, partners_url=PARTNERS_URL, index=None):
+    company_names = (urlsplit(normalize_url(url)).path.split("/")[-1] for url in unique_urls)
+    company_urls = (f"{partners_url}/{company_name}" for company_name in company_names if company_name)
+    engine = ScrapeEngine(COMPANY_DETAILS_SPEC, max_workers, parse_workers, partial_parse, cache, retry_policy,
+                          window, index=index, session=session)
+    for count, company in enumerate(engine.iter_rows(company_urls)):
+        logger.debug("company scraped", extra={"count": count, "url": company[1]})
+        yield company
+
+
+# Flatten one scraped company into a company_info.csv row
+def company_row(company):
+    return [
+        company[0], company[1],
+        company[2].get("location", ""),
+        company[2].get("company description", ""),
+        company[2].get("booth number", ""),
+        company[2].get("booth schedule", ""),
+        company[2].get("creation", ""),
+        company[2].get("employees", ""),
+        company[2].get("industry type", ""),
+        company[2].get("city", ""),
+        company[2].get("fundraising amount", ""),
+        company[2].get("official website", ""),
+        company[2].get("development level", ""),
+        company[2].get("looking for", ""),
+        company[2].get("type", ""),
+        company[2].get("hashtags", ""),
+        company[2].get("linkedIN", ""),
+        company[2].get("instagram", "")
+    ]
+
+
+if __name__ == "__main__":
+    export_from_environment("vivatech")
+    # Input and output files may be CSV, JSONL, Parquet or Arrow, picked by extension
+    input_file = sys.argv[1] if len(sys.argv) > 1 else "company_info_copy.csv"
+    output_file = sys.argv[2] if len(sys.argv) > 2 else "company_info.csv"
+    # Optional third file: the companies new, changed or removed since the previous run
+    diff_file = sys.argv[3] if len(sys.argv) > 3 else None
+    # Stream only the URL column of the input; iter_companies reads it as capacity frees up
+    unique_urls = (row["Company Event URL"] for row in iter_rows(input_file, ["Company Event URL"]))
+
+    # Extract information for each company and stream it to the output file as it arrives
+    response_cache = ResponseCache()
+    page_index = FingerprintIndex(site="vivatech")
+    with open_sink(output_file, COMPANY_INFO_SCHEMA) as sink:
+        for company in iter_companies(unique_urls, partial_parse=True, cache=response_cache, index=page_index):
+            try:
+                sink.write(company_row(company))
+            except Exception as e:
+                REGISTRY.increment("failures_total", stage="write")
+                logger.warning("row not written", extra={"company": company[0], "error": repr(e)})
+
+    logger.info("data saved", extra={"file": output_file})
+    page_index.finish(diff_file)
+    page_index.close()
+    logger.info("response cache", extra=response_cache.stats())
+    logger.info("fingerprint index", extra=page_index.stats())
+    logger.info("retries", extra=retry_policy.stats())
+    finish_run("vivatech")
+
+    url = "https://www.businesstravelshoweurope.com/exhibitors"
+    response = requests.get(url, timeout=REQUEST_TIMEOUT)
+    if response.status_code == 200:
+        soup = BeautifulSoup(response.content, 'html.parser')
+        main_div = soup.find('div', class_='js-library-list-outer')
+        href_list = []
+        if main_div:
+            a_tags = main_div.find_all('a', class_='js-librarylink-entry')
+            for tag in a_tags:
+                href = tag.get('href')
+                if href:
+                    href_list.append(href)
+        print(href_list)
+    else:
+        print(f"Failed to retrieve the webpage. Status code: {response.status_code}")
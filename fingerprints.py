@@ -0,0 +1,158 @@
+import hashlib
+import json
+import re
+import sqlite3
+import threading
+from typing import Any, Dict, Iterable, List, NamedTuple, Optional, Tuple
+
+from instrumentation import REGISTRY, get_logger
+from sinks import open_sink
+
+DEFAULT_INDEX_PATH = ".page_index.sqlite"
+BODY_REGION = (b'<body', b'</body>')  # the <head> holds most per-request tokens and never any scraped field
+COMMIT_EVERY = 200  # records written between two commits; finish() commits the rest
+DIFF_HEADERS = ['URL', 'Status', 'Changed Columns']
+# Markup that differs between two fetches of an unchanged page: comments (render ids, timings), CSP nonces,
+# CSRF inputs and meta tags and the Next.js build id
+VOLATILE_PATTERN = re.compile(
+    rb'<!--.*?-->'
+    rb'|\snonce="[^"]*"'
+    rb'|<(?:input|meta)\b[^>]*\b(?:name|id)="[^"]*(?:csrf|xsrf|token)[^"]*"[^>]*>'
+    rb'|"buildId":"[^"]*"',
+    re.I | re.S,
+)
+# Cache-busting query strings, only stripped inside asset tags: links the scrapers extract (e.g. a YouTube
+# watch?v=...) must still change the fingerprint
+ASSET_TAG_PATTERN = re.compile(rb'<(?:script|link|img|source)\b[^>]*>', re.I)
+CACHE_BUSTER_PATTERN = re.compile(rb'[?&](?:v|ver|version|cb|_)=[\w.-]+(?=["\'&])', re.I)
+WHITESPACE_PATTERN = re.compile(rb'\s+')
+INTER_TAG_WHITESPACE_PATTERN = re.compile(rb'>\s+<')
+logger = get_logger('fingerprints')
+
+
+def relevant_region(content: bytes, region: Optional[Tuple[bytes, bytes]] = None) -> bytes:
+    """Bytes from the first start marker of `region` (the body by default) to its last end marker."""
+    start, end = region or BODY_REGION
+    begin = max(content.find(start), 0)
+    finish = content.rfind(end)
+    return content[begin:finish if finish > begin else len(content)]
+
+
+def content_fingerprint(content: bytes, region: Optional[Tuple[bytes, bytes]] = None,
+                        columns: Iterable[str] = ()) -> str:
+    """
+    Digest of the page's relevant region with volatile tokens stripped and whitespace collapsed, so two fetches of
+    an unchanged page agree. `columns` are mixed in: a record extracted for other columns is not a match.
+    """
+    normalized = VOLATILE_PATTERN.sub(b'', relevant_region(content, region))
+    normalized = ASSET_TAG_PATTERN.sub(lambda tag: CACHE_BUSTER_PATTERN.sub(b'', tag.group()), normalized)
+    normalized = WHITESPACE_PATTERN.sub(b' ', INTER_TAG_WHITESPACE_PATTERN.sub(b'><', normalized))
+    digest = hashlib.blake2b(normalized, digest_size=16)
+    digest.update('\x1f'.join(columns).encode('utf-8'))
+    return digest.hexdigest()
+
+
+class Change(NamedTuple):
+    url: str
+    status: str  # new / changed / removed
+    columns: str  # comma-joined names of the changed columns
+
+
+class FingerprintIndex:
+    """
+    Local SQLite index of page content fingerprints and the records extracted from them, per site.
+
+    A scraper fingerprints every page it downloads and asks `lookup` for the record extracted last time from the
+    same content: on a match the page is not parsed again. Every row of the run then goes through `record`, which
+    compares it with the stored one, so `finish` can report what is new, changed or gone since the last run.
+    """
+    __slots__ = ('path', 'site', 'run', 'hits', 'misses', '_changes', '_pending', '_lock', '_connection')
+
+    def __init__(self, path: str = DEFAULT_INDEX_PATH, site: str = 'default'):
+        self.path = path
+        self.site = site
+        self.hits = 0
+        self.misses = 0
+        self._changes: List[Change] = []
+        self._pending = 0
+        self._lock = threading.Lock()
+        self._connection = sqlite3.connect(path, check_same_thread=False)
+        self._connection.execute(
+            "CREATE TABLE IF NOT EXISTS pages ("
+            "site TEXT, url TEXT, fingerprint TEXT, record TEXT, run INTEGER, PRIMARY KEY (site, url))"
+        )
+        self._connection.commit()
+        last_run = self._connection.execute("SELECT MAX(run) FROM pages WHERE site = ?", (site,)).fetchone()[0]
+        self.run = (last_run or 0) + 1
+
+    def lookup(self, url: str, fingerprint: str) -> Optional[Dict[str, Any]]:
+        """The record stored for `url` if it was extracted from content with the same fingerprint, else None."""
+        with self._lock:
+            row = self._connection.execute("SELECT fingerprint, record FROM pages WHERE site = ? AND url = ?",
+                                           (self.site, url)).fetchone()
+            hit = row is not None and row[0] == fingerprint
+            if hit:
+                self.hits += 1
+            else:
+                self.misses += 1
+        REGISTRY.increment('fingerprint_lookups_total', outcome='hits' if hit else 'misses')
+        return json.loads(row[1]) if hit else None
+
+    def record(self, url: str, fingerprint: Optional[str], values: Dict[str, Any]) -> str:
+        """
+        Store the row scraped for `url` this run and return its status: new, changed or unchanged. Without a
+        `fingerprint` (the page was not downloaded, e.g. the listing card sufficed) the stored one is kept.
+        """
+        with self._lock:
+            row = self._connection.execute("SELECT fingerprint, record FROM pages WHERE site = ? AND url = ?",
+                                           (self.site, url)).fetchone()
+            if row is None:
+                status, changed = 'new', []
+            else:
+                previous = json.loads(row[1])
+                changed = [column for column, value in values.items() if previous.get(column) != value]
+                status = 'changed' if changed else 'unchanged'
+                fingerprint = fingerprint or row[0]
+            self._connection.execute("INSERT OR REPLACE INTO pages VALUES (?, ?, ?, ?, ?)",
+                                     (self.site, url, fingerprint, json.dumps(values), self.run))
+            if status != 'unchanged':
+                self._changes.append(Change(url, status, ', '.join(changed)))
+            self._pending += 1
+            if self._pending >= COMMIT_EVERY:
+                self._connection.commit()
+                self._pending = 0
+        return status
+
+    def touch(self, url: str) -> None:
+        """Keep `url` in this run although it was not scraped (failed fetch, or done by an earlier run and skipped)."""
+        with self._lock:
+            self._connection.execute("UPDATE pages SET run = ? WHERE site = ? AND url = ?", (self.run, self.site, url))
+
+    def finish(self, diff_file: Optional[str] = None) -> List[Change]:
+        """
+        End the run: pages earlier runs stored but this one did not reach are reported removed and forgotten.
+        Returns the new, changed and removed pages, also written to `diff_file` (any sink format) when given.
+        """
+        with self._lock:
+            removed = [Change(url, 'removed', '') for (url,) in self._connection.execute(
+                "SELECT url FROM pages WHERE site = ? AND run < ?", (self.site, self.run))]
+            self._connection.execute("DELETE FROM pages WHERE site = ? AND run < ?", (self.site, self.run))
+            self._connection.commit()
+            self._pending = 0
+            changes = self._changes + removed
+        if diff_file:
+            with open_sink(diff_file, DIFF_HEADERS) as sink:
+                for change in changes:
+                    sink.write(list(change))
+        logger.info('run compared', extra={'site': self.site, 'new': sum(c.status == 'new' for c in changes),
+                                           'changed': sum(c.status == 'changed' for c in changes),
+                                           'removed': len(removed), 'parses_skipped': self.hits})
+        return changes
+
+    def stats(self) -> Dict[str, int]:
+        return {'hits': self.hits, 'misses': self.misses}
+
+    def close(self) -> None:
+        with self._lock:
+            self._connection.commit()
+            self._connection.close()
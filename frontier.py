@@ -0,0 +1,230 @@
+import hashlib
+import heapq
+import math
+import os
+import re
+import struct
+import threading
+import time
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+from urllib.parse import parse_qsl, quote, urlencode, urljoin, urlsplit, urlunsplit
+
+DEFAULT_CAPACITY = 1_000_000
+DEFAULT_ERROR_RATE = 1e-6
+DEFAULT_PORTS = {'http': 80, 'https': 443}
+# Query parameters that only carry campaign/click attribution and never change the page served
+TRACKING_PARAMS = frozenset({'gclid', 'fbclid', 'msclkid', 'dclid', 'yclid', 'igshid', 'mc_cid', 'mc_eid', '_ga',
+                             '_gl', '_hsenc', '_hsmi'})
+TRACKING_PREFIXES = ('utm_', 'hsa_', 'pk_')
+PATH_SAFE_CHARACTERS = "/:@!$&'()*+,;=-._~%"
+PERCENT_ESCAPE_PATTERN = re.compile(r'%[0-9a-fA-F]{2}')
+BLOOM_MAGIC = b'BLM1'
+BLOOM_HEADER = struct.Struct('<4sQQQ')  # magic, size in bits, hash count, items added
+
+
+def is_tracking_param(name: str) -> bool:
+    name = name.lower()
+    return name in TRACKING_PARAMS or name.startswith(TRACKING_PREFIXES)
+
+
+def _canonical_path(path: str) -> str:
+    """Resolve '.', '..' and empty segments, upper-case percent escapes and drop the trailing slash."""
+    segments: List[str] = []
+    for segment in path.split('/'):
+        if segment == '..':
+            if segments:
+                segments.pop()
+        elif segment not in ('', '.'):
+            segments.append(segment)
+    path = quote('/' + '/'.join(segments), safe=PATH_SAFE_CHARACTERS)
+    return PERCENT_ESCAPE_PATTERN.sub(lambda match: match.group().upper(), path)
+
+
+def normalize_url(url: str, base: Optional[str] = None) -> str:
+    """
+    Canonical form of `url` (resolved against `base` when relative), so variants of one page dedupe to one key:
+    lower-case scheme and host, no default port, fragment or trailing slash, resolved dot segments, and the query
+    sorted with tracking parameters (utm_*, gclid, fbclid, ...) removed.
+    """
+    parts = urlsplit(urljoin(base, url.strip()) if base else url.strip())
+    scheme = parts.scheme.lower()
+    netloc = (parts.hostname or '').rstrip('.')
+    if parts.port is not None and DEFAULT_PORTS.get(scheme) != parts.port:
+        netloc = f'{netloc}:{parts.port}'
+    if parts.username:
+        netloc = f"{parts.username}{':' + parts.password if parts.password else ''}@{netloc}"
+    query = sorted((name, value) for name, value in parse_qsl(parts.query, keep_blank_values=True)
+                   if not is_tracking_param(name))
+    return urlunsplit((scheme, netloc, _canonical_path(parts.path), urlencode(query), ''))
+
+
+def url_host(url: str) -> str:
+    return urlsplit(url).netloc
+
+
+class BloomFilter:
+    """
+    Fixed-size probabilistic set of strings: no false negatives, about `error_rate` false positives while at most
+    `capacity` items have been added (more than that raises the rate). A million URLs at the default rate take
+    about 3.6 MB, and the bit array can be saved and loaded to dedupe across runs.
+    """
+    __slots__ = ('size', 'hashes', 'count', 'bits')
+
+    def __init__(self, capacity: int = DEFAULT_CAPACITY, error_rate: float = DEFAULT_ERROR_RATE):
+        capacity = max(1, capacity)
+        self.size = max(64, math.ceil(-capacity * math.log(error_rate) / math.log(2) ** 2))
+        self.hashes = max(1, round(self.size / capacity * math.log(2)))
+        self.count = 0
+        self.bits = bytearray((self.size + 7) // 8)
+
+    def _positions(self, item: str) -> Iterator[int]:
+        # Double hashing: k positions from the two halves of a single 128-bit digest
+        digest = hashlib.blake2b(item.encode('utf-8'), digest_size=16).digest()
+        first, second = int.from_bytes(digest[:8], 'little'), int.from_bytes(digest[8:], 'little') | 1
+        return ((first + index * second) % self.size for index in range(self.hashes))
+
+    def __contains__(self, item: str) -> bool:
+        return all(self.bits[position >> 3] & (1 << (position & 7)) for position in self._positions(item))
+
+    def __len__(self) -> int:
+        return self.count
+
+    def add(self, item: str) -> bool:
+        """Add `item`; False if it was (probably) present already."""
+        added = False
+        for position in self._positions(item):
+            mask = 1 << (position & 7)
+            if not self.bits[position >> 3] & mask:
+                self.bits[position >> 3] |= mask
+                added = True
+        self.count += added
+        return added
+
+    def save(self, path: str) -> None:
+        temp_path = f'{path}.tmp'
+        with open(temp_path, mode='wb') as file:
+            file.write(BLOOM_HEADER.pack(BLOOM_MAGIC, self.size, self.hashes, self.count))
+            file.write(self.bits)
+        os.replace(temp_path, path)
+
+    @classmethod
+    def load(cls, path: str) -> 'BloomFilter':
+        with open(path, mode='rb') as file:
+            magic, size, hashes, count = BLOOM_HEADER.unpack(file.read(BLOOM_HEADER.size))
+            if magic != BLOOM_MAGIC:
+                raise ValueError(f"{path} is not a saved BloomFilter")
+            bloom = cls.__new__(cls)
+            bloom.size, bloom.hashes, bloom.count = size, hashes, count
+            bloom.bits = bytearray(file.read())
+        if len(bloom.bits) != (size + 7) // 8:
+            raise ValueError(f"{path} is truncated")
+        return bloom
+
+
+class Frontier:
+    """
+    Crawl frontier: URLs are normalized, deduplicated through Bloom filters and queued per host.
+
+    `pop()` hands out the lowest `priority` value first (FIFO among equals) from the hosts that may be hit again,
+    each host waiting `delay` seconds between two of its URLs. URLs reported through `complete()` go into a second
+    filter which, with `done_path`, is loaded from and saved back to disk, so pages scraped by earlier runs are not
+    queued again while pages that failed are retried. The done pages passed over are listed in `skipped`, so the
+    caller can keep what it stored for them.
+    """
+    __slots__ = ('delay', 'done_path', 'seen', 'done', 'skipped', 'added', 'duplicates', '_queues', '_ready_at',
+                 '_counter', '_lock')
+
+    def __init__(self, delay: float = 0.0, done_path: Optional[str] = None, capacity: int = DEFAULT_CAPACITY,
+                 error_rate: float = DEFAULT_ERROR_RATE):
+        self.delay = delay
+        self.done_path = done_path
+        self.seen = BloomFilter(capacity, error_rate)  # queued by this run
+        if done_path and os.path.isfile(done_path):
+            self.done = BloomFilter.load(done_path)
+        else:
+            self.done = BloomFilter(capacity, error_rate)
+        self.skipped: List[str] = []  # normalized, each once
+        self.added = 0
+        self.duplicates = 0
+        self._queues: Dict[str, List[Tuple[int, int, str]]] = {}
+        self._ready_at: Dict[str, float] = {}
+        self._counter = 0
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        with self._lock:
+            return sum(len(queue) for queue in self._queues.values())
+
+    def claim(self, url: str, base: Optional[str] = None) -> Optional[str]:
+        """Normalized `url` if neither this run nor a saved one has seen it (it is marked seen now), else None."""
+        url = normalize_url(url, base)
+        with self._lock:
+            if url in self.done:
+                if self.seen.add(url):
+                    self.skipped.append(url)
+            elif self.seen.add(url):
+                return url
+            self.duplicates += 1
+            return None
+
+    def unique(self, urls: Iterable[str], base: Optional[str] = None) -> Iterator[str]:
+        """Lazily normalize and deduplicate `urls` without queueing them, for inputs that are already ordered."""
+        for url in urls:
+            url = self.claim(url, base)
+            if url is not None:
+                self.added += 1
+                yield url
+
+    def add(self, url: str, base: Optional[str] = None, priority: int = 0) -> bool:
+        url = self.claim(url, base)
+        if url is None:
+            return False
+        with self._lock:
+            heapq.heappush(self._queues.setdefault(url_host(url), []), (priority, self._counter, url))
+            self._counter += 1
+            self.added += 1
+        return True
+
+    def extend(self, urls: Iterable[str], base: Optional[str] = None, priority: int = 0) -> int:
+        return sum(self.add(url, base, priority) for url in urls)
+
+    def pop(self) -> Tuple[Optional[str], float]:
+        """(next URL, 0) when a host is ready, (None, seconds until one is) otherwise; (None, 0) when empty."""
+        with self._lock:
+            now = time.monotonic()
+            best_host, wait = None, math.inf
+            for host, queue in self._queues.items():
+                ready_at = self._ready_at.get(host, 0.0)
+                if ready_at > now:
+                    wait = min(wait, ready_at - now)
+                elif best_host is None or queue[0] < self._queues[best_host][0]:
+                    best_host = host
+            if best_host is None:
+                return None, 0.0 if wait == math.inf else wait
+            queue = self._queues[best_host]
+            url = heapq.heappop(queue)[2]
+            if not queue:
+                del self._queues[best_host]
+            self._ready_at[best_host] = now + self.delay
+            return url, 0.0
+
+    def __iter__(self) -> Iterator[str]:
+        """Drain the queues, sleeping whenever every queued host is still inside its politeness delay."""
+        while True:
+            url, wait = self.pop()
+            if url is not None:
+                yield url
+            elif wait:
+                time.sleep(wait)
+            else:
+                return
+
+    def complete(self, url: str) -> None:
+        """Record that `url` (as claimed, i.e. normalized) was scraped successfully."""
+        with self._lock:
+            self.done.add(url)
+
+    def save(self) -> None:
+        if self.done_path:
+            with self._lock:
+                self.done.save(self.done_path)
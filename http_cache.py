@@ -0,0 +1,219 @@
+import asyncio
+import hashlib
+import json
+import sqlite3
+import threading
+import time
+from typing import Any, Dict, NamedTuple, Optional
+
+import aiohttp
+import requests
+
+from instrumentation import REGISTRY, stage, timed_get
+
+DEFAULT_CACHE_PATH = ".http_cache.sqlite"
+DEFAULT_TTL = 24 * 60 * 60  # seconds an entry is served without asking the server
+DEFAULT_MAX_BYTES = 512 * 1024 * 1024
+ACCESS_FLUSH_SIZE = 256  # cache hits whose last_access is written in one transaction
+# Without these a stalled server blocks the request forever, and the timeout retry rules never fire
+REQUEST_TIMEOUT = (10.0, 30.0)  # requests: seconds to connect, then between two reads of the body
+CLIENT_TIMEOUT = aiohttp.ClientTimeout(total=120, sock_connect=10, sock_read=30)  # aiohttp sessions
+
+
+class CachedResponse(NamedTuple):
+    status: int
+    content_type: str
+    etag: Optional[str]
+    last_modified: Optional[str]
+    body: bytes
+    stored_at: float
+    retry_after: Optional[str] = None
+
+    def json(self) -> Any:
+        return json.loads(self.body)
+
+
+class ResponseCache:
+    """
+    On-disk HTTP response cache shared by the requests and aiohttp scrapers.
+
+    Entries are keyed by method + URL + payload and keep the ETag/Last-Modified validators, so stale entries are
+    revalidated with a conditional request instead of being downloaded again. Fresh entries (younger than `ttl`)
+    are served without any request. The total body size is bounded by `max_bytes`, evicting least recently used
+    entries first. Hits only note their access time in memory; the notes are written in batches, and always before
+    an eviction, so the least recently used order is exact whenever it is acted upon.
+    """
+    __slots__ = ('path', 'ttl', 'max_bytes', 'hits', 'misses', 'revalidated', '_lock', '_connection', '_accessed',
+                 '_total_size')
+
+    def __init__(self, path: str = DEFAULT_CACHE_PATH, ttl: float = DEFAULT_TTL, max_bytes: int = DEFAULT_MAX_BYTES):
+        self.path = path
+        self.ttl = ttl
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self.revalidated = 0
+        self._lock = threading.Lock()
+        self._connection = sqlite3.connect(path, check_same_thread=False)
+        self._connection.execute(
+            "CREATE TABLE IF NOT EXISTS responses ("
+            "key TEXT PRIMARY KEY, status INTEGER, content_type TEXT, etag TEXT, last_modified TEXT, "
+            "body BLOB, size INTEGER, stored_at REAL, last_access REAL)"
+        )
+        self._connection.execute("CREATE INDEX IF NOT EXISTS responses_last_access ON responses (last_access)")
+        self._connection.commit()
+        self._accessed: Dict[str, float] = {}  # key -> last access not yet written
+        self._total_size = self._connection.execute("SELECT COALESCE(SUM(size), 0) FROM responses").fetchone()[0]
+
+    @staticmethod
+    def make_key(method: str, url: str, payload: Optional[Dict[str, Any]] = None) -> str:
+        serialized_payload = json.dumps(payload, sort_keys=True, separators=(',', ':')) if payload is not None else ''
+        return hashlib.sha256(f'{method.upper()} {url} {serialized_payload}'.encode('utf-8')).hexdigest()
+
+    def get(self, key: str) -> Optional[CachedResponse]:
+        with self._lock:
+            row = self._connection.execute(
+                "SELECT status, content_type, etag, last_modified, body, stored_at FROM responses WHERE key = ?",
+                (key,)
+            ).fetchone()
+            if row is None:
+                return None
+            self._accessed[key] = time.time()
+            if len(self._accessed) >= ACCESS_FLUSH_SIZE:
+                self._flush_accesses()
+                self._connection.commit()
+        return CachedResponse(*row)
+
+    def is_fresh(self, entry: CachedResponse) -> bool:
+        return time.time() - entry.stored_at < self.ttl
+
+    @staticmethod
+    def conditional_headers(entry: Optional[CachedResponse]) -> Dict[str, str]:
+        headers = {}
+        if entry is not None:
+            if entry.etag:
+                headers['If-None-Match'] = entry.etag
+            if entry.last_modified:
+                headers['If-Modified-Since'] = entry.last_modified
+        return headers
+
+    def store(self, key: str, status: int, content_type: str, etag: Optional[str], last_modified: Optional[str],
+              body: bytes) -> CachedResponse:
+        now = time.time()
+        with self._lock:
+            self._flush_accesses()
+            self._accessed.pop(key, None)
+            previous = self._connection.execute("SELECT size FROM responses WHERE key = ?", (key,)).fetchone()
+            self._connection.execute(
+                "INSERT OR REPLACE INTO responses VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                (key, status, content_type, etag, last_modified, body, len(body), now, now)
+            )
+            self._total_size += len(body) - (previous[0] if previous else 0)
+            self._evict()
+            self._connection.commit()
+        return CachedResponse(status, content_type, etag, last_modified, body, now)
+
+    def touch(self, key: str, entry: CachedResponse) -> CachedResponse:
+        """Mark an entry as fresh again after the server answered 304 Not Modified."""
+        now = time.time()
+        with self._lock:
+            self._flush_accesses()
+            self._accessed.pop(key, None)
+            self._connection.execute("UPDATE responses SET stored_at = ?, last_access = ? WHERE key = ?",
+                                     (now, now, key))
+            self._connection.commit()
+        return entry._replace(stored_at=now)
+
+    def _flush_accesses(self) -> None:
+        """Write the access times noted by cache hits; the caller holds the lock and commits."""
+        if self._accessed:
+            self._connection.executemany("UPDATE responses SET last_access = ? WHERE key = ?",
+                                         [(accessed, key) for key, accessed in self._accessed.items()])
+            self._accessed.clear()
+
+    def _evict(self) -> None:
+        if self._total_size <= self.max_bytes:
+            return
+        evicted = []
+        for key, size in self._connection.execute("SELECT key, size FROM responses ORDER BY last_access"):
+            if self._total_size <= self.max_bytes:
+                break
+            evicted.append((key,))
+            self._total_size -= size
+        self._connection.executemany("DELETE FROM responses WHERE key = ?", evicted)
+
+    def count(self, outcome: str) -> None:
+        """Bump the 'hits', 'misses' or 'revalidated' counter; fetch threads share one cache."""
+        with self._lock:
+            setattr(self, outcome, getattr(self, outcome) + 1)
+        REGISTRY.increment('cache_lookups_total', outcome=outcome)
+
+    def stats(self) -> Dict[str, int]:
+        return {'hits': self.hits, 'misses': self.misses, 'revalidated': self.revalidated}
+
+    def close(self) -> None:
+        with self._lock:
+            self._flush_accesses()
+            self._connection.commit()
+            self._connection.close()
+
+
+def cached_get(cache: ResponseCache, session: requests.Session, url: str) -> CachedResponse:
+    """GET through the cache with `requests`: fresh hit, 304 revalidation, or a full download that gets stored."""
+    key = cache.make_key('GET', url)
+    entry = cache.get(key)
+    if entry is not None and cache.is_fresh(entry):
+        cache.count('hits')
+        return entry
+
+    response = timed_get(session, url, headers=cache.conditional_headers(entry), timeout=REQUEST_TIMEOUT)
+    if response.status_code == 304 and entry is not None:
+        cache.count('revalidated')
+        return cache.touch(key, entry)
+
+    cache.count('misses')
+    content_type = response.headers.get('Content-Type', '')
+    if response.status_code != 200:
+        return CachedResponse(response.status_code, content_type, None, None, response.content, time.time(),
+                              response.headers.get('Retry-After'))
+    return cache.store(key, response.status_code, content_type, response.headers.get('ETag'),
+                       response.headers.get('Last-Modified'), response.content)
+
+
+async def cached_post(cache: ResponseCache, session: aiohttp.ClientSession, url: str, payload: Dict[str, Any],
+                      headers: Optional[Dict[str, str]] = None) -> CachedResponse:
+    """POST through the cache with `aiohttp`, keyed by URL and JSON payload; sqlite runs off the event loop."""
+    key = cache.make_key('POST', url, payload)
+    entry = await asyncio.to_thread(cache.get, key)
+    if entry is not None and cache.is_fresh(entry):
+        cache.count('hits')
+        return entry
+
+    request_headers = dict(headers or {})
+    request_headers.update(cache.conditional_headers(entry))
+    async with session.post(url, json=payload, headers=request_headers) as response:
+        if response.status == 304 and entry is not None:
+            cache.count('revalidated')
+            return await asyncio.to_thread(cache.touch, key, entry)
+
+        cache.count('misses')
+        with stage('download'):
+            body = await response.read()
+        content_type = response.headers.get('Content-Type', '')
+        if response.status != 200:
+            return CachedResponse(response.status, content_type, None, None, body, time.time(),
+                                  response.headers.get('Retry-After'))
+        return await asyncio.to_thread(cache.store, key, response.status, content_type, response.headers.get('ETag'),
+                                       response.headers.get('Last-Modified'), body)
+
+
+async def post(session: aiohttp.ClientSession, url: str, payload: Dict[str, Any],
+               headers: Optional[Dict[str, str]] = None, cache: Optional[ResponseCache] = None) -> CachedResponse:
+    """POST and return the body as a CachedResponse, going through `cache` when one is configured."""
+    if cache is not None:
+        return await cached_post(cache, session, url, payload, headers)
+    async with session.post(url, json=payload, headers=headers) as response:
+        with stage('download'):
+            body = await response.read()
+        return CachedResponse(response.status, response.headers.get('Content-Type', ''), None, None, body,
+                              time.time(), response.headers.get('Retry-After'))
@@ -0,0 +1,287 @@
+import bisect
+import json
+import logging
+import os
+import sys
+import threading
+import time
+import urllib.request
+from contextlib import contextmanager
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
+
+import aiohttp
+
+LOG_LEVEL_VARIABLE = 'SCRAPER_LOG_LEVEL'  # DEBUG shows per-page/per-row progress, INFO (default) only summaries
+STAGES = ('dns', 'connect', 'ttfb', 'download', 'parse', 'extract', 'write')
+LATENCY_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+LabelKey = Tuple[Tuple[str, str], ...]
+
+
+def _label_key(labels: Dict[str, Any]) -> LabelKey:
+    return tuple(sorted((name, str(value)) for name, value in labels.items()))
+
+
+def _format_labels(labels: LabelKey, extra: Optional[Tuple[str, str]] = None) -> str:
+    pairs = list(labels) + ([extra] if extra else [])
+    if not pairs:
+        return ''
+    return '{' + ','.join(f'{name}="{value}"' for name, value in pairs) + '}'
+
+
+class Histogram:
+    """Cumulative-bucket latency histogram in the Prometheus layout, plus sum and count."""
+    __slots__ = ('buckets', 'counts', 'sum', 'count')
+
+    def __init__(self, buckets: Tuple[float, ...] = LATENCY_BUCKETS):
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)  # the last slot is +Inf
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value: float) -> None:
+        self.counts[bisect.bisect_left(self.buckets, value)] += 1
+        self.sum += value
+        self.count += 1
+
+    def quantile(self, fraction: float) -> float:
+        """Upper bound of the bucket holding the `fraction` quantile."""
+        if not self.count:
+            return 0.0
+        rank, seen = fraction * self.count, 0
+        for index, bucket_count in enumerate(self.counts):
+            seen += bucket_count
+            if seen >= rank:
+                return self.buckets[index] if index < len(self.buckets) else float('inf')
+        return float('inf')
+
+
+class MetricsRegistry:
+    """
+    Process-wide counters and per-stage histograms shared by all scrapers.
+
+    Histograms are keyed by stage (dns, connect, ttfb, download, parse, extract, write) and optional labels,
+    counters by name and labels. Everything is lock-protected because the sync scrapers record from many threads.
+    """
+    __slots__ = ('counters', 'histograms', '_lock')
+
+    def __init__(self):
+        self.counters: Dict[Tuple[str, LabelKey], float] = {}
+        self.histograms: Dict[Tuple[str, LabelKey], Histogram] = {}
+        self._lock = threading.Lock()
+
+    def increment(self, name: str, amount: float = 1, **labels: Any) -> None:
+        key = (name, _label_key(labels))
+        with self._lock:
+            self.counters[key] = self.counters.get(key, 0) + amount
+
+    def observe(self, stage: str, seconds: float, **labels: Any) -> None:
+        key = (stage, _label_key(labels))
+        with self._lock:
+            histogram = self.histograms.get(key)
+            if histogram is None:
+                histogram = self.histograms[key] = Histogram()
+            histogram.observe(seconds)
+
+    def snapshot(self) -> Dict[str, Any]:
+        """Counters plus count/sum/p50/p99 per stage, e.g. to print at the end of a run."""
+        with self._lock:
+            counters = {name + _format_labels(labels): value for (name, labels), value in self.counters.items()}
+            stages = {
+                stage + _format_labels(labels): {'count': histogram.count, 'sum_s': round(histogram.sum, 3),
+                                                 'p50_s': histogram.quantile(0.5), 'p99_s': histogram.quantile(0.99)}
+                for (stage, labels), histogram in self.histograms.items()
+            }
+        return {'counters': counters, 'stages': stages}
+
+    def render_prometheus(self) -> str:
+        """Prometheus text exposition format (version 0.0.4)."""
+        lines: List[str] = []
+        with self._lock:
+            for name in sorted({name for name, _ in self.counters}):
+                lines.append(f'# TYPE scraper_{name} counter')
+                for (counter_name, labels), value in sorted(self.counters.items()):
+                    if counter_name == name:
+                        lines.append(f'scraper_{name}{_format_labels(labels)} {value}')
+            lines.append('# TYPE scraper_stage_seconds histogram')
+            for (stage, labels), histogram in sorted(self.histograms.items()):
+                stage_labels = (('stage', stage),) + labels
+                cumulative = 0
+                for bound, bucket_count in zip(histogram.buckets + (float('inf'),), histogram.counts):
+                    cumulative += bucket_count
+                    le = '+Inf' if bound == float('inf') else repr(bound)
+                    lines.append(f'scraper_stage_seconds_bucket{_format_labels(stage_labels, ("le", le))} {cumulative}')
+                lines.append(f'scraper_stage_seconds_sum{_format_labels(stage_labels)} {histogram.sum}')
+                lines.append(f'scraper_stage_seconds_count{_format_labels(stage_labels)} {histogram.count}')
+        return '\n'.join(lines) + '\n'
+
+    def absorb(self, observations: Dict[str, List[float]]) -> None:
+        for stage, durations in observations.items():
+            for seconds in durations:
+                self.observe(stage, seconds)
+
+    def reset(self) -> None:
+        with self._lock:
+            self.counters.clear()
+            self.histograms.clear()
+
+
+REGISTRY = MetricsRegistry()
+_collector = threading.local()  # set while run_collecting() runs a function in a worker process
+
+
+def record_stage(name: str, seconds: float, **labels: Any) -> None:
+    """Record one stage duration into REGISTRY, or into the collector of run_collecting when one is active."""
+    observations = getattr(_collector, 'observations', None)
+    if observations is not None:
+        observations.setdefault(name, []).append(seconds)
+    else:
+        REGISTRY.observe(name, seconds, **labels)
+
+
+@contextmanager
+def stage(name: str, **labels: Any) -> Iterator[None]:
+    """Time a block into the `name` stage histogram."""
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        record_stage(name, time.perf_counter() - started, **labels)
+
+
+def run_collecting(function: Callable[..., Any], *args: Any) -> Tuple[Any, Dict[str, List[float]]]:
+    """
+    Run `function` and return its result together with the stage timings it recorded. Meant for process pools,
+    whose workers cannot reach the parent's REGISTRY: the parent hands the pair to `unwrap_collected`.
+    """
+    _collector.observations = {}
+    try:
+        return function(*args), _collector.observations
+    finally:
+        _collector.observations = None
+
+
+def unwrap_collected(outcome: Tuple[Any, Dict[str, List[float]]]) -> Any:
+    result, observations = outcome
+    REGISTRY.absorb(observations)
+    return result
+
+
+def timed_get(session: Any, url: str, **kwargs: Any) -> Any:
+    """`session.get` (requests) that records time to first byte and body download time."""
+    started = time.perf_counter()
+    response = session.get(url, **kwargs)
+    total = time.perf_counter() - started
+    ttfb = min(total, response.elapsed.total_seconds())
+    REGISTRY.observe('ttfb', ttfb)
+    REGISTRY.observe('download', total - ttfb)
+    return response
+
+
+def aiohttp_trace_config() -> aiohttp.TraceConfig:
+    """DNS, connect and time-to-headers timings for aiohttp sessions; body reads are timed by the caller."""
+    async def on_request_start(session: Any, context: Any, params: Any) -> None:
+        context.started = time.perf_counter()
+
+    async def on_request_end(session: Any, context: Any, params: Any) -> None:
+        REGISTRY.observe('ttfb', time.perf_counter() - context.started)
+
+    async def on_dns_start(session: Any, context: Any, params: Any) -> None:
+        context.dns_started = time.perf_counter()
+
+    async def on_dns_end(session: Any, context: Any, params: Any) -> None:
+        REGISTRY.observe('dns', time.perf_counter() - context.dns_started)
+
+    async def on_connect_start(session: Any, context: Any, params: Any) -> None:
+        context.connect_started = time.perf_counter()
+
+    async def on_connect_end(session: Any, context: Any, params: Any) -> None:
+        REGISTRY.observe('connect', time.perf_counter() - context.connect_started)
+
+    trace_config = aiohttp.TraceConfig()
+    trace_config.on_request_start.append(on_request_start)
+    trace_config.on_request_end.append(on_request_end)
+    trace_config.on_dns_resolvehost_start.append(on_dns_start)
+    trace_config.on_dns_resolvehost_end.append(on_dns_end)
+    trace_config.on_connection_create_start.append(on_connect_start)
+    trace_config.on_connection_create_end.append(on_connect_end)
+    return trace_config
+
+
+class JsonFormatter(logging.Formatter):
+    """One JSON object per line: time, level, logger, event and whatever fields were passed via `extra`."""
+    RESERVED = set(vars(logging.LogRecord('', 0, '', 0, '', None, None))) | {'message', 'asctime'}
+
+    def format(self, record: logging.LogRecord) -> str:
+        entry = {'ts': round(record.created, 3), 'level': record.levelname, 'logger': record.name,
+                 'event': record.getMessage()}
+        entry.update({key: value for key, value in vars(record).items() if key not in self.RESERVED})
+        if record.exc_info:
+            entry['exc'] = self.formatException(record.exc_info)
+        return json.dumps(entry, default=str)
+
+
+def get_logger(name: str) -> logging.Logger:
+    """Logger writing JSON lines to stderr at the level named by $SCRAPER_LOG_LEVEL (INFO by default)."""
+    logger = logging.getLogger(f'scraper.{name}')
+    root = logging.getLogger('scraper')
+    if not root.handlers:
+        handler = logging.StreamHandler(sys.stderr)
+        handler.setFormatter(JsonFormatter())
+        root.addHandler(handler)
+        root.setLevel(os.environ.get(LOG_LEVEL_VARIABLE, 'INFO').upper())
+        root.propagate = False
+    return logger
+
+
+def start_metrics_server(port: int = 9108, host: str = '127.0.0.1') -> ThreadingHTTPServer:
+    """Serve REGISTRY at http://host:port/metrics for a Prometheus scraper, from a daemon thread."""
+    class MetricsHandler(BaseHTTPRequestHandler):
+        def log_message(self, *args: Any) -> None:
+            pass
+
+        def do_GET(self) -> None:
+            body = REGISTRY.render_prometheus().encode() if self.path == '/metrics' else b''
+            self.send_response(200 if body else 404)
+            self.send_header('Content-Type', 'text/plain; version=0.0.4')
+            self.send_header('Content-Length', str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+    server = ThreadingHTTPServer((host, port), MetricsHandler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+def push_metrics(gateway_url: str, job: str, timeout: float = 10.0) -> int:
+    """PUT REGISTRY to a Prometheus Pushgateway (or any collector speaking its API); returns the HTTP status."""
+    request = urllib.request.Request(f"{gateway_url.rstrip('/')}/metrics/job/{job}",
+                                     data=REGISTRY.render_prometheus().encode(), method='PUT',
+                                     headers={'Content-Type': 'text/plain; version=0.0.4'})
+    with urllib.request.urlopen(request, timeout=timeout) as response:
+        return response.status
+
+
+def export_from_environment(job: str) -> None:
+    """
+    Honour the optional exporter settings of the CLIs: $SCRAPER_METRICS_PORT serves /metrics for the run,
+    $SCRAPER_PUSHGATEWAY gets the final metrics pushed by `finish_run`.
+    """
+    port = os.environ.get('SCRAPER_METRICS_PORT')
+    if port:
+        start_metrics_server(int(port))
+        get_logger(job).info('metrics server started', extra={'port': int(port)})
+
+
+def finish_run(job: str) -> None:
+    """Log the run's metrics summary and push it when $SCRAPER_PUSHGATEWAY is set."""
+    logger = get_logger(job)
+    logger.info('run metrics', extra=REGISTRY.snapshot())
+    gateway = os.environ.get('SCRAPER_PUSHGATEWAY')
+    if gateway:
+        try:
+            push_metrics(gateway, job)
+        except OSError as e:
+            logger.warning('metrics push failed', extra={'gateway': gateway, 'error': repr(e)})
@@ -0,0 +1,228 @@
+import json
+import random
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Dict, Optional, Tuple
+from urllib.parse import parse_qs, urlsplit
+
+from exibitors_scrapy import EXTRACTION_PLAN
+from exibitors_scrapy_2 import (BOOTH_CLASS, DESCRIPTION_CLASS, HASHTAG_CLASS, INDUSTRY_TYPE_CLASS, LOCATION_CLASS,
+                                LOOKING_FOR_ROW_ID)
+
+
+def _plan_class(field: str) -> str:
+    return EXTRACTION_PLAN[field][1]
+
+
+def exhibitor_listing_page(exhibitors: int, page: int = 1, page_size: int = 0) -> bytes:
+    """Every exhibitor card, or with `page_size` one page of them plus a rel="next" link while more remain."""
+    first, last = ((page - 1) * page_size, min(page * page_size, exhibitors)) if page_size else (0, exhibitors)
+    cards = ''.join(
+        f'<a class="js-librarylink-entry" href="exhibitors/{index}"><span>Exhibitor {index} Ltd</span>'
+        f'<span>Stand {index % 300}</span></a>'
+        for index in range(first, last)
+    )
+    next_link = f'<a class="pagination__next" rel="next" href="exhibitors?page={page + 1}">Next</a>' \
+        if page_size and last < exhibitors else ''
+    return (f'<html><body><nav>menu</nav><div class="js-library-list-outer">{cards}</div>{next_link}'
+            f'</body></html>').encode()
+
+
+def exhibitor_listing_json(exhibitors: int, page: int = 1, page_size: int = 0) -> Dict[str, Any]:
+    """The listing as a search API would return it: the same cards as JSON items, plus the next page's URL."""
+    first, last = ((page - 1) * page_size, min(page * page_size, exhibitors)) if page_size else (0, exhibitors)
+    items = [{'name': f'Exhibitor {index} Ltd', 'stand': f'Stand {index % 300}', 'url': f'/exhibitors/{index}'}
+             for index in range(first, last)]
+    next_url = f'/api/exhibitors?page={page + 1}' if page_size and last < exhibitors else None
+    return {'data': {'items': items, 'next': next_url}}
+
+
+def exhibitor_page(index: int) -> bytes:
+    """Detail page with every field ExhibitorsScraper extracts, built from its EXTRACTION_PLAN classes."""
+    socials = ''.join(
+        f'<li class="{_plan_class("social_items")}"><a href="https://{network}.com/exhibitor{index}">{network}</a></li>'
+        for network in ('facebook', 'linkedin', 'instagram', 'youtube')
+    )
+    return f'''<html><head><title>Exhibitor {index}</title></head><body>
+<header>{'<a href="/section">section</a>' * 30}</header>
+<div class="m-exhibitor-entry__item">
+<h1 class="{_plan_class("company_name")}"> Exhibitor {index} Ltd </h1>
+<div class="{_plan_class("stand")}">Stand {index % 300}</div>
+<div class="{_plan_class("usp")}"> Unique selling point of exhibitor {index} </div>
+<div class="{_plan_class("address")}"><h4>Address</h4> {index} Market Street<br/>London<br/>UK</div>
+<div class="{_plan_class("libraries")}">
+<div class="m-exhibitor-entry__item__body__libraries__library"><span>Travel Tech</span><span>Payments</span></div>
+<div class="m-exhibitor-entry__item__body__libraries__library"><span>Airlines</span></div>
+<div class="m-exhibitor-entry__item__body__libraries__library"><span>Carbon offsetting</span></div></div>
+<div class="{_plan_class("website_button")}"><a href="https://exhibitor{index}.example">Website</a></div>
+<ul>{socials}</ul>
+</div>
+<footer>{'<p>Footer text</p>' * 30}</footer>
+</body></html>'''.encode()
+
+
+def company_page(name: str) -> bytes:
+    """VivaTech partner page carrying the Next.js flight payload exibitors_scrapy_2 decodes."""
+    company = {"name": name, "creation": "2015", "employees": "120", "city": "Paris", "fundraising_amount": "2.5M",
+               "website": f"https://{name}.example", "stage": "Series A", "type": "startup",
+               "linkedin": f"https://linkedin.com/company/{name}", "instagram": f"https://instagram.com/{name}",
+               "looking_for": f"${LOOKING_FOR_ROW_ID}"}
+    flight = (f'0:["$","div",null,{{}}]\n1a:{json.dumps(company, separators=(",", ":"))}\n'
+              f'{LOOKING_FOR_ROW_ID}:{json.dumps(["Investors", "Clients"])}\n')
+    push = f'self.__next_f.push([1,{json.dumps(flight)}])'
+    hashtags = ''.join(f'<div class="{HASHTAG_CLASS}"> #{tag} </div>' for tag in ('AI', 'Cloud', 'Mobility'))
+    return f'''<html><head><script>self.__next_f=self.__next_f||[]</script></head><body>
+<nav>{'<a href="/x">menu</a>' * 40}</nav>
+<div class="{DESCRIPTION_CLASS}"> {name} builds things for the benchmark. </div>
+{hashtags}
+<div class="{BOOTH_CLASS}">Booth<span class="ml-1 uppercase"> H1-{len(name)} </span><span class="ml-2"> Wed-Fri </span></div>
+<div class="{LOCATION_CLASS}"> Hall 1 </div>
+<span class="{INDUSTRY_TYPE_CLASS}">Fintech</span>
+<a href="https://{name}.example">Visit website</a>
+<div><p class="text-gray text-[16px]">industry</p><p> Banking </p></div>
+<script>{push}</script>
+</body></html>'''.encode()
+
+
+class MockSite:
+    """
+    Stand-in for the three scraped sites, served from one local ThreadingHTTPServer:
+
+    - GET  /exhibitors and /exhibitors/<n>: businesstravelshoweurope-style listing and detail pages; with
+      `listing_page_size` the listing is split into /exhibitors?page=<n> pages chained by rel="next" links
+    - GET  /api/exhibitors: the same listing as JSON, paginated the same way
+    - GET  /partners/<name>: VivaTech partner pages
+    - POST /participants/list, /info, /interests, /activities: the paginated participant API
+
+    Every response waits `latency` seconds (plus up to `jitter`), and `error_rate` of them are 503s.
+    """
+    __slots__ = ('exhibitors', 'listing_page_size', 'participant_pages', 'page_size', 'latency', 'jitter',
+                 'error_rate', 'requests', 'errors', '_random', '_lock', '_server', '_thread')
+
+    def __init__(self, exhibitors: int = 200, participant_pages: int = 5, page_size: int = 20,
+                 latency: float = 0.05, jitter: float = 0.0, error_rate: float = 0.0, seed: int = 0,
+                 listing_page_size: int = 0):
+        self.exhibitors = exhibitors
+        self.listing_page_size = listing_page_size
+        self.participant_pages = participant_pages
+        self.page_size = page_size
+        self.latency = latency
+        self.jitter = jitter
+        self.error_rate = error_rate
+        self.requests = 0
+        self.errors = 0
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+        self._server: Optional[ThreadingHTTPServer] = None
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def base_url(self) -> str:
+        return f'http://127.0.0.1:{self._server.server_port}'
+
+    def start(self, port: int = 0) -> str:
+        site = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = 'HTTP/1.1'
+
+            def log_message(self, *args: Any) -> None:
+                pass
+
+            def do_GET(self) -> None:
+                site.handle(self, None)
+
+            def do_POST(self) -> None:
+                length = int(self.headers.get('Content-Length') or 0)
+                site.handle(self, json.loads(self.rfile.read(length) or b'{}'))
+
+        self._server = ThreadingHTTPServer(('127.0.0.1', port), Handler)
+        self._server.daemon_threads = True
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+        self._thread.start()
+        return self.base_url
+
+    def stop(self) -> None:
+        if self._server is not None:
+            self._server.shutdown()
+            self._server.server_close()
+            self._server = None
+
+    def __enter__(self) -> 'MockSite':
+        self.start()
+        return self
+
+    def __exit__(self, exc_type: Any, exc_value: Any, traceback: Any) -> None:
+        self.stop()
+
+    def handle(self, request: BaseHTTPRequestHandler, payload: Optional[Dict[str, Any]]) -> None:
+        with self._lock:
+            self.requests += 1
+            delay = self.latency + self._random.uniform(0, self.jitter)
+            failed = self._random.random() < self.error_rate
+            if failed:
+                self.errors += 1
+        time.sleep(delay)
+        if failed:
+            self._send(request, 503, 'text/plain', b'unavailable', {'Retry-After': '0'})
+            return
+        status, content_type, body = self.route(request.path, payload)
+        self._send(request, status, content_type, body)
+
+    def route(self, path: str, payload: Optional[Dict[str, Any]]) -> Tuple[int, str, bytes]:
+        url = urlsplit(path)
+        parts = url.path.strip('/').split('/')
+        if payload is None and parts == ['exhibitors']:
+            page = int(parse_qs(url.query).get('page', ['1'])[0])
+            return 200, 'text/html; charset=utf-8', exhibitor_listing_page(self.exhibitors, page,
+                                                                          self.listing_page_size)
+        if payload is None and parts == ['api', 'exhibitors']:
+            page = int(parse_qs(url.query).get('page', ['1'])[0])
+            listing = exhibitor_listing_json(self.exhibitors, page, self.listing_page_size)
+            return 200, 'application/json; charset=UTF-8', json.dumps(listing).encode()
+        if payload is None and len(parts) == 2 and parts[0] == 'exhibitors' and parts[1].isdigit():
+            return 200, 'text/html; charset=utf-8', exhibitor_page(int(parts[1]))
+        if payload is None and len(parts) == 2 and parts[0] == 'partners':
+            return 200, 'text/html; charset=utf-8', company_page(parts[1])
+        if payload is not None and len(parts) == 2 and parts[0] == 'participants':
+            return 200, 'application/json; charset=UTF-8', json.dumps(self.participant_api(parts[1], payload)).encode()
+        return 404, 'text/plain', b'not found'
+
+    def participant_api(self, endpoint: str, payload: Dict[str, Any]) -> Dict[str, Any]:
+        if endpoint == 'list':
+            page = int(payload.get('page', 1))
+            limit = int(payload.get('limit', self.page_size))
+            total = self.participant_pages * limit
+            start = (page - 1) * limit
+            people = [{'id': str(index), 'firstName': f'First{index}', 'lastName': f'Last{index}',
+                       'company_name': f'Company {index % 50}', 'company_website': f'https://c{index % 50}.example',
+                       'position': 'Manager'} for index in range(start, min(start + limit, total))]
+            return {'data': {'list': people, 'total': total}}
+        if endpoint == 'info':
+            return {'data': [{'title': 'Country', 'values': ['France']},
+                             {'title': 'Attendee Type', 'values': ['Buyer']},
+                             {'title': 'Company type', 'values': ['Startup']},
+                             {'title': 'Linkedin', 'values': [f"https://linkedin.com/in/{payload.get('id')}"]}]}
+        return {'data': {'list': [{'name': 'Networking'}, {'name': 'Mobility'}, {'name': 'Sustainability'}]}}
+
+    @staticmethod
+    def _send(request: BaseHTTPRequestHandler, status: int, content_type: str, body: bytes,
+              headers: Optional[Dict[str, str]] = None) -> None:
+        request.send_response(status)
+        request.send_header('Content-Type', content_type)
+        request.send_header('Content-Length', str(len(body)))
+        for name, value in (headers or {}).items():
+            request.send_header(name, value)
+        request.end_headers()
+        request.wfile.write(body)
+
+
+if __name__ == "__main__":
+    mock_site = MockSite()
+    print(f"Serving the mock sites on {mock_site.start(8765)} (Ctrl+C to stop)")
+    try:
+        while True:
+            time.sleep(3600)
+    except KeyboardInterrupt:
+        mock_site.stop()
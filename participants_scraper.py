@@ -1,12 +1,24 @@
 import aiohttp
 import asyncio
 import csv
+import functools
+import math
 import os
 import sys
+import time
 
-from typing import Dict, Any, List, Union
+from typing import Dict, Any, Awaitable, Iterable, Iterator, List, NamedTuple, Optional, Sequence, Set, Tuple, Union
 
-from config import ParticipantEnvLoader
+from batching import BatchLoader
+from checkpoint import CheckpointJournal
+from config import Settings, get_settings
+from http_cache import CLIENT_TIMEOUT, CachedResponse, ResponseCache, post
+from instrumentation import REGISTRY, aiohttp_trace_config, export_from_environment, finish_run, get_logger, stage
+from ratelimit import AdaptiveRateLimiter
+from records import RecordLayout, intern_columns
+from retry import CircuitOpenError, RetryPolicy
+from sinks import Column, CsvSink, iter_rows, open_sink, read_fieldnames
+from streaming import run_bounded
 
 '''
 # TODO -> uncomment when need to use BeautifulSoup & selenium
@@ -17,66 +29,190 @@ from selenium.webdriver.chrome.options import Options
 from webdriver_manager.chrome import ChromeDriverManager
 '''
 
+PARTICIPANT_COLUMNS = {
+    'delegate_id': 'Delegate ID',
+    'participant_url': 'Participant URL',
+    'first_name': 'First Name',
+    'last_name': 'Last Name',
+    'company_name': 'Company Name',
+    'company_website': 'Company Website',
+    'position': 'Position'
+}
+
+LIST_COLUMNS = {'Interests', 'Activities'}  # enrichment columns holding comma-joined names, typed as lists
+
+TOTAL_COUNT_KEYS = ('total', 'totalCount', 'total_count', 'count')  # where the list endpoint may report its size
+PAGE_WINDOW = 20  # pages requested concurrently while paginating
+ROW_WINDOW = 100  # delegates enriched concurrently in update mode; input rows are only read as slots free up
+
+logger = get_logger('participants')
+
+
+class Participant(NamedTuple):
+    """
+    One delegate from the list endpoint, fields in PARTICIPANT_COLUMNS order so sinks take it as a row.
+    A tuple instead of a dict per delegate, with repeated strings (company, position) interned.
+    """
+    delegate_id: str
+    participant_url: str
+    first_name: str
+    last_name: str
+    company_name: str
+    company_website: str
+    position: str
+
+    @classmethod
+    def from_values(cls, values: Sequence[Any]) -> 'Participant':
+        return cls._make(intern_columns(PARTICIPANT_COLUMNS.values(), values))
+
+    @classmethod
+    def from_journal(cls, entry: Union[Sequence[Any], Dict[str, Any]]) -> 'Participant':
+        """Journaled participants are lists; journals written before Participant existed hold dicts."""
+        return cls(**entry) if isinstance(entry, dict) else cls._make(entry)
+
+
+class EnrichmentEndpoint(NamedTuple):
+    """
+    One per-delegate lookup of update mode: where to POST {"id": ...} and which fields to keep from the answer.
+    With `batch_param`, concurrent lookups are coalesced into one {batch_param: [ids]} request whose answer maps
+    each ID to what the single call would have returned (at the top level or under "data").
+    """
+    url: str
+    keys_mapping: Dict[str, str]
+    batch_param: Optional[str] = None
+
+
+INFO_KEYS_MAPPING = {
+    'Country': 'Country',
+    'Attendee Type': 'Attendee Type',
+    'Company type': 'Company Type',
+    'Twitter': 'Twitter',
+    'Linkedin': 'Linkedin',
+    'YouTube': 'YouTube',
+    'Facebook': 'Facebook'
+}
+INTERESTS_KEYS_MAPPING = {'Interests': 'Interests'}
+ACTIVITIES_KEYS_MAPPING = {'Activities': 'Activities'}
+
 
 class ParticipantManager:
-    def __init__(self, base_url: str, total_pages: int, limit: int, info_url: str, interests_url: str,
-                 activities_url: str, max_retries: int = 5, auth: bool = False):
+    def __init__(self, base_url: str, total_pages: Optional[int], limit: int, info_url: str, interests_url: str,
+                 activities_url: str, max_retries: int = 5, auth: bool = False,
+                 cache: Optional[ResponseCache] = None, limiter: Optional[AdaptiveRateLimiter] = None,
+                 enrichment_endpoints: Optional[List[EnrichmentEndpoint]] = None, page_window: int = PAGE_WINDOW,
+                 retry_policy: Optional[RetryPolicy] = None, env_file: str = ".env", row_window: int = ROW_WINDOW):
         self.base_url = base_url
-        self.total_pages = total_pages
+        self.total_pages = total_pages  # None: discovered from the first response or by reaching an empty page
+        self.page_window = max(1, page_window)
+        self.row_window = max(1, row_window)
         self.limit = limit
         self.info_url = info_url
         self.interests_url = interests_url
         self.activities_url = activities_url
+        # update mode fires every endpoint concurrently per delegate; pass a list to add or replace lookups
+        self.enrichment_endpoints = enrichment_endpoints or [
+            EnrichmentEndpoint(info_url, INFO_KEYS_MAPPING),
+            EnrichmentEndpoint(interests_url, INTERESTS_KEYS_MAPPING),
+            EnrichmentEndpoint(activities_url, ACTIVITIES_KEYS_MAPPING),
+        ]
         self.max_retries = max_retries
+        # connection errors, timeouts, 429 and 5xx are retried with jittered backoff, within a retry budget
+        self.retry_policy = retry_policy or RetryPolicy(max_attempts=max_retries)
         self.participants = []
         self.count = 0
         self.auth = auth
-
-    async def fetch_page_data(self, session: aiohttp.ClientSession, page: int) -> None:
-        """Fetch data for a single page and store it"""
+        self.env_file = env_file
+        self.auth_settings: Optional[Settings] = None  # settings snapshot whose cookies the open session carries
+        self.trace_configs: List[aiohttp.TraceConfig] = []  # request hooks for every session, e.g. latency probes
+        self.cache = cache
+        self.limiter = limiter or AdaptiveRateLimiter()
+        self.journal: Optional[CheckpointJournal] = None
+        self.loaders: Dict[str, BatchLoader] = {}  # per enrichment URL, only while update mode runs
+        self.sink: Optional[CsvSink] = None  # when set, participants are streamed out instead of kept in memory
+        self.row_layout: Optional[RecordLayout] = None  # column order of the enriched rows while update mode runs
+
+    async def fetch_page_data(self, session: aiohttp.ClientSession, page: int) -> Optional[int]:
+        """Fetch data for a single page and store it; returns how many participants it held, None if it failed"""
         payload = {"page": page, "limit": self.limit}
-        retries = 0
-        while retries < self.max_retries:
+        logger.debug('fetching page', extra={'page': page})
+        self.apply_auth(session)
+        try:
+            response = await self.retry_policy.acall(
+                self.base_url, lambda: self.limited_post(session, self.base_url, payload))
+        except (aiohttp.ClientError, asyncio.TimeoutError, CircuitOpenError) as e:
+            REGISTRY.increment('failures_total', stage='fetch')
+            logger.warning('giving up on page', extra={'page': page, 'error': repr(e)})
+            return None
+        participants = self.handle_response(response, page)
+        return None if participants is None else len(participants)
+
+    def open_session(self) -> aiohttp.ClientSession:
+        session = aiohttp.ClientSession(timeout=CLIENT_TIMEOUT,
+                                        trace_configs=[aiohttp_trace_config()] + self.trace_configs)
+        self.auth_settings = None
+        self.apply_auth(session)
+        return session
+
+    def apply_auth(self, session: aiohttp.ClientSession) -> None:
+        """With auth, keep the session's cookie jar on the current .env cookies (re-applied after a rotation)"""
+        if not self.auth:
+            return
+        settings = get_settings(self.env_file)
+        if settings is not self.auth_settings:
+            session.cookie_jar.update_cookies(settings.auth_cookies)
+            self.auth_settings = settings
+
+    async def limited_post(self, session: aiohttp.ClientSession, url: str, payload: Dict[str, Any],
+                           headers: Optional[Dict[str, str]] = None) -> CachedResponse:
+        """POST under the shared rate limiter and feed the outcome back into its rate controller"""
+        async with self.limiter:
+            started = time.monotonic()
             try:
-                print('Fetching page:', page)
-                if self.auth:
-                    cookies = {
-                        'PHPSESSID': ParticipantEnvLoader().get('PHPSESSID'),
-                        'token': ParticipantEnvLoader().get('TOKEN')
-                    }
-                    headers = {'Cookie': '; '.join([f'{k}={v}' for k, v in cookies.items()])}
-                    async with session.post(self.base_url, json=payload, headers=headers) as response:
-                        await self.handle_response(response, page)
-                else:
-                    async with session.post(self.base_url, json=payload) as response:
-                        await self.handle_response(response, page)
-                return
-            except aiohttp.ClientConnectionError as e:
-                print(f"Connection error on page {page}: {e}")
-                retries += 1
-                wait_time = 2 ** retries  # Exponential backoff
-                print(f"Retrying in {wait_time} seconds...")
-                await asyncio.sleep(wait_time)
-
-        if retries == self.max_retries:
-            print(f"Max retries reached for page {page}. Skipping this page.")
-
-    async def handle_response(self, response, page):
+                response = await post(session, url, payload, headers, self.cache)
+            except (aiohttp.ClientConnectionError, asyncio.TimeoutError):
+                self.limiter.record(None, time.monotonic() - started)
+                raise
+        self.limiter.record(response.status, time.monotonic() - started, response.retry_after)
+        return response
+
+    def handle_response(self, response: CachedResponse, page: int) -> Optional[List[Dict[str, Any]]]:
         if response.status == 200:
             try:
-                if response.headers.get('Content-Type') == 'application/json; charset=UTF-8':
-                    data = await response.json()
-                    self.extract_participants(data)
+                if response.content_type == 'application/json; charset=UTF-8':
+                    with stage('parse'):
+                        data = response.json()
+                    self.discover_total_pages(data)
+                    with stage('extract'):
+                        participants = self.extract_participants(data)
+                    if self.journal is not None:
+                        self.journal.record('page', page, participants)
+                        self.journal.flush()
+                    return participants
                 else:
-                    print(f"Unexpected content type for page {page}: {response.headers.get('Content-Type')}")
-            except aiohttp.ClientResponseError:
-                print(f"Failed to decode JSON for page {page}")
+                    logger.warning('unexpected content type',
+                                   extra={'page': page, 'content_type': response.content_type})
+            except ValueError:
+                logger.warning('invalid JSON', extra={'page': page})
         else:
-            print(f"Failed to retrieve data for page {page} (status code: {response.status})")
+            logger.warning('page not fetched', extra={'page': page, 'status': response.status})
+        REGISTRY.increment('failures_total', stage='fetch')
+        return None
+
+    def discover_total_pages(self, data: Dict[str, Any]) -> None:
+        """Derive total_pages from the item count the list endpoint reports, if it reports one"""
+        if self.total_pages is not None or not isinstance(data.get('data'), dict):
+            return
+        for key in TOTAL_COUNT_KEYS:
+            total = data['data'].get(key)
+            if isinstance(total, int) and not isinstance(total, bool):
+                self.total_pages = math.ceil(total / self.limit)
+                logger.info('total discovered', extra={'participants': total, 'pages': self.total_pages})
+                return
 
-    def extract_participants(self, data: Dict[str, Any]) -> None:
-        """Extract participants' data from the JSON response"""
-        participant_base_url = ParticipantEnvLoader().get('PARTICIPANT_BASE_URL')
+    def extract_participants(self, data: Dict[str, Any]) -> List[Participant]:
+        """Extract participants' data from the JSON response, hand them to the sink (or keep them) and return them"""
+        participant_base_url = get_settings(self.env_file).get('PARTICIPANT_BASE_URL')
+        participants = []
         for participant in data.get('data')['list']:
             delegate_id = participant.get('id', '')
             first_name = participant.get('firstName', '')
@@ -84,48 +220,81 @@ class ParticipantManager:
             company_name = participant.get('company_name', '')
             company_website = participant.get('company_website', '')
             position = participant.get('position', '')
-            self.participants.append({
-                'delegate_id': delegate_id,
-                'participant_url': f'{participant_base_url}/{delegate_id}',
-                'first_name': first_name,
-                'last_name': last_name,
-                'company_name': company_name,
-                'company_website': company_website,
-                'position': position
-            })
-
-    async def process_chunk(self, session: aiohttp.ClientSession, chunk: List[int]) -> None:
-        tasks = [self.fetch_page_data(session, page) for page in chunk]
-        await asyncio.gather(*tasks)
-
-    async def fetch_data(self) -> None:
-        """Fetch data from the API and store it in self.participants"""
-        async with aiohttp.ClientSession() as session:
-            chunk_size = 100
-            for i in range(1, self.total_pages + 1, chunk_size):
-                chunk = list(range(i, min(i + chunk_size, self.total_pages + 1)))
-                await self.process_chunk(session, chunk)
+            participants.append(Participant.from_values((
+                delegate_id,
+                f'{participant_base_url}/{delegate_id}',
+                first_name,
+                last_name,
+                company_name,
+                company_website,
+                position
+            )))
+        self.emit_participants(participants)
+        return participants
+
+    def emit_participants(self, participants: List[Participant]) -> None:
+        if self.sink is None:
+            self.participants.extend(participants)
+            return
+        for participant in participants:
+            self.sink.write(participant)
+
+    async def fetch_data(self, skip_pages: Optional[Set[int]] = None) -> None:
+        """
+        Fetch data from the API and store it in self.participants, skipping pages already journaled.
+
+        Up to `page_window` pages are in flight at any time and a new one starts as soon as any finishes, so a slow
+        page never holds back the others. Without total_pages, page 1 is fetched alone to read the item count; if
+        the API does not report one, pages are probed until the first empty page, and requests past it are dropped.
+        Probing also gives up after `page_window` failed pages in a row, so a failing API cannot keep it going.
+        """
+        skip_pages = skip_pages or set()
+        last_page = self.total_pages
+        next_page = 1
+        failed_streak = 0
+        in_flight: Dict[asyncio.Task, int] = {}
+        async with self.open_session() as session:
+            try:
+                while True:
+                    if last_page is None:
+                        last_page = self.total_pages
+                    # while the size is still unknown, learn it from page 1 before fanning out
+                    window = 1 if last_page is None and next_page == 1 and 1 not in skip_pages else self.page_window
+                    while len(in_flight) < window and (last_page is None or next_page <= last_page):
+                        if next_page not in skip_pages:
+                            task = asyncio.ensure_future(self.fetch_page_data(session, next_page))
+                            in_flight[task] = next_page
+                        next_page += 1
+                    if not in_flight:
+                        break
+                    done, _ = await asyncio.wait(in_flight, return_when=asyncio.FIRST_COMPLETED)
+                    for task in done:
+                        page = in_flight.pop(task)
+                        count = task.result()
+                        failed_streak = failed_streak + 1 if count is None else 0
+                        if count == 0 and (last_page is None or page - 1 < last_page):
+                            last_page = page - 1  # list exhausted
+                    if last_page is None and self.total_pages is None and failed_streak >= self.page_window:
+                        logger.warning('stopping pagination',
+                                       extra={'failed_streak': failed_streak, 'last_page': next_page - 1})
+                        last_page = next_page - 1
+                    if last_page is not None:
+                        for task, page in list(in_flight.items()):
+                            if page > last_page:
+                                task.cancel()
+                                del in_flight[task]
+            finally:
+                for task in in_flight:
+                    task.cancel()
+                if self.journal is not None:
+                    self.journal.flush()
 
     def save_to_csv(self, file_name: str) -> None:
         """Save the participants' data to a CSV file, appending if the file already exists"""
-        file_exists = os.path.isfile(file_name)
-
-        with open(file_name, mode='a', newline='', encoding='utf-8') as file:
-            writer = csv.DictWriter(file, fieldnames=['Delegate ID', 'Participant URL', 'First Name', 'Last Name',
-                                                      'Company Name', 'Company Website', 'Position'])
-            if not file_exists:
-                writer.writeheader()  # Only write the header if the file does not already exist
-
+        # The header is only written if the file does not already exist
+        with CsvSink(file_name, list(PARTICIPANT_COLUMNS.values()), append=True) as sink:
             for participant in self.participants:
-                writer.writerow({
-                    'Delegate ID': participant['delegate_id'],
-                    'Participant URL': participant['participant_url'],
-                    'First Name': participant['first_name'],
-                    'Last Name': participant['last_name'],
-                    'Company Name': participant['company_name'],
-                    'Company Website': participant['company_website'],
-                    'Position': participant['position']
-                })
+                sink.write(participant)
 
     """ 
     TODO -> uncomment below code block when need to scrape the data through
@@ -182,70 +351,93 @@ class ParticipantManager:
     #             writer.writeheader()
     #             writer.writerows(updated_participants)
 
-    async def fetch_from_url(self, session: aiohttp.ClientSession, url: str, payload: Dict[str, Any]) -> Dict[str, Any]:
-        retries = 0
-        while retries < self.max_retries:
-            try:
-                print(f'Fetching data from {url} with payload {payload}')
-                if self.auth:
-                    # If authentication is required, set the cookies
-                    cookies = {
-                        'PHPSESSID': ParticipantEnvLoader().get('PHPSESSID'),
-                        'token': ParticipantEnvLoader().get('TOKEN')
-                    }
-                    headers = {'Cookie': '; '.join([f'{k}={v}' for k, v in cookies.items()])}
-                    async with session.post(url, json=payload, headers=headers) as response:
-                        return await self.handle_additionl_response(response, url)
-                else:
-                    async with session.post(url, json=payload) as response:
-                        return await self.handle_additionl_response(response, url)
-            except aiohttp.ClientConnectionError as e:
-                print(f"Connection error for {url}: {e}")
-                retries += 1
-                wait_time = 2 ** retries  # Exponential backoff
-                print(f"Retrying in {wait_time} seconds...")
-                await asyncio.sleep(wait_time)
-
-        if retries == self.max_retries:
-            print(f"Max retries reached for {url}. Skipping this request.")
-        return {}
-
-    async def handle_additionl_response(self, response, url):
+    async def fetch_from_url(self, session: aiohttp.ClientSession, url: str,
+                             payload: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        """The endpoint's JSON answer, or None when the request failed (which an empty answer is not)"""
+        logger.debug('fetching enrichment', extra={'url': url, 'payload': payload})
+        self.apply_auth(session)
+        try:
+            response = await self.retry_policy.acall(url, lambda: self.limited_post(session, url, payload))
+        except (aiohttp.ClientError, asyncio.TimeoutError, CircuitOpenError) as e:
+            REGISTRY.increment('failures_total', stage='fetch')
+            logger.warning('giving up on request', extra={'url': url, 'error': repr(e)})
+            return None
+        return self.handle_additionl_response(response, url)
+
+    async def fetch_batch_from_url(self, session: aiohttp.ClientSession, url: str, batch_param: str,
+                                   ids: List[str]) -> Optional[Dict[str, Any]]:
+        """POST several IDs at once; None unless the answer is keyed by the requested IDs"""
+        data = await self.fetch_from_url(session, url, {batch_param: ids})
+        if isinstance(data, dict) and isinstance(data.get('data'), dict):
+            data = data['data']
+        if not isinstance(data, dict) or not any(delegate_id in data for delegate_id in ids):
+            return None
+        return data
+
+    def open_loaders(self, session: aiohttp.ClientSession) -> None:
+        """Coalesce and deduplicate concurrent enrichment lookups per endpoint for the lifetime of `session`"""
+        self.loaders = {}
+        for endpoint in self.enrichment_endpoints:
+            fetch_batch = None
+            if endpoint.batch_param:
+                fetch_batch = functools.partial(self.fetch_batch_from_url, session, endpoint.url, endpoint.batch_param)
+            self.loaders[endpoint.url] = BatchLoader(
+                lambda delegate_id, url=endpoint.url: self.fetch_from_url(session, url, {"id": delegate_id}),
+                fetch_batch
+            )
+
+    async def close_loaders(self) -> None:
+        """Stop the lookups the loaders still run, before their session closes"""
+        loaders, self.loaders = self.loaders, {}
+        for loader in loaders.values():
+            await loader.close()
+
+    def handle_additionl_response(self, response: CachedResponse, url: str) -> Optional[Dict[str, Any]]:
         if response.status == 200:
-            return await response.json()
+            with stage('parse'):
+                return response.json()
         else:
-            print(f"Failed to retrieve data from {url} (status code: {response.status})")
-            return {}
+            REGISTRY.increment('failures_total', stage='fetch')
+            logger.warning('enrichment not fetched', extra={'url': url, 'status': response.status})
+            return None
+
+    async def lookup_enrichment(self, session: aiohttp.ClientSession, endpoint: EnrichmentEndpoint,
+                                delegate_id: str) -> Optional[Dict[str, Any]]:
+        """The endpoint's answer for one delegate, None when the lookup failed"""
+        loader = self.loaders.get(endpoint.url)
+        if loader is not None:
+            return await loader.load(delegate_id)
+        payload = {"id": delegate_id}
+        return await self.fetch_from_url(session, endpoint.url, payload)
+
+    async def fetch_enrichment(self, session: aiohttp.ClientSession, endpoint: EnrichmentEndpoint,
+                               delegate_id: str) -> Dict[str, str]:
+        data = await self.lookup_enrichment(session, endpoint, delegate_id)
+        with stage('extract'):
+            return self.extract_info(data, endpoint.keys_mapping)
 
     async def fetch_additional_info(self, session: aiohttp.ClientSession, delegate_id: str) -> Dict[str, str]:
-        payload = {"id": delegate_id}
-        data = await self.fetch_from_url(session, self.info_url, payload)
-        keys_mapping = {
-            'Country': 'Country',
-            'Attendee Type': 'Attendee Type',
-            'Company type': 'Company Type',
-            'Twitter': 'Twitter',
-            'Linkedin': 'Linkedin',
-            'YouTube': 'YouTube',
-            'Facebook': 'Facebook'
-        }
-        return self.extract_info(data, keys_mapping)
-
-    def extract_info(self, data_items: Union[Dict[str, Any], List[Dict[str, Any]]], keys_mapping: Dict[str, str]) -> \
-            Dict[str, str]:
-        """Extract specific fields from data items."""
+        return await self.fetch_enrichment(session, EnrichmentEndpoint(self.info_url, INFO_KEYS_MAPPING), delegate_id)
+
+    def extract_info(self, data_items: Optional[Union[Dict[str, Any], List[Dict[str, Any]]]],
+                     keys_mapping: Dict[str, str]) -> Dict[str, str]:
+        """Extract specific fields from data items; a failed or malformed answer leaves the fields blank."""
         result = {value: '' for value in keys_mapping.values()}
         if isinstance(data_items, dict):
+            data = data_items.get('data')
             for key, value in keys_mapping.items():
                 if key == 'Interests' or key == 'Activities':
-                    items = data_items.get('data').get('list')
+                    items = data.get('list') if isinstance(data, dict) else None
                     if not items:
                         return result
                     else:
-                        result[value] = ', '.join(item.get('name', '') for item in items if 'name' in item)
+                        result[value] = ', '.join(item.get('name', '') for item in items
+                                                  if isinstance(item, dict) and 'name' in item)
                 else:
-                    items = data_items.get('data', [])
+                    items = data if isinstance(data, list) else []
                     for item in items:
+                        if not isinstance(item, dict):
+                            continue
                         title = item.get('title')
                         values = item.get('values', [])
                         if title in keys_mapping:
@@ -253,46 +445,92 @@ class ParticipantManager:
         return result
 
     async def fetch_interests_info(self, session: aiohttp.ClientSession, delegate_id: str) -> Dict[str, str]:
-        payload = {"id": delegate_id}
-        data = await self.fetch_from_url(session, self.interests_url, payload)
-        keys_mapping = {'Interests': 'Interests'}
-        return self.extract_info(data, keys_mapping)
+        return await self.fetch_enrichment(session, EnrichmentEndpoint(self.interests_url, INTERESTS_KEYS_MAPPING),
+                                           delegate_id)
 
     async def fetch_activities_info(self, session: aiohttp.ClientSession, delegate_id: str) -> Dict[str, str]:
-        payload = {"id": delegate_id}
-        data = await self.fetch_from_url(session, self.activities_url, payload)
-        keys_mapping = {'Activities': 'Activities'}
-        return self.extract_info(data, keys_mapping)
-
-    async def fetch_and_update_row(self, session: aiohttp.ClientSession, row: Dict[str, str], delegate_id: str) -> Dict[
-        str, str]:
-        info = await self.fetch_additional_info(session, delegate_id)
-        row.update(info)
-        interests = await self.fetch_interests_info(session, delegate_id)
-        row.update(interests)
-        activities = await self.fetch_activities_info(session, delegate_id)
-        row.update(activities)
-        return row
-
-    async def update_csv_with_additional_info(self, input_file: str, output_file: str) -> None:
-        updated_participants = []
-        async with aiohttp.ClientSession() as session:
-            with open(input_file, mode='r', newline='', encoding='utf-8') as file:
-                reader = csv.DictReader(file)
-                fieldnames = reader.fieldnames + ['Country', 'Attendee Type', 'Company Type', 'Twitter', 'Linkedin',
-                                                  'YouTube', 'Facebook', 'Interests', 'Activities']
-                tasks = [self.fetch_and_update_row(session, row, row['Delegate ID']) for row in reader]
-                updated_participants = await asyncio.gather(*tasks)
-
-        with open(output_file, mode='w', newline='', encoding='utf-8') as file:
-            writer = csv.DictWriter(file, fieldnames=fieldnames)
-            writer.writeheader()
-            writer.writerows(updated_participants)
-
-    def run(self, mode: str, file_name: str) -> None:
+        return await self.fetch_enrichment(session, EnrichmentEndpoint(self.activities_url, ACTIVITIES_KEYS_MAPPING),
+                                           delegate_id)
+
+    def enrichment_columns(self) -> List[Column]:
+        return [Column(column, 'list' if column in LIST_COLUMNS else 'string')
+                for endpoint in self.enrichment_endpoints for column in endpoint.keys_mapping.values()]
+
+    async def fetch_and_update_row(self, session: aiohttp.ClientSession, row: Dict[str, str],
+                                   delegate_id: str) -> Union[Tuple[Any, ...], Dict[str, str]]:
+        """
+        Enrich one input row and return it packed by `row_layout` (a plain dict when no layout is set). A failed
+        lookup leaves its fields blank and keeps the delegate out of the journal, so a resumed run fetches it again.
+        """
+        # All lookups run at once (each still under the shared limiter), so a row costs the slowest call, not the sum
+        answers = await asyncio.gather(*(self.lookup_enrichment(session, endpoint, delegate_id)
+                                         for endpoint in self.enrichment_endpoints))
+        with stage('extract'):
+            for endpoint, data in zip(self.enrichment_endpoints, answers):
+                row.update(self.extract_info(data, endpoint.keys_mapping))
+        record = self.row_layout.pack(row) if self.row_layout is not None else row
+        if self.journal is not None and all(data is not None for data in answers):
+            self.journal.record('delegate', delegate_id, record)
+        if self.sink is not None:
+            await self.sink.awrite(record)
+        return record
+
+    def row_updates(self, session: aiohttp.ClientSession, rows: Iterable[Dict[str, Any]],
+                    completed: Dict[str, Any]) -> Iterator[Awaitable[Any]]:
+        """One pending write per input row, created lazily: reuse a journaled row or enrich it"""
+        for row in rows:
+            if row['Delegate ID'] in completed:
+                yield self.sink.awrite(completed[row['Delegate ID']])
+            else:
+                yield self.fetch_and_update_row(session, row, row['Delegate ID'])
+
+    async def update_csv_with_additional_info(self, input_file: str, output_file: str,
+                                              completed: Optional[Dict[str, Any]] = None) -> None:
+        """
+        Enrich every row of input_file and stream it to output_file as soon as it is done, so output rows follow
+        completion order. Rows of delegates in `completed` are reused instead of fetched again.
+        Both files may be CSV, JSONL, Parquet or Arrow, picked by extension. The input is streamed: at most
+        `row_window` delegates are in flight and the next row is only read once one of them is written out, so memory
+        stays flat however large the input is.
+        """
+        completed = completed or {}
+        async with self.open_session() as session:
+            self.open_loaders(session)
+            fieldnames = read_fieldnames(input_file) + self.enrichment_columns()
+            self.row_layout = RecordLayout(fieldnames)
+            try:
+                with open_sink(output_file, fieldnames) as self.sink:
+                    await run_bounded(self.row_updates(session, iter_rows(input_file), completed), self.row_window)
+            finally:
+                await self.close_loaders()
+                self.sink = None
+                self.row_layout = None
+
+    def run(self, mode: str, file_name: str, resume: bool = False) -> None:
+        """
+        Run `mode` against file_name, whose extension picks the format (.csv, .jsonl, .parquet, .arrow).
+        Progress is journaled next to the file as it completes, and with `resume` pages/delegates finished by an
+        interrupted run are skipped. The journal is removed once the output is written.
+        """
+        if mode not in ("fetch", "update"):
+            logger.error("invalid mode, use 'fetch' to fetch data or 'update' to update data", extra={'mode': mode})
+            return
+
+        self.journal = CheckpointJournal(f'{file_name}.{mode}.journal')
+        if not resume:
+            self.journal.reset()
+
         if mode == "fetch":
-            asyncio.run(self.fetch_data())
-            self.save_to_csv(file_name)
+            completed_pages = self.journal.load('page')
+            try:
+                # Participants are appended to file_name as pages arrive; the file is swapped in once complete
+                with open_sink(file_name, list(PARTICIPANT_COLUMNS.values()), append=True) as self.sink:
+                    for participants in completed_pages.values():
+                        self.emit_participants([Participant.from_journal(entry) for entry in participants])
+                    asyncio.run(self.fetch_data({int(page) for page in completed_pages}))
+            finally:
+                self.sink = None
+                self.journal.close()
             """
             TODO -> uncomment below code when need to scrape the data through 
             1 - Selenium
@@ -301,33 +539,47 @@ class ParticipantManager:
             # asyncio.run(self.update_csv_with_social_links(file_name, "participants_with_social.csv"))
             # print("Data successfully saved to participants_with_social.csv")
             """
-        elif mode == "update":
-            asyncio.run(self.update_csv_with_additional_info(file_name, "final_auth_participants.csv"))
-            print("Data successfully updated and saved to participants_updated.csv")
         else:
-            print("Invalid mode. Use 'fetch' to fetch data or 'update' to update data.")
+            completed_delegates = self.journal.load('delegate')
+            output_file = "final_auth_participants" + os.path.splitext(file_name)[1]
+            try:
+                asyncio.run(self.update_csv_with_additional_info(file_name, output_file, completed_delegates))
+            finally:
+                self.journal.close()
+            logger.info('data saved', extra={'file': output_file})
+        self.journal.reset()
 
 
 if __name__ == "__main__":
     # Define parameters
-    BASE_URL = ParticipantEnvLoader().get('BASE_URL')
-    TOTAL_PAGES = 26
+    settings = get_settings()
+    BASE_URL = settings.get('BASE_URL')
+    TOTAL_PAGES = None  # discovered from the API; set a number to cap the crawl
     LIMIT = 60
-    INFO_URL = ParticipantEnvLoader().get('INFO_URL')
-    INTERESTS_URL = ParticipantEnvLoader().get('INTERESTS_URL')
-    ACTIVITIES_URL = ParticipantEnvLoader().get('ACTIVITIES_URL')
+    INFO_URL = settings.get('INFO_URL')
+    INTERESTS_URL = settings.get('INTERESTS_URL')
+    ACTIVITIES_URL = settings.get('ACTIVITIES_URL')
 
     # Command-line argument for mode
-    if len(sys.argv) != 3:
-        print("Usage: python script.py <mode> <file_name>")
+    if len(sys.argv) not in (3, 4) or sys.argv[3:] not in ([], ['--resume']):
+        print("Usage: python script.py <mode> <file_name> [--resume]")
         print("Modes: 'fetch' to fetch data, 'update' to update data")
+        print("--resume skips the pages/delegates finished by an interrupted run")
         sys.exit(1)
 
     mode = sys.argv[1]
     file_name = sys.argv[2]
+    resume = sys.argv[3:] == ['--resume']
 
     # Create an instance of ParticipantManager
     AUTH: bool = False  # change it accordingly
-    manager = ParticipantManager(BASE_URL, TOTAL_PAGES, LIMIT, INFO_URL, INTERESTS_URL, ACTIVITIES_URL, auth=AUTH)
+    export_from_environment('participants')
+    response_cache = ResponseCache()
+    manager = ParticipantManager(BASE_URL, TOTAL_PAGES, LIMIT, INFO_URL, INTERESTS_URL, ACTIVITIES_URL, auth=AUTH,
+                                 cache=response_cache)
     # Run the manager with the specified mode and file name
-    manager.run(mode, file_name)
+    manager.run(mode, file_name, resume)
+    logger.info('response cache', extra=response_cache.stats())
+    logger.info('rate limiter', extra=manager.limiter.metrics())
+    logger.info('retries', extra=manager.retry_policy.stats())
+    finish_run('participants')
@@ -0,0 +1,142 @@
+import asyncio
+import time
+from email.utils import parsedate_to_datetime
+from typing import Any, Dict, Optional
+
+THROTTLE_STATUSES = {429, 503}
+
+
+def parse_retry_after(value: Optional[str]) -> Optional[float]:
+    """Turn a Retry-After header (delta-seconds or HTTP date) into seconds to wait."""
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+    except (TypeError, ValueError):
+        return None
+
+
+class AdaptiveRateLimiter:
+    """
+    Global request limiter for the async scrapers: a concurrency cap plus a token bucket whose refill rate is
+    steered by AIMD.
+
+    The server's capacity is unknown up front, so the rate starts at a polite `initial_rate` and, like TCP slow
+    start, grows by `additive_increase` per healthy response (2xx/3xx/4xx other than 429, under `latency_target`),
+    doubling about every second, until the first sign of overload. From then on healthy responses raise it
+    additively, about `additive_increase` requests/second per second of traffic. 429/5xx and connection errors cut
+    it by `multiplicative_decrease` and slow responses trim it gently, at most once per round trip: responses to
+    requests sent before the last cut report the same overload and do not cut again. A Retry-After header pauses
+    every request until it has elapsed. `current_rate` and `metrics()` expose where the controller has settled.
+    """
+    __slots__ = ('max_concurrency', 'rate', 'min_rate', 'max_rate', 'additive_increase', 'multiplicative_decrease',
+                 'latency_target', 'slow_start', 'requests', 'throttled', 'errors', 'in_flight', '_tokens',
+                 '_updated', '_last_decrease', '_blocked_until', '_loop', '_semaphore', '_lock')
+
+    def __init__(self, max_concurrency: int = 20, initial_rate: float = 10.0, min_rate: float = 0.5,
+                 max_rate: float = 200.0, additive_increase: float = 1.0, multiplicative_decrease: float = 0.5,
+                 latency_target: float = 2.0):
+        self.max_concurrency = max_concurrency
+        self.rate = initial_rate
+        self.min_rate = min_rate
+        self.max_rate = max_rate
+        self.additive_increase = additive_increase
+        self.multiplicative_decrease = multiplicative_decrease
+        self.latency_target = latency_target
+        self.slow_start = True
+        self.requests = 0
+        self.throttled = 0
+        self.errors = 0
+        self.in_flight = 0
+        self._tokens = 1.0
+        self._updated = time.monotonic()
+        self._last_decrease = -float('inf')
+        self._blocked_until = 0.0
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._semaphore = asyncio.Semaphore(max_concurrency)
+        self._lock = asyncio.Lock()
+
+    @property
+    def current_rate(self) -> float:
+        return self.rate
+
+    def _bind_loop(self) -> None:
+        # asyncio primitives belong to one loop; each asyncio.run() in ParticipantManager.run gets fresh ones
+        loop = asyncio.get_running_loop()
+        if self._loop is not loop:
+            self._loop = loop
+            self._semaphore = asyncio.Semaphore(self.max_concurrency)
+            self._lock = asyncio.Lock()
+            self.in_flight = 0
+
+    async def acquire(self) -> None:
+        self._bind_loop()
+        await self._semaphore.acquire()
+        try:
+            await self._take_token()
+        except BaseException:
+            self._semaphore.release()
+            raise
+        self.in_flight += 1
+
+    def release(self) -> None:
+        self.in_flight -= 1
+        self._semaphore.release()
+
+    async def __aenter__(self) -> 'AdaptiveRateLimiter':
+        await self.acquire()
+        return self
+
+    async def __aexit__(self, exc_type: Any, exc_value: Any, traceback: Any) -> None:
+        self.release()
+
+    async def _take_token(self) -> None:
+        while True:
+            async with self._lock:
+                now = time.monotonic()
+                if now < self._blocked_until:
+                    wait = self._blocked_until - now
+                else:
+                    burst = max(1.0, self.rate)
+                    self._tokens = min(burst, self._tokens + (now - self._updated) * self.rate)
+                    self._updated = now
+                    if self._tokens >= 1.0:
+                        self._tokens -= 1.0
+                        return
+                    wait = (1.0 - self._tokens) / self.rate
+            await asyncio.sleep(wait)
+
+    def _decrease(self, factor: float, latency: float) -> None:
+        now = time.monotonic()
+        if now - latency < self._last_decrease:  # sent before the last cut: already accounted for
+            return
+        self.rate = max(self.min_rate, self.rate * factor)
+        self.slow_start = False
+        self._last_decrease = now
+
+    def record(self, status: Optional[int], latency: float, retry_after: Optional[str] = None) -> None:
+        """Feed back one response (status None for a connection error/timeout) into the rate controller."""
+        self.requests += 1
+        if status is None or status in THROTTLE_STATUSES or status >= 500:
+            if status in THROTTLE_STATUSES:
+                self.throttled += 1
+            else:
+                self.errors += 1
+            self._decrease(self.multiplicative_decrease, latency)
+            pause = parse_retry_after(retry_after)
+            if pause:
+                self._blocked_until = max(self._blocked_until, time.monotonic() + pause)
+        elif latency > self.latency_target:
+            self._decrease(1 - (1 - self.multiplicative_decrease) / 4, latency)
+        elif self.slow_start:
+            self.rate = min(self.max_rate, self.rate + self.additive_increase)
+        else:
+            self.rate = min(self.max_rate, self.rate + self.additive_increase / max(self.rate, 1.0))
+
+    def metrics(self) -> Dict[str, float]:
+        return {'rate': round(self.rate, 2), 'in_flight': self.in_flight, 'requests': self.requests,
+                'throttled': self.throttled, 'errors': self.errors}
@@ -0,0 +1,38 @@
+import sys
+from typing import Any, Dict, Iterable, Sequence, Tuple, Union
+
+from sinks import Column, as_columns
+
+# Output columns whose values repeat across many rows (a few dozen countries for 100k delegates): their strings are
+# interned, so rows share one object per distinct value instead of each holding its own copy
+CATEGORICAL_COLUMNS = frozenset({
+    'Country', 'Attendee Type', 'Company Type', 'Company Name', 'Company Website', 'Position', 'Interests',
+    'Activities', 'PRODUCT CATEGORY', 'INDUSTRIES', 'SUSTAINABILITY INITIATIVE', 'Industry Type', 'Location', 'City',
+    'Development Level', 'Type of Company(Startup or Not)',
+})
+
+
+def intern_text(value: Any) -> Any:
+    """`sys.intern` for strings; anything else is returned as is."""
+    return sys.intern(value) if isinstance(value, str) else value
+
+
+def intern_columns(names: Iterable[str], values: Iterable[Any]) -> Tuple[Any, ...]:
+    """`values` as a tuple, with those of CATEGORICAL_COLUMNS (by the matching entry of `names`) interned."""
+    return tuple(intern_text(value) if name in CATEGORICAL_COLUMNS else value for name, value in zip(names, values))
+
+
+class RecordLayout:
+    """
+    Column order of rows whose columns are only known at run time, e.g. an input file plus enrichment columns.
+
+    Rows are packed into plain tuples in this order, with categorical values interned, instead of one dict per row
+    repeating every key. Sinks and the checkpoint journal take the tuples as they are.
+    """
+    __slots__ = ('names',)
+
+    def __init__(self, columns: Sequence[Union[str, Column]]):
+        self.names = tuple(column.name for column in as_columns(columns))
+
+    def pack(self, values: Dict[str, Any], default: Any = '') -> Tuple[Any, ...]:
+        return intern_columns(self.names, [values.get(name, default) for name in self.names])
@@ -0,0 +1,224 @@
+import asyncio
+import random
+import threading
+import time
+from typing import Any, Awaitable, Callable, Dict, FrozenSet, Optional, Tuple, Type
+from urllib.parse import urlsplit
+
+import aiohttp
+import requests
+
+from instrumentation import REGISTRY, get_logger
+from ratelimit import parse_retry_after
+
+RETRY_STATUSES = frozenset({408, 425, 429, 500, 502, 503, 504})
+logger = get_logger('retry')
+
+RETRY_EXCEPTIONS: Tuple[Type[BaseException], ...] = (
+    requests.ConnectionError, requests.Timeout,
+    aiohttp.ClientConnectionError, aiohttp.ClientPayloadError, asyncio.TimeoutError,
+)
+
+
+class CircuitOpenError(Exception):
+    """Raised instead of sending a request to a host whose circuit breaker is open."""
+
+
+def response_status(result: Any) -> Optional[int]:
+    """Status of a `requests.Response` or a `CachedResponse`."""
+    status = getattr(result, 'status_code', None)
+    return status if status is not None else getattr(result, 'status', None)
+
+
+def response_retry_after(result: Any) -> Optional[str]:
+    retry_after = getattr(result, 'retry_after', None)
+    if retry_after is None and hasattr(result, 'headers'):
+        retry_after = result.headers.get('Retry-After')
+    return retry_after
+
+
+class RetryBudget:
+    """
+    Caps retries at a fraction of the traffic: every first attempt deposits `ratio` tokens and every retry spends
+    one, so when a whole host is failing the retries stop instead of multiplying the load. `min_tokens` keeps a
+    small reserve for low-traffic runs.
+    """
+    __slots__ = ('ratio', 'max_tokens', 'denied', '_tokens', '_lock')
+
+    def __init__(self, ratio: float = 0.2, min_tokens: float = 10.0, max_tokens: float = 100.0):
+        self.ratio = ratio
+        self.max_tokens = max(max_tokens, min_tokens)
+        self.denied = 0
+        self._tokens = min_tokens
+        self._lock = threading.Lock()
+
+    def deposit(self) -> None:
+        with self._lock:
+            self._tokens = min(self.max_tokens, self._tokens + self.ratio)
+
+    def withdraw(self) -> bool:
+        with self._lock:
+            if self._tokens >= 1.0:
+                self._tokens -= 1.0
+                return True
+            self.denied += 1
+        REGISTRY.increment('retry_budget_denied_total')
+        return False
+
+
+class CircuitBreaker:
+    """
+    Per-host breaker: `failure_threshold` consecutive failures open it for `reset_timeout` seconds, after which
+    a single trial request is let through (half-open) and decides whether it closes or opens again.
+    """
+    __slots__ = ('failure_threshold', 'reset_timeout', 'failures', 'state', '_opened_at', '_trial', '_lock')
+
+    def __init__(self, failure_threshold: int = 5, reset_timeout: float = 30.0):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.failures = 0
+        self.state = 'closed'
+        self._opened_at = 0.0
+        self._trial = False
+        self._lock = threading.Lock()
+
+    def allow(self) -> bool:
+        with self._lock:
+            if self.state == 'closed':
+                return True
+            if self.state == 'open' and time.monotonic() - self._opened_at >= self.reset_timeout:
+                self.state = 'half-open'
+                self._trial = False
+            if self.state == 'half-open' and not self._trial:
+                self._trial = True
+                return True
+            return False
+
+    def record_success(self) -> None:
+        with self._lock:
+            self.failures = 0
+            self.state = 'closed'
+
+    def record_failure(self) -> None:
+        with self._lock:
+            self.failures += 1
+            if self.state == 'half-open' or self.failures >= self.failure_threshold:
+                self.state = 'open'
+                self._opened_at = time.monotonic()
+
+
+class RetryPolicy:
+    """
+    Shared retry rules for the `requests` and `aiohttp` scrapers.
+
+    A call is retried (up to `max_attempts` attempts in total) when it raises one of `retry_exceptions` or
+    returns one of `retry_statuses`. Waits use decorrelated jitter between `base_delay` and `max_delay`, unless the
+    server sent a longer Retry-After, so concurrent callers do not retry in lockstep. Every retry is paid for from
+    the `budget`, and each host has its own circuit breaker. When the attempts or the budget run out, the last
+    response is returned or the last exception re-raised.
+    """
+    __slots__ = ('max_attempts', 'base_delay', 'max_delay', 'retry_statuses', 'retry_exceptions', 'budget',
+                 'failure_threshold', 'reset_timeout', 'retries', '_breakers', '_lock')
+
+    def __init__(self, max_attempts: int = 5, base_delay: float = 0.5, max_delay: float = 30.0,
+                 retry_statuses: FrozenSet[int] = RETRY_STATUSES,
+                 retry_exceptions: Tuple[Type[BaseException], ...] = RETRY_EXCEPTIONS,
+                 budget: Optional[RetryBudget] = None, failure_threshold: int = 5, reset_timeout: float = 30.0):
+        self.max_attempts = max(1, max_attempts)
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.retry_statuses = retry_statuses
+        self.retry_exceptions = retry_exceptions
+        self.budget = budget or RetryBudget()
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.retries = 0
+        self._breakers: Dict[str, CircuitBreaker] = {}
+        self._lock = threading.Lock()
+
+    def breaker(self, url: str) -> CircuitBreaker:
+        host = urlsplit(url).netloc.lower()
+        with self._lock:
+            breaker = self._breakers.get(host)
+            if breaker is None:
+                breaker = self._breakers[host] = CircuitBreaker(self.failure_threshold, self.reset_timeout)
+            return breaker
+
+    def next_delay(self, previous: float, retry_after: Optional[str] = None) -> float:
+        delay = min(self.max_delay, random.uniform(self.base_delay, max(self.base_delay, previous * 3)))
+        server_delay = parse_retry_after(retry_after)
+        if server_delay is not None:
+            delay = max(delay, min(server_delay, self.max_delay))
+        return delay
+
+    def _attempt_start(self, url: str, breaker: CircuitBreaker) -> None:
+        if not breaker.allow():
+            REGISTRY.increment('circuit_open_total')
+            raise CircuitOpenError(f'Circuit open for {urlsplit(url).netloc}, not requesting {url}')
+
+    def _outcome(self, breaker: CircuitBreaker, result: Any = None, error: Optional[BaseException] = None) -> bool:
+        """Update the breaker with one attempt and tell whether it deserves a retry."""
+        if error is not None:
+            breaker.record_failure()
+            return isinstance(error, self.retry_exceptions)
+        status = response_status(result)
+        if status is not None and status >= 500:
+            breaker.record_failure()
+        else:
+            breaker.record_success()  # 429 too: the host is up, the rate limiter deals with the pace
+        return status in self.retry_statuses
+
+    def _may_retry(self, attempt: int) -> bool:
+        if attempt >= self.max_attempts or not self.budget.withdraw():
+            return False
+        with self._lock:
+            self.retries += 1
+        REGISTRY.increment('retries_total')
+        return True
+
+    def call(self, url: str, func: Callable[[], Any]) -> Any:
+        """Run a blocking request function under the policy."""
+        breaker = self.breaker(url)
+        self.budget.deposit()
+        delay = self.base_delay
+        for attempt in range(1, self.max_attempts + 1):
+            self._attempt_start(url, breaker)
+            try:
+                result = func()
+            except Exception as e:
+                if not self._outcome(breaker, error=e) or not self._may_retry(attempt):
+                    raise
+                reason, retry_after = type(e).__name__, None
+            else:
+                if not self._outcome(breaker, result) or not self._may_retry(attempt):
+                    return result
+                reason, retry_after = f'status {response_status(result)}', response_retry_after(result)
+            delay = self.next_delay(delay, retry_after)
+            logger.info('retrying', extra={'url': url, 'delay_s': round(delay, 2), 'reason': reason, 'attempt': attempt})
+            time.sleep(delay)
+
+    async def acall(self, url: str, func: Callable[[], Awaitable[Any]]) -> Any:
+        """Async twin of `call`: `func` creates a fresh awaitable for every attempt."""
+        breaker = self.breaker(url)
+        self.budget.deposit()
+        delay = self.base_delay
+        for attempt in range(1, self.max_attempts + 1):
+            self._attempt_start(url, breaker)
+            try:
+                result = await func()
+            except Exception as e:
+                if not self._outcome(breaker, error=e) or not self._may_retry(attempt):
+                    raise
+                reason, retry_after = type(e).__name__, None
+            else:
+                if not self._outcome(breaker, result) or not self._may_retry(attempt):
+                    return result
+                reason, retry_after = f'status {response_status(result)}', response_retry_after(result)
+            delay = self.next_delay(delay, retry_after)
+            logger.info('retrying', extra={'url': url, 'delay_s': round(delay, 2), 'reason': reason, 'attempt': attempt})
+            await asyncio.sleep(delay)
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            open_hosts = [host for host, breaker in self._breakers.items() if breaker.state != 'closed']
+        return {'retries': self.retries, 'budget_denied': self.budget.denied, 'open_circuits': open_hosts}
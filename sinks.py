@@ -0,0 +1,351 @@
+import asyncio
+import csv
+import json
+import os
+import queue
+import re
+import shutil
+import threading
+from typing import Any, Dict, Iterator, List, NamedTuple, Optional, Sequence, Type, Union
+
+try:
+    import pyarrow as pa
+    import pyarrow.ipc as ipc
+    import pyarrow.parquet as pq
+except ImportError:  # pyarrow is only needed for Parquet/Arrow output and input
+    pa = ipc = pq = None
+
+from instrumentation import stage
+
+Row = Union[Sequence[Any], Dict[str, Any]]
+
+_CLOSE = object()
+NUMBER_PATTERN = re.compile(r'^[^\d\-.]*(-?[\d.]+)\s*([kmb])?[^\d]*$', re.I)
+NUMBER_SUFFIXES = {'k': 1e3, 'm': 1e6, 'b': 1e9}
+
+
+class Column(NamedTuple):
+    """Output column; `type` is 'string', 'int', 'float' or 'list' (of strings)."""
+    name: str
+    type: str = 'string'
+
+
+def as_columns(fieldnames: Sequence[Union[str, Column]]) -> List[Column]:
+    return [field if isinstance(field, Column) else Column(field) for field in fieldnames]
+
+
+def to_number(value: Any) -> Optional[float]:
+    """Read '1,200', '€2.5M' or 15 as a number; empty values and anything else (e.g. ranges) give None."""
+    if isinstance(value, bool) or value is None:
+        return None
+    if isinstance(value, (int, float)):
+        return value
+    match = NUMBER_PATTERN.match(str(value).replace(',', '').replace(' ', ''))
+    if match is None:
+        return None
+    try:
+        number = float(match.group(1))
+    except ValueError:
+        return None
+    return number * NUMBER_SUFFIXES.get((match.group(2) or '').lower(), 1)
+
+
+def coerce(value: Any, column_type: str) -> Any:
+    """Convert a scraped value (usually a string) to the column's type; missing values become None."""
+    if column_type == 'list':
+        if value is None or value == '':
+            return []
+        if isinstance(value, (list, tuple)):
+            return [str(item) for item in value]
+        return [item.strip() for item in str(value).split(',') if item.strip()]
+    if column_type in ('int', 'float'):
+        number = to_number(value)
+        if number is None:
+            return None
+        return int(number) if column_type == 'int' else float(number)
+    return None if value is None else str(value)
+
+
+def _require_pyarrow(what: str) -> None:
+    if pa is None:
+        raise ImportError(f"{what} requires the pyarrow package")
+
+
+def _arrow_schema(columns: List[Column]) -> Any:
+    types = {'string': pa.string(), 'int': pa.int64(), 'float': pa.float64(), 'list': pa.list_(pa.string())}
+    return pa.schema([(column.name, types[column.type]) for column in columns])
+
+
+class CsvSink:
+    """
+    Streaming CSV writer shared by all scrapers.
+
+    Producers hand rows over as soon as they are ready; a writer thread drains a bounded queue, so memory stays
+    bounded by `max_pending` rows and a slow disk pushes back on the producers instead of piling rows up.
+    With `atomic`, rows go to a temporary file that only replaces `path` when the sink closes cleanly, so readers
+    never see a half-written file. `append` keeps the existing content of `path` and writes the header only if
+    the file is new.
+
+    The other formats subclass it and only change how the file is opened, written and finished. CSV keeps the
+    scraped values as they are; the typed formats convert them to each Column's type.
+    """
+    __slots__ = ('path', 'columns', 'fieldnames', 'append', 'atomic', 'rows_written', '_queue', '_thread', '_target',
+                 '_error')
+
+    def __init__(self, path: str, fieldnames: Sequence[Union[str, Column]], max_pending: int = 1000,
+                 append: bool = False, atomic: bool = True):
+        self.path = path
+        self.columns = as_columns(fieldnames)
+        self.fieldnames = [column.name for column in self.columns]
+        self.append = append
+        self.atomic = atomic
+        self.rows_written = 0
+        self._queue: 'queue.Queue[Any]' = queue.Queue(maxsize=max(1, max_pending))
+        self._thread: Optional[threading.Thread] = None
+        self._target = f'{path}.tmp' if atomic else path
+        self._error: Optional[BaseException] = None
+
+    def open(self) -> 'CsvSink':
+        handle = self._open_target(self.append and os.path.isfile(self.path))
+        self._thread = threading.Thread(target=self._drain, args=(handle,), daemon=True)
+        self._thread.start()
+        return self
+
+    def _open_target(self, keep_existing: bool) -> Any:
+        if self.atomic and keep_existing:
+            shutil.copyfile(self.path, self._target)
+        file = open(self._target, mode='a' if keep_existing else 'w', newline='', encoding='utf-8')
+        writer = csv.writer(file)
+        if not keep_existing:
+            writer.writerow(self.fieldnames)
+        return file, writer
+
+    def _write_row(self, handle: Any, values: List[Any]) -> None:
+        handle[1].writerow(values)
+
+    def _finish(self, handle: Any) -> None:
+        handle[0].close()
+
+    def _values(self, row: Row) -> List[Any]:
+        if isinstance(row, dict):
+            return [row.get(field, '') for field in self.fieldnames]
+        return list(row)
+
+    def _drain(self, handle: Any) -> None:
+        try:
+            while True:
+                row = self._queue.get()
+                if row is _CLOSE:
+                    break
+                with stage('write'):
+                    self._write_row(handle, self._values(row))
+                self.rows_written += 1
+        except BaseException as e:  # surfaced to the producer on the next write/close
+            self._error = e
+            while self._queue.get() is not _CLOSE:
+                pass
+        finally:
+            try:
+                self._finish(handle)
+            except BaseException as e:
+                self._error = self._error or e
+
+    def write(self, row: Row) -> None:
+        """Queue a row, blocking while `max_pending` rows are already waiting for the writer."""
+        if self._error is not None:
+            raise self._error
+        self._queue.put(row)
+
+    async def awrite(self, row: Row) -> None:
+        """Queue a row from a coroutine; waits off the event loop only when the queue is full."""
+        try:
+            if self._error is not None:
+                raise self._error
+            self._queue.put_nowait(row)
+        except queue.Full:
+            await asyncio.to_thread(self.write, row)
+
+    def close(self, commit: bool = True) -> None:
+        """Flush the remaining rows and, when atomic, publish the file (or discard it if `commit` is False)."""
+        if self._thread is None:
+            return
+        self._queue.put(_CLOSE)
+        self._thread.join()
+        self._thread = None
+        if self.atomic:
+            if commit and self._error is None:
+                os.replace(self._target, self.path)
+            elif os.path.isfile(self._target):
+                os.remove(self._target)
+        if self._error is not None:
+            raise self._error
+
+    def __enter__(self) -> 'CsvSink':
+        return self.open()
+
+    def __exit__(self, exc_type: Any, exc_value: Any, traceback: Any) -> None:
+        self.close(commit=exc_type is None)
+
+
+class JsonlSink(CsvSink):
+    """One JSON object per line, with values converted to the column types."""
+    __slots__ = ()
+
+    def _open_target(self, keep_existing: bool) -> Any:
+        if self.atomic and keep_existing:
+            shutil.copyfile(self.path, self._target)
+        return open(self._target, mode='a' if keep_existing else 'w', encoding='utf-8')
+
+    def _write_row(self, handle: Any, values: List[Any]) -> None:
+        record = {column.name: coerce(value, column.type) for column, value in zip(self.columns, values)}
+        handle.write(json.dumps(record, ensure_ascii=False) + '\n')
+
+    def _finish(self, handle: Any) -> None:
+        handle.close()
+
+
+class ParquetSink(CsvSink):
+    """
+    Parquet output streamed one row group (`row_group_size` rows) at a time, so only one group is ever buffered.
+    Parquet files cannot be extended: appending copies the existing rows into a new file, one batch at a time, and
+    that file replaces `path` on close even when the sink is not `atomic`.
+    """
+    __slots__ = ('row_group_size', '_schema', '_buffer')
+
+    def __init__(self, path: str, fieldnames: Sequence[Union[str, Column]], max_pending: int = 1000,
+                 append: bool = False, atomic: bool = True, row_group_size: int = 10000):
+        _require_pyarrow("Parquet output")
+        super().__init__(path, fieldnames, max_pending, append, atomic)
+        self.row_group_size = max(1, row_group_size)
+        self._schema = _arrow_schema(self.columns)
+        self._buffer: List[List[Any]] = []
+        if append and not atomic:
+            self._target = f'{path}.tmp'  # the existing file is read while the new one is written
+            self.atomic = True
+
+    def _new_writer(self) -> Any:
+        return pq.ParquetWriter(self._target, self._schema)
+
+    def _existing_batches(self) -> Iterator[Any]:
+        return pq.ParquetFile(self.path).iter_batches(batch_size=self.row_group_size)
+
+    def _write_batch(self, writer: Any, batch: Any) -> None:
+        writer.write_table(pa.Table.from_batches([batch]))
+
+    def _open_target(self, keep_existing: bool) -> Any:
+        writer = self._new_writer()
+        if keep_existing:
+            try:
+                for batch in self._existing_batches():
+                    self._write_batch(writer, batch.cast(self._schema))
+            except BaseException:
+                writer.close()
+                raise
+        return writer
+
+    def _flush_buffer(self, writer: Any) -> None:
+        if not self._buffer:
+            return
+        arrays = [[coerce(values[index], column.type) for values in self._buffer]
+                  for index, column in enumerate(self.columns)]
+        self._write_batch(writer, pa.RecordBatch.from_arrays(
+            [pa.array(array, type=field.type) for array, field in zip(arrays, self._schema)], schema=self._schema))
+        self._buffer = []
+
+    def _write_row(self, handle: Any, values: List[Any]) -> None:
+        self._buffer.append(values)
+        if len(self._buffer) >= self.row_group_size:
+            self._flush_buffer(handle)
+
+    def _finish(self, handle: Any) -> None:
+        try:
+            if self._error is None:
+                self._flush_buffer(handle)
+        finally:
+            handle.close()
+
+
+class ArrowSink(ParquetSink):
+    """Arrow IPC (Feather v2) file output, one record batch per `row_group_size` rows."""
+    __slots__ = ()
+
+    def __init__(self, path: str, fieldnames: Sequence[Union[str, Column]], max_pending: int = 1000,
+                 append: bool = False, atomic: bool = True, row_group_size: int = 10000):
+        _require_pyarrow("Arrow output")
+        super().__init__(path, fieldnames, max_pending, append, atomic, row_group_size)
+
+    def _new_writer(self) -> Any:
+        return ipc.new_file(self._target, self._schema)
+
+    def _existing_batches(self) -> Iterator[Any]:
+        with pa.memory_map(self.path, 'r') as source:
+            reader = ipc.open_file(source)
+            for index in range(reader.num_record_batches):
+                yield reader.get_batch(index)
+
+    def _write_batch(self, writer: Any, batch: Any) -> None:
+        writer.write_batch(batch)
+
+
+SINK_FORMATS: Dict[str, Type[CsvSink]] = {
+    '.csv': CsvSink,
+    '.jsonl': JsonlSink,
+    '.parquet': ParquetSink,
+    '.arrow': ArrowSink,
+    '.feather': ArrowSink,
+}
+
+
+def open_sink(path: str, fieldnames: Sequence[Union[str, Column]], **options: Any) -> CsvSink:
+    """Sink for `path` in the format its extension names (.csv, .jsonl, .parquet, .arrow/.feather)."""
+    extension = os.path.splitext(path)[1].lower()
+    if extension not in SINK_FORMATS:
+        raise ValueError(f"Unsupported output format '{extension}', use one of {', '.join(SINK_FORMATS)}")
+    return SINK_FORMATS[extension](path, fieldnames, **options)
+
+
+def iter_rows(path: str, columns: Optional[List[str]] = None, batch_size: int = 10000) -> Iterator[Dict[str, Any]]:
+    """
+    Lazily read rows back from any of the sink formats as dicts, holding at most one batch in memory.
+    With `columns`, Parquet and Arrow only decode those columns.
+    """
+    extension = os.path.splitext(path)[1].lower()
+    if extension == '.csv':
+        with open(path, newline='', encoding='utf-8') as file:
+            for row in csv.DictReader(file):
+                yield row if columns is None else {column: row.get(column) for column in columns}
+    elif extension == '.jsonl':
+        with open(path, encoding='utf-8') as file:
+            for line in file:
+                if line.strip():
+                    row = json.loads(line)
+                    yield row if columns is None else {column: row.get(column) for column in columns}
+    elif extension == '.parquet':
+        _require_pyarrow("Parquet input")
+        for batch in pq.ParquetFile(path).iter_batches(batch_size=batch_size, columns=columns):
+            yield from batch.to_pylist()
+    elif extension in ('.arrow', '.feather'):
+        _require_pyarrow("Arrow input")
+        with pa.memory_map(path) as source:
+            reader = ipc.open_file(source)
+            for index in range(reader.num_record_batches):
+                batch = reader.get_batch(index)
+                yield from (batch.select(columns) if columns is not None else batch).to_pylist()
+    else:
+        raise ValueError(f"Unsupported input format '{extension}', use one of {', '.join(SINK_FORMATS)}")
+
+
+def read_fieldnames(path: str) -> List[str]:
+    """Column names of a file in any of the sink formats, without reading its rows."""
+    extension = os.path.splitext(path)[1].lower()
+    if extension == '.csv':
+        with open(path, newline='', encoding='utf-8') as file:
+            return next(csv.reader(file), [])
+    if extension == '.jsonl':
+        return list(next(iter_rows(path), {}).keys())
+    if extension == '.parquet':
+        _require_pyarrow("Parquet input")
+        return pq.ParquetFile(path).schema_arrow.names
+    _require_pyarrow("Arrow input")
+    with pa.memory_map(path) as source:
+        return ipc.open_file(source).schema.names
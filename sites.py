@@ -0,0 +1,89 @@
+import argparse
+import os
+import sys
+from typing import Dict, List
+
+from engine import RETRY_POLICY, Key, ScrapeEngine, SiteSpec, page_slug, page_url
+from exibitors_scrapy import exhibitor_spec
+from exibitors_scrapy_2 import COMPANY_INFO_TYPES, COMPANY_PAGE_STRAINER, extract_company_details
+from fingerprints import DEFAULT_INDEX_PATH, FingerprintIndex
+from frontier import Frontier
+from http_cache import ResponseCache
+from instrumentation import export_from_environment, finish_run, get_logger
+from sinks import iter_rows
+
+logger = get_logger('sites')
+
+
+# The exhibitor scraper's own spec, so the site is extracted by CompanyInfoExtractor in one place; the listing is
+# also followed through its rel="next" pagination
+BUSINESS_TRAVEL_SHOW = exhibitor_spec()._replace(name='businesstravelshow', next_selector='a[rel="next"]')
+
+# Partner pages have no crawlable listing, so the engine is handed their URLs (e.g. from a previous export)
+VIVATECH = SiteSpec(
+    name='vivatech',
+    record=extract_company_details,
+    fields={
+        'Company Name': page_slug,
+        'Company Event URL': page_url,
+        'Location': Key('location'),
+        'Company Description': Key('company description'),
+        'Booth Number': Key('booth number'),
+        'Booth Schedule': Key('booth schedule'),
+        'Creation': Key('creation'),
+        'Employees': Key('employees'),
+        'Industry Type': Key('industry type'),
+        'City': Key('city'),
+        'Fundraising Amount': Key('fundraising amount'),
+        'Official Website': Key('official website'),
+        'Development Level': Key('development level'),
+        'Looking For': Key('looking for'),
+        'Type of Company(Startup or Not)': Key('type'),
+        'HashTags': Key('hashtags'),
+        'LinkedIN': Key('linkedIN'),
+        'Instagram': Key('instagram'),
+    },
+    strainer=COMPANY_PAGE_STRAINER,
+    column_types=COMPANY_INFO_TYPES,
+)
+
+SITES: Dict[str, SiteSpec] = {spec.name: spec for spec in (BUSINESS_TRAVEL_SHOW, VIVATECH)}
+
+
+def parse_args(argv: List[str]) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Scrape a site described by a SiteSpec with the shared engine")
+    parser.add_argument('site', choices=sorted(SITES))
+    parser.add_argument('output_file', help="output path; .csv, .jsonl, .parquet or .arrow")
+    parser.add_argument('--urls', help="file (any sink format) listing the detail pages, instead of the listing page")
+    parser.add_argument('--url-column', default='Company Event URL', help="column of --urls holding the URLs")
+    parser.add_argument('--done', help="file remembering the pages scraped so far; later runs skip them and "
+                                         "append the other rows to the output")
+    parser.add_argument('--state', help="file keeping rows by listing card; unchanged cards are not fetched again")
+    parser.add_argument('--index', default=DEFAULT_INDEX_PATH,
+                        help="SQLite index of page fingerprints; pages whose content did not change are not parsed")
+    parser.add_argument('--no-index', dest='index', action='store_const', const=None)
+    parser.add_argument('--diff', help="output file listing the pages new, changed or removed since the last run")
+    parser.add_argument('--delay', type=float, default=0.0, help="seconds between two requests to the same host")
+    parser.add_argument('--parse-workers', type=int, default=os.cpu_count() or 1)
+    parser.add_argument('--no-partial-parse', dest='partial_parse', action='store_false')
+    return parser.parse_args(argv)
+
+
+if __name__ == "__main__":
+    options = parse_args(sys.argv[1:])
+    export_from_environment(options.site)
+    response_cache = ResponseCache()
+    page_index = FingerprintIndex(options.index, options.site) if options.index else None
+    engine = ScrapeEngine(SITES[options.site], parse_workers=options.parse_workers,
+                          partial_parse=options.partial_parse, cache=response_cache,
+                          frontier=Frontier(options.delay, options.done), state_path=options.state, index=page_index)
+    urls = None
+    if options.urls:
+        urls = (row[options.url_column] for row in iter_rows(options.urls, [options.url_column]))
+    engine.run(options.output_file, urls, options.diff)
+    logger.info('response cache', extra=response_cache.stats())
+    if page_index is not None:
+        logger.info('fingerprint index', extra=page_index.stats())
+        page_index.close()
+    logger.info('retries', extra=RETRY_POLICY.stats())
+    finish_run(options.site)
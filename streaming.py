@@ -0,0 +1,46 @@
+import asyncio
+from collections import deque
+from concurrent.futures import Executor
+from typing import Any, Awaitable, Callable, Deque, Iterable, Iterator, Set
+
+
+def bounded_map(executor: Executor, fn: Callable[[Any], Any], items: Iterable[Any], window: int) -> Iterator[Any]:
+    """
+    Ordered `executor.map` that pulls from `items` lazily: at most `window` calls are submitted but not yet
+    consumed, so a long (or endless) input never turns into one future per item up front.
+    """
+    window = max(1, window)
+    pending: Deque[Any] = deque()
+    try:
+        for item in items:
+            pending.append(executor.submit(fn, item))
+            if len(pending) >= window:
+                yield pending.popleft().result()
+        while pending:
+            yield pending.popleft().result()
+    finally:
+        for future in pending:
+            future.cancel()
+
+
+async def run_bounded(coroutines: Iterable[Awaitable[Any]], window: int) -> None:
+    """
+    Await coroutines drawn lazily from `coroutines` with at most `window` of them running; the next one is only
+    created once a slot frees up. The first failure is raised after cancelling the rest.
+    """
+    window = max(1, window)
+    in_flight: Set['asyncio.Future[Any]'] = set()
+    try:
+        for coroutine in coroutines:
+            if len(in_flight) >= window:
+                done, in_flight = await asyncio.wait(in_flight, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    task.result()
+            in_flight.add(asyncio.ensure_future(coroutine))
+        while in_flight:
+            done, in_flight = await asyncio.wait(in_flight, return_when=asyncio.FIRST_COMPLETED)
+            for task in done:
+                task.result()
+    finally:
+        for task in in_flight:
+            task.cancel()
@@ -0,0 +1,62 @@
+"""
+Every parser backend, with and without the partial parse, must extract the same fields from the same company page.
+The pages under tests/pages are saved exhibitor pages; html.parser without a strainer is the reference.
+The pages use <br> alone: where <br> and <br/> are mixed, html.parser nests the following lines inside the <br> and
+its address keeps only the first of them. That is the scraper's current output and these tests do not change it.
+"""
+import os
+
+import pytest
+
+from exibitors_scrapy import INFO_HEADERS, PARSER_BACKENDS, parse_company_page
+
+PAGES_DIR = os.path.join(os.path.dirname(__file__), 'pages')
+PAGES = sorted(name for name in os.listdir(PAGES_DIR) if name.endswith('.html'))
+BACKEND_MODULES = {'html.parser': None, 'lxml': 'lxml', 'selectolax': 'selectolax'}
+COMPANY_URL = 'https://www.businesstravelshoweurope.com/exhibitors/northwind'
+
+FULL_PAGE = {
+    'Company Name': 'Northwind Travel & Co',
+    'Stand': 'Stand B42',
+    'Company USP': 'Corporate travel management with 24/7 duty of care – in 80 countries.',
+    'Address': 'Unit 5, Riverside House, 12 Thames Street, London SE1 9PP, United Kingdom',
+    'PRODUCT CATEGORY': 'Travel Management Companies, Booking Tools',
+    'INDUSTRIES': 'Finance & Insurance, Pharma, Energy',
+    'SUSTAINABILITY INITIATIVE': 'Carbon reporting',
+    'Official Website': 'https://www.northwind-travel.example/?utm_source=btse',
+    'Facebook handle': 'https://www.facebook.com/northwindtravel',
+    'LinkedIn handle': 'https://www.linkedin.com/company/northwind-travel/',
+    'Instagram handle': 'https://www.instagram.com/northwind.travel',
+    'YouTube handle': 'https://www.youtube.com/@northwindtravel',
+}
+
+
+def read_page(name):
+    with open(os.path.join(PAGES_DIR, name), mode='rb') as file:
+        return file.read()
+
+
+@pytest.fixture(params=sorted(PARSER_BACKENDS))
+def backend(request):
+    module = BACKEND_MODULES[request.param]
+    if module is not None:
+        pytest.importorskip(module)
+    return request.param
+
+
+@pytest.mark.parametrize('partial_parse', [False, True], ids=['full-parse', 'partial-parse'])
+@pytest.mark.parametrize('page', PAGES)
+def test_backends_extract_the_same_fields(page, backend, partial_parse):
+    content = read_page(page)
+    expected = parse_company_page(COMPANY_URL, content, 'html.parser', partial_parse=False)
+    assert parse_company_page(COMPANY_URL, content, backend, partial_parse) == expected
+
+
+@pytest.mark.parametrize('partial_parse', [False, True], ids=['full-parse', 'partial-parse'])
+def test_full_page_fields(backend, partial_parse):
+    info = parse_company_page(COMPANY_URL, read_page('full.html'), backend, partial_parse)
+    assert dict(zip(INFO_HEADERS, info)) == FULL_PAGE
+
+
+def test_missing_page_gives_na_row(backend):
+    assert parse_company_page(COMPANY_URL, None, backend) == ('N/A',) * len(INFO_HEADERS)